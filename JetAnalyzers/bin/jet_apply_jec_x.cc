@@ -64,7 +64,7 @@ int main(int argc,char**argv)
   CommandLine cl;
   if (!cl.parse(argc,argv)) return 0;
   
-  string         input      = cl.getValue<string>  ("input");
+  vector<string> inputs     = cl.getFiles          ("input");
   string         era        = cl.getValue<string>  ("era");
   vector<int>    levels     = cl.getVector<int>    ("levels");
   string         url_string = cl.getValue<string>  ("url_string",   "");
@@ -81,6 +81,9 @@ int main(int argc,char**argv)
   if(!cl.check()) return 0;
   cl.print();
   if(help) return 0;
+  if(inputs.size()==0) { cout<<"No input files"<<endl; return -2; }
+  // the directory with url_string, the (first) file otherwise
+  string input = inputs[0];
   
   //
   // Speed up loading of data from the input file
@@ -104,7 +107,9 @@ int main(int argc,char**argv)
   TChain* ichain = new TChain();
   TFile* ifile = nullptr;
   if (url_string.empty()) {
-    ichain->Add(input.c_str());
+    // several input files (e.g. the per-job ntuples from the grid, directly or
+    // listed in a manifest) are read as one chain, without merging them first
+    for (unsigned int i=0;i<inputs.size();i++) ichain->Add(inputs[i].c_str());
     ifile = TFile::Open(input.c_str(),"READ");
     if (!ifile) { cout<<"Can't open file "<<input<<endl; return -2; }
     if (output.empty()) output=input.substr(0,input.find(".root"))+"_jec.root";
@@ -27,6 +27,7 @@
 #include <TEnv.h>
 #include <TFile.h>
 #include <TTree.h>
+#include <TChain.h>
 #include <TH1F.h>
 #include <TH2F.h>
 #include <TKey.h>
@@ -123,7 +124,7 @@ int main(int argc,char**argv)
   CommandLine cl;
   if (!cl.parse(argc,argv)) return 0;
 
-  string         input             = cl.getValue<string> ("input");
+  vector<string> inputFiles        = cl.getFiles         ("input");
   vector<float>  binspt            = cl.getVector<float> ("binspt",                     "");
   vector<float>  binseta           = cl.getVector<float> ("binseta",                    "");
   vector<float>  binsphi           = cl.getVector<float> ("binsphi",                    "");
@@ -194,10 +195,16 @@ int main(int argc,char**argv)
   TString        DataPUReWeighting = cl.getValue<TString>("DataPUReWeighting",          "");
   TString        DataPUHistoName   = cl.getValue<TString>("DataPUHistoName","pileup_jt400");
   bool           verbose           = cl.getValue<bool>   ("verbose",                 false);
+  int            shard             = cl.getValue<int>    ("shard",                       0);
+  int            nshards           = cl.getValue<int>    ("nshards",                     1);
 
   if (!cl.check()) return 0;
   cl.print();
 
+  if (nshards<1||shard<0||shard>=nshards) {
+    cout<<"ERROR: -shard "<<shard<<" of -nshards "<<nshards<<" is not a valid shard"<<endl; return 0;
+  }
+
   gEnv->SetValue("TFile.AsyncPrefetching", 1);
 
   bool dorelrsp=(nbinsrelrsp>0);
@@ -240,8 +247,13 @@ int main(int argc,char**argv)
   //
   // open input/output files and loop over input directories/trees (=algorithms!)
   //
-  TFile* ifile = TFile::Open(input.c_str(),"READ");
-  if (!ifile->IsOpen()) {  cout<<"Can't open "<<input<<endl; return 0; }
+  // with several input files (e.g. the per-job ntuples from the grid, directly
+  // or listed in a manifest), the trees of all files are read as one chain per
+  // algorithm, so they don't need to be merged with hadd first
+  if (inputFiles.size()==0) { cout<<"No input files"<<endl; return 0; }
+  if (inputFiles.size()>1) cout<<"Reading "<<inputFiles.size()<<" input files"<<endl;
+  TFile* ifile = TFile::Open(inputFiles[0].c_str(),"READ");
+  if (!ifile->IsOpen()) {  cout<<"Can't open "<<inputFiles[0]<<endl; return 0; }
   
   TFile* ofile = new TFile(output.c_str(),"RECREATE");
   if (!ofile->IsOpen()) { cout<<"Can't create "<<output<<endl; return 0; }
@@ -259,6 +271,11 @@ int main(int argc,char**argv)
 
     TTree* tree = (TTree*)idir->Get("t");
     if (0==tree) { cout<<"no tree found."<<endl; continue; }
+    if (inputFiles.size()>1) {
+      TChain* chain = new TChain((alg+"/t").c_str());
+      for (unsigned int ifl=0;ifl<inputFiles.size();ifl++) chain->Add(inputFiles[ifl].c_str());
+      tree = chain;
+    }
   
 
     float drmax_alg = drmax;
@@ -1449,8 +1466,14 @@ int main(int argc,char**argv)
     tree->GetEntry( el->GetEntry(0) );         
     int itInd = itIndex(JRAEvt->bxns);
 
+    // with -nshards only the shard-th of nshards equal ranges of the selected
+    // events is filled. The weights still use all nevt events, so the outputs
+    // of all shards add up (hadd) to the output of a single job
     unsigned int nevt = (unsigned) el->GetN();
-    for (unsigned int ievt=0;ievt<nevt;ievt++)
+    unsigned int ievtmin = (unsigned) (((Long64_t)nevt*shard)/nshards);
+    unsigned int ievtmax = (unsigned) (((Long64_t)nevt*(shard+1))/nshards);
+    if (nshards>1) cout<<"shard "<<shard<<" of "<<nshards<<": events "<<ievtmin<<" to "<<ievtmax<<endl;
+    for (unsigned int ievt=ievtmin;ievt<ievtmax;ievt++)
       {
         if(ievt%10000==0)
           cout << "\tDoing event " << ievt << " ";
@@ -48,6 +48,8 @@
 #include "CommonTools/UtilAlgos/interface/TFileService.h"
 
 #include <TTree.h>
+#include <TFile.h>
+#include <TDirectory.h>
 
 #include <memory>
 #include <vector>
@@ -75,11 +77,42 @@ public:
   virtual ~JetResponseAnalyzer();
 
 private:
+  // everything which differs between two jet algorithms; the module analyzes
+  // one algorithm per default or all entries of the 'algorithms' VPSet
+  struct Algorithm {
+    std::string label;
+    edm::EDGetTokenT<reco::CandidateView> srcRef;
+    edm::EDGetTokenT<reco::CandViewMatchMap> srcJetToUncorJetMap;
+    edm::EDGetTokenT<reco::CandViewMatchMap> srcRefToJetMap;
+    edm::EDGetTokenT<reco::JetMatchedPartonsCollection> srcRefToPartonMap;
+    edm::EDGetTokenT<vector<double> > srcRhos;
+    edm::EDGetTokenT<double> srcRho;
+    edm::EDGetTokenT<double> srcRhoHLT;
+    edm::EDGetTokenT<PFCandidateView> srcPFCandidates;
+    edm::EDGetTokenT<std::vector<edm::FwdPtr<reco::PFCandidate> > > srcPFCandidatesAsFwdPtr;
+    std::string jecLabel;
+    bool        getFlavorFromMap;
+    bool        isCaloJet;
+    bool        isJPTJet;
+    bool        isPFJet;
+    bool        isTrackJet;
+    bool        isTauJet;
+    TTree*      tree;
+    JRAEvent*   JRAEvt;
+  };
+
   // member functions
   //void setupTree();
   void beginJob();
-  void beginEvent() {JRAEvt_->clear();}
+  void beginEvent();
   void analyze(const edm::Event& iEvent,const edm::EventSetup& iSetup);
+  // configure one algorithm from the module or from one 'algorithms' entry
+  void setupAlgorithm(Algorithm& alg, const std::string& label, const edm::ParameterSet& iConfig);
+  // fill the event level information, shared by all algorithms
+  void fillEventInfo(JRAEvent* JRAEvt, const edm::Event& iEvent);
+  void copyEventInfo(const JRAEvent* from, JRAEvent* to);
+  // fill the per algorithm information and the tree
+  void analyzeAlgorithm(Algorithm& alg, const edm::Event& iEvent, const edm::EventSetup& iSetup);
   // get the bin number according to the vector of bin edges
   int  getBin(double x, const double boundaries[], int length);
   void endEvent() {;}
@@ -90,24 +123,14 @@ private:
 private:
   // member data
   std::string   moduleLabel_;
+  bool          multipleAlgorithms_;
+  std::vector<Algorithm> algs_;
   
-  edm::EDGetTokenT<reco::CandidateView> srcRef_;
-  edm::EDGetTokenT<reco::CandViewMatchMap> srcJetToUncorJetMap_;
-  edm::EDGetTokenT<reco::CandViewMatchMap> srcRefToJetMap_;
-  edm::EDGetTokenT<reco::JetMatchedPartonsCollection> srcRefToPartonMap_;
-  edm::EDGetTokenT<vector<double> > srcRhos_;
-  edm::EDGetTokenT<double> srcRho_;
-  edm::EDGetTokenT<double> srcRhoHLT_;
   edm::EDGetTokenT<reco::VertexCollection> srcVtx_;
   edm::EDGetTokenT<GenEventInfoProduct> srcGenInfo_;
   edm::EDGetTokenT<vector<PileupSummaryInfo> > srcPileupInfo_;
-  //edm::EDGetTokenT<vector<reco::PFCandidate> > srcPFCandidates_;
-  edm::EDGetTokenT<PFCandidateView> srcPFCandidates_;
-  edm::EDGetTokenT<std::vector<edm::FwdPtr<reco::PFCandidate> > > srcPFCandidatesAsFwdPtr_;
   edm::EDGetTokenT<vector<reco::GenParticle> > srcGenParticles_;
 
-  std::string   jecLabel_;
-  
   bool          doComposition_;
   bool          doFlavor_;
   bool          doJetPt_;
@@ -121,18 +144,8 @@ private:
   double        deltaRPartonMax_;
 
   bool          doBalancing_;
-  bool          getFlavorFromMap_;
-  bool          isCaloJet_;
-  bool          isJPTJet_;
-  bool          isPFJet_;
-  bool          isTrackJet_;
-  bool          isTauJet_;
 
   const JetCorrector* jetCorrector_;
-  
-  // tree & branches
-  TTree*        tree_;
-  JRAEvent* 	JRAEvt_;
 };
 
 #endif
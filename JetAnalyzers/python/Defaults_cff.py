@@ -39,6 +39,14 @@ JetResponseParameters = cms.PSet(
     doHLT           = cms.bool(False)
 )
 
+#!
+#! JET ENERGY CORRECTIONS ATTACHED TO THE PROCESS
+#!
+# 'all'       : load JetCorrection_cff, i.e. the correction services, correctors
+#               and corrected jet producers of every algorithm
+# 'requested' : only those of the corrected jets requested, see addJetCorrection
+JetCorrectionScope = 'all'
+
 #!
 #! DEFAULT KT6CALOJET PARAMETERS
 #!
@@ -13,111 +13,60 @@ from JetMETAnalysis.JetAnalyzers.TrackJetReconstruction_cff import *
 #from JetMETAnalysis.JetAnalyzers.ak5CaloHLTJets_cff import *
 #from JetMETAnalysis.JetAnalyzers.ak5PFHLTJets_cff import *
 
+from JetMETAnalysis.JetAnalyzers.cloneFamilies import CloneFamilies
+
 #########################
 # ANTI-KT JET PRODUCERS #
 #########################
+# the clones are built on first use, see cloneFamilies.py
+_families = CloneFamilies(__name__)
+_rParam   = lambda size: size/10.
 
 #!
 #! GEN JET PRODUCERS
 #!
-ak1GenJets      = ak4GenJets.clone  ( rParam=0.1 )
-ak2GenJets      = ak4GenJets.clone  ( rParam=0.2 )
-ak3GenJets      = ak4GenJets.clone  ( rParam=0.3 )
-ak5GenJets      = ak4GenJets.clone  ( rParam=0.5 )
-ak6GenJets      = ak4GenJets.clone  ( rParam=0.6 )
-ak7GenJets      = ak4GenJets.clone  ( rParam=0.7 )
-ak9GenJets      = ak4GenJets.clone  ( rParam=0.9 )
-ak10GenJets     = ak4GenJets.clone  ( rParam=1.0 )
+_families.clones('ak%iGenJets', 'ak4GenJets', [1,2,3,5,6,7,9,10], rParam=_rParam)
 
 #!
 #! GEN JETS WITHOUT NEUTRINOS
 #!
-ak1GenJetsNoNu  = ak1GenJets.clone ( src = 'genParticlesForJetsNoNu' )
-ak2GenJetsNoNu  = ak2GenJets.clone ( src = 'genParticlesForJetsNoNu' )
-ak3GenJetsNoNu  = ak3GenJets.clone ( src = 'genParticlesForJetsNoNu' )
-ak5GenJetsNoNu  = ak5GenJets.clone ( src = 'genParticlesForJetsNoNu' )
-ak6GenJetsNoNu  = ak6GenJets.clone ( src = 'genParticlesForJetsNoNu' )
-ak7GenJetsNoNu  = ak7GenJets.clone ( src = 'genParticlesForJetsNoNu' )
-ak9GenJetsNoNu  = ak9GenJets.clone ( src = 'genParticlesForJetsNoNu' )
-ak10GenJetsNoNu = ak10GenJets.clone( src = 'genParticlesForJetsNoNu' )
+_families.clones('ak%iGenJetsNoNu', 'ak%iGenJets', [1,2,3,5,6,7,9,10], src='genParticlesForJetsNoNu')
 
 #!
 #! GENJETS WITHOUT MUONS & NEUTRINOS
 #!
-ak1GenJetsNoMuNoNu  = ak1GenJets.clone ( src = 'genParticlesForJetsNoMuNoNu' )
-ak2GenJetsNoMuNoNu  = ak2GenJets.clone ( src = 'genParticlesForJetsNoMuNoNu' )
-ak3GenJetsNoMuNoNu  = ak3GenJets.clone ( src = 'genParticlesForJetsNoMuNoNu' )
-ak6GenJetsNoMuNoNu  = ak6GenJets.clone ( src = 'genParticlesForJetsNoMuNoNu' )
-ak7GenJetsNoMuNoNu  = ak7GenJets.clone ( src = 'genParticlesForJetsNoMuNoNu' )
-ak9GenJetsNoMuNoNu  = ak9GenJets.clone ( src = 'genParticlesForJetsNoMuNoNu' )
-ak10GenJetsNoMuNoNu = ak10GenJets.clone( src = 'genParticlesForJetsNoMuNoNu' )
-
-#!
-#! HLT JETS
-#!
-ak5CaloHLTJets   = ak4CaloJets.clone( rParam=0.5, src = 'hltAntiKT5CaloJets' )
-ak5PFHLTJets     = ak4PFJets.clone( rParam=0.5, src = 'hltAntiKT5PFJets' )
-ak5PFCHSHLTJets  = ak4PFJets.clone( rParam=0.5, src = 'hltAntiKT5PFJetsNoPUPixelVert' )
+_families.clones('ak%iGenJetsNoMuNoNu', 'ak%iGenJets', [1,2,3,6,7,9,10], src='genParticlesForJetsNoMuNoNu')
 
 #!
 #! CALO JETS
 #!
-ak1CaloJets     = ak4CaloJets.clone ( rParam=0.1 )
-ak2CaloJets     = ak4CaloJets.clone ( rParam=0.2 )
-ak3CaloJets     = ak4CaloJets.clone ( rParam=0.3 )
-ak5CaloJets     = ak4CaloJets.clone ( rParam=0.5 )
-ak6CaloJets     = ak4CaloJets.clone ( rParam=0.6 )
-ak7CaloJets     = ak4CaloJets.clone ( rParam=0.7 )
-ak8CaloJets     = ak4CaloJets.clone ( rParam=0.8 )
-ak9CaloJets     = ak4CaloJets.clone ( rParam=0.9 )
-ak10CaloJets    = ak4CaloJets.clone ( rParam=1.0 )
+_families.clones('ak%iCaloJets', 'ak4CaloJets', [1,2,3,5,6,7,8,9,10], rParam=_rParam)
 
 #!
 #! PF JETS
 #!
-ak1PFJets       = ak4PFJets.clone   ( rParam=0.1 )
-ak2PFJets       = ak4PFJets.clone   ( rParam=0.2 )
-ak3PFJets       = ak4PFJets.clone   ( rParam=0.3 )
-ak5PFJets       = ak4PFJets.clone   ( rParam=0.5 )
-ak6PFJets       = ak4PFJets.clone   ( rParam=0.6 )
-ak7PFJets       = ak4PFJets.clone   ( rParam=0.7 )
-ak9PFJets       = ak4PFJets.clone   ( rParam=0.9 )
-ak10PFJets      = ak4PFJets.clone   ( rParam=1.0 )
+_families.clones('ak%iPFJets', 'ak4PFJets', [1,2,3,5,6,7,9,10], rParam=_rParam)
 
 #!
 #! PF JETS CHS
 #!
-ak1PFCHSJets    = ak1PFJets.clone( src = 'pfNoPileUpJME' )
-ak2PFCHSJets    = ak1PFCHSJets.clone( rParam=0.2 )
-ak3PFCHSJets    = ak1PFCHSJets.clone( rParam=0.3 )
-ak4PFCHSJets    = ak1PFCHSJets.clone( rParam=0.4 )
-ak5PFCHSJets    = ak1PFCHSJets.clone( rParam=0.5 )
-ak6PFCHSJets    = ak1PFCHSJets.clone( rParam=0.6 )
-ak7PFCHSJets    = ak1PFCHSJets.clone( rParam=0.7 )
-ak8PFCHSJets    = ak1PFCHSJets.clone( rParam=0.8 )
-ak9PFCHSJets    = ak1PFCHSJets.clone( rParam=0.9 )
-ak10PFCHSJets   = ak1PFCHSJets.clone( rParam=1.0 )
+_families.clones('ak%iPFCHSJets', 'ak1PFJets', [1], src='pfNoPileUpJME')
+_families.clones('ak%iPFCHSJets', 'ak1PFCHSJets', range(2,11), rParam=_rParam)
 
 #!
 #! PF JETS PUPPI
 #!
-ak1PUPPIJets  = ak4PFJets.clone( rParam=0.1, src = cms.InputTag('puppi') )
-ak2PUPPIJets  = ak4PFJets.clone( rParam=0.2, src = cms.InputTag('puppi') )
-ak3PUPPIJets  = ak4PFJets.clone( rParam=0.3, src = cms.InputTag('puppi') )
-ak4PUPPIJets  = ak4PFJets.clone( rParam=0.4, src = cms.InputTag('puppi') )
-ak5PUPPIJets  = ak4PFJets.clone( rParam=0.5, src = cms.InputTag('puppi') )
-ak6PUPPIJets  = ak4PFJets.clone( rParam=0.6, src = cms.InputTag('puppi') )
-ak7PUPPIJets  = ak4PFJets.clone( rParam=0.7, src = cms.InputTag('puppi') )
-ak8PUPPIJets  = ak4PFJets.clone( rParam=0.8, src = cms.InputTag('puppi') )
-ak9PUPPIJets  = ak4PFJets.clone( rParam=0.9, src = cms.InputTag('puppi') )
-ak10PUPPIJets = ak4PFJets.clone( rParam=1.0, src = cms.InputTag('puppi') )
+_families.clones('ak%iPUPPIJets', 'ak4PFJets', range(1,11), rParam=_rParam, src='puppi')
 
 #!
 #! HLT JETS
 #!
-ak5CaloHLTJets   = ak5CaloJets.clone( src = 'hltAntiKT5CaloJets' )
-ak5PFHLTJets     = ak5PFJets.clone( src = 'hltAntiKT5PFJets' )
-ak5PFCHSHLTJets  = ak5PFJets.clone( src = 'hltAntiKT5PFJetsNoPUPixelVert' )
+_families.clones('ak%iCaloHLTJets',  'ak%iCaloJets', [5], src='hltAntiKT5CaloJets')
+_families.clones('ak%iPFHLTJets',    'ak%iPFJets',   [5], src='hltAntiKT5PFJets')
+_families.clones('ak%iPFCHSHLTJets', 'ak%iPFJets',   [5], src='hltAntiKT5PFJetsNoPUPixelVert')
+
+__getattr__, __dir__ = _families.getattr, _families.dir
+_families.install()
 
 '''
 ####################
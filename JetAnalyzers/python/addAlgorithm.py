@@ -1,4 +1,9 @@
+import time
+_importStart = time.time()
+
+import importlib
 import FWCore.ParameterSet.Config as cms
+from JetMETAnalysis.JetAnalyzers.algSpec import parseAlgorithm
 
 ################################################################################
 ## filter final state partons (define globaly)
@@ -14,12 +19,68 @@ partons = cms.EDProducer('PartonSelector',
 ################################################################################
 ## jet reconstruction
 ################################################################################
-from JetMETAnalysis.JetAnalyzers.JetReconstruction_cff import *
-from JetMETAnalysis.JetAnalyzers.TauReconstruction_cff import *
-from JetMETAnalysis.JetAnalyzers.JPTReconstruction_cff import *
-from JetMETAnalysis.JetAnalyzers.JetCorrection_cff     import *
-from RecoTauTag.TauTagTools.tauDecayModes_cfi          import *
-from CommonTools.PileupAlgos.Puppi_cff import *
+## the jet, tau and correction configurations are only imported when an
+## algorithm needs them: importing this file must stay cheap, it is parsed by
+## every grid job and every local cmsRun
+from RecoTauTag.TauTagTools.tauDecayModes_cfi import tauToOneProng0PiZero, tauToOneProng1PiZero, \
+                                                     tauToOneProng2PiZero, tauToThreeProng0PiZero
+
+jetModules = [
+    'JetMETAnalysis.JetAnalyzers.JetReconstruction_cff',
+    'JetMETAnalysis.JetAnalyzers.TauReconstruction_cff',
+    'JetMETAnalysis.JetAnalyzers.JPTReconstruction_cff',
+    'JetMETAnalysis.JetAnalyzers.JetCorrection_cff',
+    'CommonTools.PileupAlgos.Puppi_cff',
+]
+
+def jetObject(name, modules = jetModules):
+    """
+    return the configuration object called name, looking into the modules
+    (imported on first use) in the given order
+    """
+    for moduleName in modules:
+        module = importlib.import_module(moduleName)
+        if hasattr(module, name):
+            return getattr(module, name)
+    raise ValueError("No jet configuration object called " + name + " in " + ", ".join(modules))
+
+
+class JetCollectionRegistry(object):
+    """
+    maps alg_size_type[_corr] to (label, module) like a dict, but only knows
+    the labels up front: the module is looked up with jetObject the first
+    time it is asked for and cached afterwards. Assigning a string registers
+    a label, assigning a (label, module) tuple registers both.
+    """
+    def __init__(self, modules = jetModules):
+        self.modules = modules
+        self.labels  = {}
+        self.cache   = {}
+    def __setitem__(self, key, value):
+        if isinstance(value, tuple):
+            self.labels[key] = value[0]
+            self.cache[key]  = value
+        else:
+            self.labels[key] = value
+            self.cache.pop(key, None)
+    def __getitem__(self, key):
+        if key not in self.cache:
+            label = self.labels[key]
+            self.cache[key] = (label, jetObject(label, self.modules))
+        return self.cache[key]
+    def __contains__(self, key):
+        return key in self.labels
+    def __iter__(self):
+        return iter(self.labels)
+    def __len__(self):
+        return len(self.labels)
+    def keys(self):
+        return list(self.labels.keys())
+    def label(self, key):
+        return self.labels[key]
+    def resolved(self):
+        return list(self.cache.keys())
+
 
 stdClusteringAlgorithms = ['ak'] #Options: {ak,kt}
 stdJetTypes = ['calo','pf','pfchs','puppi'] #Options: {'calo','pf','pfchs','puppi'}
@@ -30,10 +91,10 @@ stdCorrectionLevels = {
 } #Options{l1,l2l3,l1l2l3}
 
 stdGenJetsDict = {}
-genJetsDict = {}
+genJetsDict = JetCollectionRegistry(jetModules[:3])
 stdRecJetsDict = {}
-recJetsDict = {}
-corrJetsDict = {}
+recJetsDict = JetCollectionRegistry(jetModules[:3])
+corrJetsDict = JetCollectionRegistry(jetModules[3:4] + jetModules[:3])
 
 for ca in stdClusteringAlgorithms:
     for jt in stdJetTypes:
@@ -44,7 +105,7 @@ for ca in stdClusteringAlgorithms:
             tmpString = str(ca)+str(r)+"GenJets"
             stdGenJetsDict[alg_size_type] = tmpString
             tmpString = str(ca)+str(r)+"GenJetsNoNu"
-            genJetsDict[alg_size_type] = (tmpString,eval(tmpString))
+            genJetsDict[alg_size_type] = tmpString
 
             ## Reconstructed Jets
             if jt == 'calo' :
@@ -52,7 +113,7 @@ for ca in stdClusteringAlgorithms:
             else :
                 tmpString = str(ca)+str(r)+str(jt).upper()+'Jets'
             stdRecJetsDict[alg_size_type] = tmpString
-            recJetsDict[alg_size_type] = (tmpString,eval(tmpString))
+            recJetsDict[alg_size_type] = tmpString
 
             ## Corrected Jets
             for cl in stdCorrectionLevels :
@@ -63,44 +124,44 @@ for ca in stdClusteringAlgorithms:
                     tmpString = str(ca)+str(r)+str(jt).capitalize()+'Jets'+str(stdCorrectionLevels[cl])
                 else :
                     tmpString = str(ca)+str(r)+str(jt).upper()+'Jets'+str(stdCorrectionLevels[cl])
-                corrJetsDict[alg_size_type_corr] = (tmpString,eval(tmpString))
+                corrJetsDict[alg_size_type_corr] = tmpString
 
 ## Extra JPT Collections
 stdGenJetsDict['ak4jpt']     = 'ak4GenJets'
-genJetsDict['ak4jpt']        = ('ak4GenJetsNoNu',       ak4GenJetsNoNu)
+genJetsDict['ak4jpt']        = 'ak4GenJetsNoNu'
 stdRecJetsDict['ak4jpt']     = 'ak4JPTJets'
-recJetsDict['ak4jpt']        = ('ak4JPTJets',           ak4JPTJets)
-corrJetsDict['ak4jptl1']     = ('ak4JPTJetsL1',         ak4JPTJetsL1)
-corrJetsDict['ak4jptl2l3']   = ('ak4JPTJetsL2L3',       ak4JPTJetsL2L3)
-corrJetsDict['ak4jptl1l2l3'] = ('ak4JPTJetsL1FastL2L3', ak4JPTJetsL1FastL2L3)
+recJetsDict['ak4jpt']        = 'ak4JPTJets'
+corrJetsDict['ak4jptl1']     = 'ak4JPTJetsL1'
+corrJetsDict['ak4jptl2l3']   = 'ak4JPTJetsL2L3'
+corrJetsDict['ak4jptl1l2l3'] = 'ak4JPTJetsL1FastL2L3'
 '''
 ## Extra TRK Jet Collections
 stdGenJetsDict['ak5trk'] = 'ak5GenJets'
 stdGenJetsDict['ak7trk'] = 'ak7GenJets'
 stdGenJetsDict['kt4trk'] = 'kt4GenJets'
 stdGenJetsDict['kt6trk'] = 'kt6GenJets'
-genJetsDict['ak5trk']    = ('ak5GenJetsNoNu', ak5GenJetsNoNu)
-genJetsDict['ak7trk']    = ('ak7GenJetsNoNu', ak7GenJetsNoNu)
-genJetsDict['kt4trk']    = ('kt4GenJetsNoNu', kt4GenJetsNoNu)
-genJetsDict['kt6trk']    = ('kt6GenJetsNoNu', kt6GenJetsNoNu)
+genJetsDict['ak5trk']    = 'ak5GenJetsNoNu'
+genJetsDict['ak7trk']    = 'ak7GenJetsNoNu'
+genJetsDict['kt4trk']    = 'kt4GenJetsNoNu'
+genJetsDict['kt6trk']    = 'kt6GenJetsNoNu'
 stdRecJetsDict['ak5trk'] = 'ak5TrackJets'
 stdRecJetsDict['kt4trk'] = 'kt4TrackJets'
-recJetsDict['ak5trk']    = ('ak5TrackJets',   ak5TrackJets)
-recJetsDict['kt4trk']    = ('kt4TrackJets',   kt4TrackJets)
+recJetsDict['ak5trk']    = 'ak5TrackJets'
+recJetsDict['kt4trk']    = 'kt4TrackJets'
 
 ## Extra kT Jet Collections
-corrJetsDict['kt4pfl1'    ] = ('kt4PFJetsL1',         kt4PFJetsL1),
-corrJetsDict['kt6pfl1'    ] = ('kt6PFJetsL1',         kt6PFJetsL1),
-corrJetsDict['kt4pfl2l3'  ] = ('kt4PFJetsL2L3',       kt4PFJetsL2L3),
-corrJetsDict['kt6pfl2l3'  ] = ('kt6PFJetsL2L3',       kt6PFJetsL2L3),
-corrJetsDict['kt4pfl1l2l3'] = ('kt4PFJetsL1FastL2L3', kt4PFJetsL1FastL2L3),
-corrJetsDict['kt6pfl1l2l3'] = ('kt6PFJetsL1FastL2L3', kt6PFJetsL1FastL2L3),
+corrJetsDict['kt4pfl1'    ] = 'kt4PFJetsL1'
+corrJetsDict['kt6pfl1'    ] = 'kt6PFJetsL1'
+corrJetsDict['kt4pfl2l3'  ] = 'kt4PFJetsL2L3'
+corrJetsDict['kt6pfl2l3'  ] = 'kt6PFJetsL2L3'
+corrJetsDict['kt4pfl1l2l3'] = 'kt4PFJetsL1FastL2L3'
+corrJetsDict['kt6pfl1l2l3'] = 'kt6PFJetsL1FastL2L3'
 '''
 ## Extra Tau Collections
 stdGenJetsDict['ak5tauHPSall'] = 'tauGenJetsSelectorAllHadrons'
-genJetsDict['ak5tauHPSall']    = ('tauGenJetsSelectorAllHadrons', tauGenJetsSelectorAllHadrons)
+genJetsDict['ak5tauHPSall']    = 'tauGenJetsSelectorAllHadrons'
 stdRecJetsDict['ak5tauHPSall'] = 'hpsPFTauProducer'
-recJetsDict['ak5tauHPSall']    = ('hpsPFTauProducer',   hpsPFTauProducer)
+recJetsDict['ak5tauHPSall']    = 'hpsPFTauProducer'
 
 tauDiscriminatorDict = {
     "ak5tauHPSlooseCombDBcorr"  : "hpsPFTauDiscriminationByLooseCombinedIsolationDBSumPtCorr3Hits",
@@ -132,9 +193,9 @@ for tauDiscriminator_and_DecayMode in tauDiscriminators_and_DecayModes:
 
 for tauDiscriminator_and_DecayMode in tauDiscriminators_and_DecayModes:
     if   tauDiscriminator_and_DecayMode.find("HPS")  != -1:
-        genJetsDict[tauDiscriminator_and_DecayMode] = genJetsDict["ak5tauHPSall"]
+        genJetsDict[tauDiscriminator_and_DecayMode] = genJetsDict.label("ak5tauHPSall")
     elif tauDiscriminator_and_DecayMode.find("TaNC") != -1:
-        genJetsDict[tauDiscriminator_and_DecayMode] = genJetsDict["ak5tauTaNCall"]
+        genJetsDict[tauDiscriminator_and_DecayMode] = genJetsDict.label("ak5tauTaNCall")
 
 for tauDiscriminator_and_DecayMode in tauDiscriminators_and_DecayModes:
     if   tauDiscriminator_and_DecayMode.find("HPS")  != -1:
@@ -144,9 +205,100 @@ for tauDiscriminator_and_DecayMode in tauDiscriminators_and_DecayModes:
 
 for tauDiscriminator_and_DecayMode in tauDiscriminators_and_DecayModes:
     if   tauDiscriminator_and_DecayMode.find("HPS")  != -1:
-        recJetsDict[tauDiscriminator_and_DecayMode] = recJetsDict["ak5tauHPSall"]
+        recJetsDict[tauDiscriminator_and_DecayMode] = recJetsDict.label("ak5tauHPSall")
     elif tauDiscriminator_and_DecayMode.find("TaNC") != -1:
-        recJetsDict[tauDiscriminator_and_DecayMode] = recJetsDict["ak5tauTaNCall"]
+        recJetsDict[tauDiscriminator_and_DecayMode] = recJetsDict.label("ak5tauTaNCall")
+
+
+def tauAlgorithms(discriminators = None, decayModes = None):
+    """
+    the tau algorithm strings for every discriminator x decay mode, e.g.
+    ak5tauHPSmediumCombDBcorrOneProng1Pi0; by default all entries of
+    tauDiscriminatorDict and tauDecayModeDict
+    """
+    if discriminators is None:
+        discriminators = sorted(tauDiscriminatorDict)
+    if decayModes is None:
+        decayModes = sorted(tauDecayModeDict)
+    return [discriminator + decayMode for discriminator in discriminators for decayMode in decayModes]
+
+
+def tauReconstruction(process, alg_size_type):
+    """
+    return the tau reconstruction sequence shared by all tau algorithms of
+    the same kind, tauRecoHPSSequence or tauRecoTaNCSequence: the PF taus,
+    their discriminators and the tau genjets. It is created, and
+    RecoPFTauTag_cff & TauGenJets_cfi loaded, by the first tau algorithm
+    only; every discriminator x decay mode algorithm just adds its own
+    pfTauSelector behind it.
+    """
+    kind = 'HPS'
+    if "TaNC" in alg_size_type:
+        kind = 'TaNC'
+    label = 'tauReco' + kind + 'Sequence'
+    if hasattr(process, label):
+        return getattr(process, label)
+    if not hasattr(process, 'recoTauCommonSequence'):
+        process.load("RecoTauTag/Configuration/RecoPFTauTag_cff")
+    if not hasattr(process, 'tauGenJets'):
+        process.load("PhysicsTools.JetMCAlgos.TauGenJets_cfi")
+    tauReco = cms.Sequence(process.recoTauCommonSequence)
+    if kind == 'HPS':
+        tauReco += process.recoTauClassicHPSSequence
+    else:
+        tauReco += process.recoTauHPSTancSequence
+    tauReco += process.tauGenJets
+    setattr(process, label, tauReco)
+    return tauReco
+
+
+################################################################################
+## jet corrections
+################################################################################
+def jetCorrectionObjects(corrLabel):
+    """
+    return the (label, object) pairs needed to produce the corrected jets
+    corrLabel, e.g. ak4PFCHSJetsL1FastL2L3, found by following the corrector
+    labels (looked up like corrJetsDict does): the corrected jet producer,
+    the corrector producers of its corrector chain and the
+    JetCorrectionESChain named after its corrector (the jecLabel of the
+    JetResponseAnalyzer) with the correction services it chains
+    """
+    corrJets = jetObject(corrLabel, corrJetsDict.modules)
+    objects = [(corrLabel, corrJets)]
+    labels = [str(corrector) for corrector in corrJets.correctors]
+    labels += [label.replace("Corrector","") for label in labels]
+    while len(labels) > 0:
+        label = labels.pop(0)
+        if label in [known for (known, obj) in objects]:
+            continue
+        obj = jetObject(label, corrJetsDict.modules)
+        objects.append((label, obj))
+        if hasattr(obj, 'correctors'):
+            labels += [str(corrector) for corrector in obj.correctors]
+    return objects
+
+
+def addJetCorrection(process, corrLabel, Defaults):
+    """
+    attach what is needed to produce the corrected jets corrLabel to the
+    process and return the corrector chain to run in front of them. With
+    Defaults.JetCorrectionScope = 'all' the whole JetCorrection_cff is
+    loaded (every correction service, corrector and corrected jet producer
+    of all algorithms), with 'requested' only the objects reached by
+    jetCorrectionObjects(corrLabel), so the EventSetup holds the services of
+    the requested algorithms only.
+    """
+    if Defaults.JetCorrectionScope == 'all':
+        process.load('JetMETAnalysis.JetAnalyzers.JetCorrection_cff')
+    elif Defaults.JetCorrectionScope == 'requested':
+        for (label, obj) in jetCorrectionObjects(corrLabel):
+            if not hasattr(process, label):
+                setattr(process, label, obj)
+    else:
+        raise ValueError("Invalid JetCorrectionScope '" + str(Defaults.JetCorrectionScope) +
+                         "', expected 'all' or 'requested'")
+    return jetObject(corrLabel.replace("Jets","")+"CorrectorChain")
 
 
 ################################################################################
@@ -169,77 +321,16 @@ def addAlgorithm(process, alg_size_type_corr, Defaults, reco, doProducer):
     the JetResponseAnalyzer.
     """ 
     ## deterine algorithm, size, type (Calo|PF|Track|JPT), and wether to apply jec
-    alg_size      = ''
-    type          = ''
-    alg_size_type = ''
-    correctl1     = False
-    correctl1off  = False
-    correctl2l3   = False
-    if (alg_size_type_corr.find('caloHLT') > 0) :
-        alg_size      = alg_size_type_corr[0:alg_size_type_corr.find('caloHLT')]
-        type          = 'CaloHLT'
-        alg_size_type = alg_size + 'caloHLT'
-    elif (alg_size_type_corr.find('calo') > 0) :
-        alg_size      = alg_size_type_corr[0:alg_size_type_corr.find('calo')]
-        type          = 'Calo'
-        alg_size_type = alg_size + 'calo'
-    elif (alg_size_type_corr.find('pfHLT') > 0) :
-        alg_size      = alg_size_type_corr[0:alg_size_type_corr.find('pfHLT')]
-        type          = 'PFHLT'
-        alg_size_type = alg_size + 'pfHLT'
-    elif (alg_size_type_corr.find('pfchsHLT') > 0) :
-        alg_size      = alg_size_type_corr[0:alg_size_type_corr.find('pfchsHLT')]
-        type          = 'PFchsHLT'
-        alg_size_type = alg_size + 'pfchsHLT'
-    elif (alg_size_type_corr.find('pfchs') > 0) :
-        alg_size      = alg_size_type_corr[0:alg_size_type_corr.find('pfchs')]
-        type          = 'PFchs'
-        alg_size_type = alg_size + 'pfchs'
-    elif (alg_size_type_corr.find('pf') > 0) :
-        alg_size      = alg_size_type_corr[0:alg_size_type_corr.find('pf')]
-        type          = 'PF'
-        alg_size_type = alg_size + 'pf'
-    elif (alg_size_type_corr.find('puppi') > 0) :
-        alg_size      = alg_size_type_corr[0:alg_size_type_corr.find('puppi')]
-        type          = 'PUPPI'
-        alg_size_type = alg_size + 'puppi'
-    elif (alg_size_type_corr.find('tau') > 0) :
-        alg_size      = alg_size_type_corr[0:alg_size_type_corr.find('tau')]
-        type          = 'TAU'
-        if "tauHPSall" in alg_size_type_corr:
-            alg_size_type = alg_size + 'tauHPSall'
-        elif "tauTaNCall" in alg_size_type_corr:
-            alg_size_type = alg_size + 'tauTaNCall'
-        else:
-            for tauDiscriminator in tauDiscriminatorDict:
-                if tauDiscriminator in alg_size_type_corr: 
-                    alg_size_type = tauDiscriminator
-            for tauDecayMode in tauDecayModeDict:
-                if tauDecayModeDict[tauDecayMode] != "" and \
-                   tauDecayMode in alg_size_type_corr:
-                    alg_size_type += tauDecayMode
-                    
-    elif (alg_size_type_corr.find('jpt') > 0) :
-        alg_size      = alg_size_type_corr[0:alg_size_type_corr.find('jpt')]
-        type          = 'JPT'
-        alg_size_type = alg_size + 'jpt'
-    elif (alg_size_type_corr.find('trk') > 0) :
-        alg_size      = alg_size_type_corr[0:alg_size_type_corr.find('trk')]
-        type          = 'Track'
-        alg_size_type = alg_size + 'trk'
-    else:
-        raise ValueError("Can't identify valid jet type: calo|caloHLT|pf|pfchs|pfHLT|jpt|trk|tau|puppi")
-        
-    if (alg_size_type_corr.find('l1') > 0):
-        correctl1 = True
-        if (alg_size_type_corr.find('l1off') > 0):
-            correctl1off = True
-        if not reco and type!='Calo':
-            raise ValueError("Can't subtract PU without reco!")
-        
-    if (alg_size_type_corr.find('l2l3') > 0):
-        correctl2l3 = True
+    spec          = parseAlgorithm(alg_size_type_corr)
+    alg_size      = spec.alg_size
+    type          = spec.type
+    alg_size_type = spec.alg_size_type
+    correctl1     = spec.correctl1
+    correctl1off  = spec.correctl1off
+    correctl2l3   = spec.correctl2l3
 
+    if correctl1 and not reco and type!='Calo':
+        raise ValueError("Can't subtract PU without reco!")
 
     ## check that alg_size_type_corr refers to valid jet configuration
     try:
@@ -262,7 +353,7 @@ def addAlgorithm(process, alg_size_type_corr, Defaults, reco, doProducer):
     ## reference (genjet) kinematic selection
     refPtEta = cms.EDFilter('EtaPtMinCandViewRefSelector',
         Defaults.RefPtEta,
-        src = cms.InputTag(genJetsDict[alg_size_type][0])
+        src = cms.InputTag(genJetsDict.label(alg_size_type))
     )
     if not reco:
         refPtEta.src = stdGenJetsDict[alg_size_type]
@@ -271,7 +362,7 @@ def addAlgorithm(process, alg_size_type_corr, Defaults, reco, doProducer):
     ## reco jet kinematic selection
     jetPtEta = cms.EDFilter('EtaPtMinCandViewRefSelector',
         Defaults.JetPtEta,
-        src = cms.InputTag(recJetsDict[alg_size_type][0])
+        src = cms.InputTag(recJetsDict.label(alg_size_type))
     )
     if not reco:
         jetPtEta.src = stdRecJetsDict[alg_size_type]
@@ -289,64 +380,64 @@ def addAlgorithm(process, alg_size_type_corr, Defaults, reco, doProducer):
     ## correct jets
     corrLabel = ''
     if correctl1 or correctl2l3:
-        process.load('JetMETAnalysis.JetAnalyzers.JetCorrection_cff')
         (corrLabel, corrJets) = corrJetsDict[alg_size_type_corr]
+        correctorChain = addJetCorrection(process, corrLabel, Defaults)
         setattr(process, corrLabel, corrJets)
-        sequence = cms.Sequence(eval(corrLabel.replace("Jets","")+"CorrectorChain") * corrJets * sequence)
+        sequence = cms.Sequence(correctorChain * corrJets * sequence)
 
     ## add pu density calculation
     if not correctl1 and not correctl1off:
         if type == 'CaloHLT': #added 02/15/2012
-            process.kt6CaloJets = kt6CaloJets 
+            process.kt6CaloJets = jetObject('kt6CaloJets')
             process.kt6CaloJets.doRhoFastjet = True
             process.kt6CaloJets.Ghost_EtaMax = Defaults.kt6CaloJetParameters.Ghost_EtaMax.value()
             process.kt6CaloJets.Rho_EtaMax   = Defaults.kt6CaloJetParameters.Rho_EtaMax
             sequence = cms.Sequence(process.kt6CaloJets * sequence)
         elif type == 'PFchsHLT':
-            process.kt6PFJets = kt6PFJets
+            process.kt6PFJets = jetObject('kt6PFJets')
             process.kt6PFJets.doRhoFastjet = True
             process.kt6PFJets.Ghost_EtaMax = Defaults.kt6PFJetParameters.Ghost_EtaMax.value()
             process.kt6PFJets.Rho_EtaMax   = Defaults.kt6PFJetParameters.Rho_EtaMax
             sequence = cms.Sequence(process.kt6PFJets * sequence)
         elif type == 'PFHLT':
-            process.kt6PFJets = kt6PFJets
+            process.kt6PFJets = jetObject('kt6PFJets')
             process.kt6PFJets.doRhoFastjet = True
             process.kt6PFJets.Ghost_EtaMax = Defaults.kt6PFJetParameters.Ghost_EtaMax.value()
             process.kt6PFJets.Rho_EtaMax   = Defaults.kt6PFJetParameters.Rho_EtaMax
             sequence = cms.Sequence(process.kt6PFJets * sequence)
     elif correctl1 and not correctl1off:  #modified 10/10/2011
         if type == 'CaloHLT': #added 02/15/2012
-            process.kt6CaloJets = kt6CaloJets 
+            process.kt6CaloJets = jetObject('kt6CaloJets')
             process.kt6CaloJets.doRhoFastjet = True
             process.kt6CaloJets.Ghost_EtaMax = Defaults.kt6PFJetParameters.Ghost_EtaMax.value()
             process.kt6CaloJets.Rho_EtaMax   = Defaults.kt6PFJetParameters.Rho_EtaMax
             sequence = cms.Sequence(process.kt6CaloJets * sequence)
         elif type == 'Calo' and reco:
-            process.kt6CaloJets = kt6CaloJets
+            process.kt6CaloJets = jetObject('kt6CaloJets')
             process.kt6CaloJets.doRhoFastjet = True
             process.kt6CaloJets.Ghost_EtaMax = Defaults.kt6CaloJetParameters.Ghost_EtaMax.value()
             process.kt6CaloJets.Rho_EtaMax   = Defaults.kt6CaloJetParameters.Rho_EtaMax
             sequence = cms.Sequence(process.kt6CaloJets * sequence)
         elif type == 'PFchs':
-            process.kt6PFJets = kt6PFJets
+            process.kt6PFJets = jetObject('kt6PFJets')
             process.kt6PFJets.doRhoFastjet = True
             process.kt6PFJets.Ghost_EtaMax = Defaults.kt6PFJetParameters.Ghost_EtaMax.value()
             process.kt6PFJets.Rho_EtaMax   = Defaults.kt6PFJetParameters.Rho_EtaMax
             sequence = cms.Sequence(process.kt6PFJets * sequence)
         elif type == 'PFHLT':
-            process.kt6PFJets = kt6PFJets
+            process.kt6PFJets = jetObject('kt6PFJets')
             process.kt6PFJets.doRhoFastjet = True
             process.kt6PFJets.Ghost_EtaMax = Defaults.kt6PFJetParameters.Ghost_EtaMax.value()
             process.kt6PFJets.Rho_EtaMax   = Defaults.kt6PFJetParameters.Rho_EtaMax
             sequence = cms.Sequence(process.kt6PFJets * sequence)
         elif type == 'PFchsHLT':
-            process.kt6PFJets = kt6PFJets
+            process.kt6PFJets = jetObject('kt6PFJets')
             process.kt6PFJets.doRhoFastjet = True
             process.kt6PFJets.Ghost_EtaMax = Defaults.kt6PFJetParameters.Ghost_EtaMax.value()
             process.kt6PFJets.Rho_EtaMax   = Defaults.kt6PFJetParameters.Rho_EtaMax
             sequence = cms.Sequence(process.kt6PFJets * sequence)
         elif type == 'PF':
-            process.kt6PFJets = kt6PFJets
+            process.kt6PFJets = jetObject('kt6PFJets')
             process.kt6PFJets.doRhoFastjet = True
             process.kt6PFJets.Ghost_EtaMax = Defaults.kt6PFJetParameters.Ghost_EtaMax.value()
             process.kt6PFJets.Rho_EtaMax   = Defaults.kt6PFJetParameters.Rho_EtaMax
@@ -383,21 +474,15 @@ def addAlgorithm(process, alg_size_type_corr, Defaults, reco, doProducer):
         if type == 'PUPPI':
             process.load('CommonTools.PileupAlgos.Puppi_cff')
             #puppi.candName = cms.InputTag("particleFlow")
-            sequence = cms.Sequence(puppi * sequence)
+            sequence = cms.Sequence(jetObject('puppi') * sequence)
         if type == 'Track':
             process.load('JetMETAnalysis.JetAnalyzers.TrackJetReconstruction_cff')
-            sequence = cms.Sequence(trackJetSequence * sequence)
+            sequence = cms.Sequence(jetObject('trackJetSequence') * sequence)
         elif type == 'TAU':
             from PhysicsTools.PatAlgos.tools.helpers import massSearchReplaceParam
             from RecoTauTag.TauTagTools.PFTauSelector_cfi import pfTauSelector
             #process.load("TrackingTools/TransientTrack/TransientTrackBuilder_cfi")
-            process.load("RecoTauTag/Configuration/RecoPFTauTag_cff")
-
-            tauRecoSequence = cms.Sequence(process.recoTauCommonSequence)
-            if "HPS" in alg_size_type:
-                tauRecoSequence += process.recoTauClassicHPSSequence
-            elif "TaNC" in alg_size_type:
-                tauRecoSequence += process.recoTauHPSTancSequence
+            tauRecoSequence = cms.Sequence(tauReconstruction(process, alg_size_type))
 
             (tauIsoDiscriminator, tauDecayMode) = tauDiscriminators_and_DecayModes[alg_size_type]
 
@@ -442,10 +527,8 @@ def addAlgorithm(process, alg_size_type_corr, Defaults, reco, doProducer):
                 tauRecoSequence += getattr(process, selTauModuleName)
 #                        
 #                jetPtEta.src = cms.InputTag(selTauModuleName)
-#            
-            process.load("PhysicsTools.JetMCAlgos.TauGenJets_cfi")
 #
-            sequence = cms.Sequence(tauRecoSequence * process.tauGenJets * sequence)
+            sequence = cms.Sequence(tauRecoSequence * sequence)
 
     # reconstruct genjets
     if reco:
@@ -455,18 +538,18 @@ def addAlgorithm(process, alg_size_type_corr, Defaults, reco, doProducer):
         sequence.replace(refPtEta, genJets * refPtEta)
 
         if type == 'Calo':
-            setattr(process, 'genParticlesForJetsNoNu', genParticlesForJetsNoNu) #chaned to NoNu from NoMuNoNu
-            sequence = cms.Sequence(genParticlesForJetsNoNu * sequence)
+            setattr(process, 'genParticlesForJetsNoNu', jetObject('genParticlesForJetsNoNu')) #chaned to NoNu from NoMuNoNu
+            sequence = cms.Sequence(process.genParticlesForJetsNoNu * sequence)
         else:
-            setattr(process,'genParticlesForJetsNoNu',genParticlesForJetsNoNu)
-            sequence = cms.Sequence(genParticlesForJetsNoNu * sequence)
+            setattr(process,'genParticlesForJetsNoNu',jetObject('genParticlesForJetsNoNu'))
+            sequence = cms.Sequence(process.genParticlesForJetsNoNu * sequence)
         refPtEta.src = genJets.label()
         
     ## filter / map partons only if flavor information is requested
     if Defaults.JetResponseParameters.doFlavor.value() :
         setattr(process, 'partons', partons)
         if reco: #added 02/29/2012
-            jetsTag = cms.InputTag(genJetsDict[alg_size_type][0])
+            jetsTag = cms.InputTag(genJetsDict.label(alg_size_type))
         else:
             jetsTag = cms.InputTag(stdGenJetsDict[alg_size_type])
         genToParton = cms.EDProducer('JetPartonMatcher',
@@ -531,34 +614,34 @@ def addAlgorithm(process, alg_size_type_corr, Defaults, reco, doProducer):
     elif type == 'Calo':
         jra.srcRho = cms.InputTag("fixedGridRhoFastjetAllCalo")
     elif type == 'PFchs':
-        process.kt6PFchsJetsRhos = kt6PFJets.clone(src = 'pfNoPileUpJME',
-                                                   doFastJetNonUniform = cms.bool(True),
-                                                   puCenters = cms.vdouble(-5,-4,-3,-2,-1,0,1,2,3,4,5), 
-                                                   puWidth = cms.double(.8),
-                                                   nExclude = cms.uint32(2))
+        process.kt6PFchsJetsRhos = jetObject('kt6PFJets').clone(src = 'pfNoPileUpJME',
+                                                                doFastJetNonUniform = cms.bool(True),
+                                                                puCenters = cms.vdouble(-5,-4,-3,-2,-1,0,1,2,3,4,5), 
+                                                                puWidth = cms.double(.8),
+                                                                nExclude = cms.uint32(2))
         sequence = cms.Sequence(process.kt6PFchsJetsRhos * sequence)
         jra.srcRhos = cms.InputTag("kt6PFchsJetsRhos", "rhos")
         jra.srcRho = cms.InputTag("fixedGridRhoFastjetAll")
         jra.srcPFCandidates = cms.InputTag('pfNoPileUpJME')
     elif type == 'PFHLT':
-        jra.srcRho = ak4PFL1Fastjet.srcRho #added 02/15/2012
-        jra.srcRhoHLT = ak5PFHLTL1Fastjet.srcRho
+        jra.srcRho = jetObject('ak4PFL1Fastjet').srcRho #added 02/15/2012
+        jra.srcRhoHLT = jetObject('ak5PFHLTL1Fastjet').srcRho
     elif type == 'PFchsHLT':
-        jra.srcRho = ak4PFchsL1Fastjet.srcRho #added 02/15/2012
-        jra.srcRhoHLT = ak5PFchsHLTL1Fastjet.srcRho
+        jra.srcRho = jetObject('ak4PFchsL1Fastjet').srcRho #added 02/15/2012
+        jra.srcRhoHLT = jetObject('ak5PFchsHLTL1Fastjet').srcRho
     elif type == 'PF':
-        process.kt6PFJetsRhos = kt6PFJets.clone(doFastJetNonUniform = cms.bool(True),
-                                                puCenters = cms.vdouble(-5,-4,-3,-2,-1,0,1,2,3,4,5),
-                                                puWidth = cms.double(.8), 
-                                                nExclude = cms.uint32(2))
+        process.kt6PFJetsRhos = jetObject('kt6PFJets').clone(doFastJetNonUniform = cms.bool(True),
+                                                             puCenters = cms.vdouble(-5,-4,-3,-2,-1,0,1,2,3,4,5),
+                                                             puWidth = cms.double(.8), 
+                                                             nExclude = cms.uint32(2))
         sequence = cms.Sequence(process.kt6PFJetsRhos * sequence)
         jra.srcRhos = cms.InputTag("kt6PFJetsRhos", "rhos")
         jra.srcRho = cms.InputTag("fixedGridRhoFastjetAll")
         jra.srcPFCandidates = cms.InputTag('particleFlow')
     elif type == 'PUPPI':
-        process.kt6PFJetsRhos = kt6PFJets.clone(doFastJetNonUniform = cms.bool(True),
-                                                puCenters = cms.vdouble(-5,-4,-3,-2,-1,0,1,2,3,4,5),
-                                                puWidth = cms.double(.8), nExclude = cms.uint32(2))
+        process.kt6PFJetsRhos = jetObject('kt6PFJets').clone(doFastJetNonUniform = cms.bool(True),
+                                                             puCenters = cms.vdouble(-5,-4,-3,-2,-1,0,1,2,3,4,5),
+                                                             puWidth = cms.double(.8), nExclude = cms.uint32(2))
         sequence = cms.Sequence(process.kt6PFJetsRhos * sequence)
         jra.srcRhos = cms.InputTag("kt6PFJetsRhos", "rhos")
         jra.srcRho = cms.InputTag("fixedGridRhoFastjetAll")
@@ -585,3 +668,315 @@ def addAlgorithm(process, alg_size_type_corr, Defaults, reco, doProducer):
     path = cms.Path( sequence )
     setattr(process, alg_size_type_corr + 'Path', path)
     print alg_size_type_corr
+
+
+################################################################################
+## planAlgorithms
+################################################################################
+class _ModuleCollector(object):
+    """ visitor collecting the modules of a sequence in execution order """
+    def __init__(self):
+        self.modules = []
+    def enter(self, visitee):
+        if isinstance(visitee, (cms.EDProducer, cms.EDFilter, cms.EDAnalyzer)) and \
+           not any(visitee is module for module in self.modules):
+            self.modules.append(visitee)
+    def leave(self, visitee):
+        pass
+
+
+def planAlgorithms(process, algorithms, Defaults, reco, doProducer):
+    """
+    planAlgorithms takes the following parameters:
+    ==============================================
+      process:            the CMSSW process object
+      algorithms:         a list of alg_size_type_corr strings, see addAlgorithm
+      reco:               either a bool used for all algorithms or a dict
+                          which maps each algorithm to a bool
+      doProducer:         see addAlgorithm
+    it first calls addAlgorithm for every requested algorithm and then
+    collects the producers which ended up in more than one algorithm
+    sequence (genParticlesForJetsNoNu, partons, kt6PFJets, the rho producers,
+    pfNoPileUpJMESequence, ...). Those are moved into one shared task,
+    jraSharedTask, and every <alg>Path is rebuilt from the modules unique to
+    its algorithm. Filters stay in the paths since their decision matters.
+    Without cms.Task (CMSSW < 9_1) the shared producers are left to the
+    unscheduled mode. Returns the list of shared module labels.
+    """
+    for algorithm in algorithms:
+        doReco = reco
+        if isinstance(reco, dict):
+            doReco = reco[algorithm]
+        addAlgorithm(process, algorithm, Defaults, doReco, doProducer)
+
+    ## find the producers used by more than one algorithm
+    algModules = {}
+    users = {}
+    for algorithm in algorithms:
+        collector = _ModuleCollector()
+        getattr(process, algorithm + 'Sequence').visit(collector)
+        algModules[algorithm] = collector.modules
+        for module in collector.modules:
+            users.setdefault(module.label(), []).append(algorithm)
+    shared = [label for label in sorted(users)
+              if len(users[label]) > 1 and isinstance(getattr(process, label), cms.EDProducer)]
+    if len(shared) == 0:
+        return shared
+
+    ## rebuild the per algorithm sequences & paths without the shared producers
+    sharedTask = None
+    if hasattr(cms, 'Task'):
+        sharedTask = cms.Task(*[getattr(process, label) for label in shared])
+        process.jraSharedTask = sharedTask
+    else:
+        process.options.allowUnscheduled = cms.untracked.bool(True)
+    for algorithm in algorithms:
+        unique = [module for module in algModules[algorithm] if module.label() not in shared]
+        expression = unique[0]
+        for module in unique[1:]:
+            expression = expression * module
+        sequence = cms.Sequence(expression)
+        setattr(process, algorithm + 'Sequence', sequence)
+        path = cms.Path(sequence)
+        if sharedTask is not None:
+            path.associate(sharedTask)
+        setattr(process, algorithm + 'Path', path)
+
+    nRemoved = sum([len(users[label]) - 1 for label in shared])
+    print("planAlgorithms: %i algorithms, %i shared producers run once per event, "
+          "%i duplicated module instances removed from the paths" % (len(algorithms), len(shared), nRemoved))
+    for label in shared:
+        print("  %-40s used by %i algorithms" % (label, len(users[label])))
+    return shared
+
+
+################################################################################
+## addAlgorithms
+################################################################################
+jraAlgorithmParameters = ['srcRef', 'srcRefToJetMap', 'srcJetToUncorJetMap', 'srcRefToPartonMap',
+                          'srcRho', 'srcRhos', 'srcRhoHLT', 'srcPFCandidates', 'jecLabel']
+
+def addAlgorithms(process, algorithms, Defaults, reco, doProducer):
+    """
+    addAlgorithms takes the same parameters as planAlgorithms.
+    It configures all algorithms with planAlgorithms and then replaces the
+    per algorithm JetResponseAnalyzers by a single one, labelled jra, which
+    holds one entry per algorithm in its 'algorithms' VPSet. That module reads
+    the event level products (vertices, PU info, genParticles, generator
+    info) once per event and writes every algorithm into its own <alg>/t
+    tree, so the output file looks the same as with one module per
+    algorithm. jra runs in jraEndPath, after all the per algorithm paths.
+    JetResponseAnalyzerProducer handles one algorithm per module, hence with
+    doProducer this is the same as planAlgorithms.
+    """
+    if doProducer:
+        print("addAlgorithms: no multi-algorithm JetResponseAnalyzerProducer, using planAlgorithms")
+        return planAlgorithms(process, algorithms, Defaults, reco, doProducer)
+
+    planAlgorithms(process, algorithms, Defaults, reco, doProducer)
+
+    entries = []
+    for algorithm in algorithms:
+        jraAlg = getattr(process, algorithm)
+        entry = cms.PSet(label = cms.string(algorithm))
+        for name in jraAlgorithmParameters:
+            if hasattr(jraAlg, name):
+                setattr(entry, name, getattr(jraAlg, name))
+        entries.append(entry)
+        getattr(process, algorithm + 'Sequence').remove(jraAlg)
+        delattr(process, algorithm)
+
+    jra = cms.EDAnalyzer('JetResponseAnalyzer',
+                         Defaults.JetResponseParameters,
+                         srcVtx          = cms.InputTag('offlinePrimaryVertices'),
+                         srcGenParticles = cms.InputTag('genParticles'),
+                         algorithms      = cms.VPSet(*entries)
+                        )
+    process.jra = jra
+    process.jraEndPath = cms.EndPath(jra)
+    print("addAlgorithms: %i algorithms filled by a single JetResponseAnalyzer" % len(entries))
+
+
+################################################################################
+## mergeDuplicateModules
+################################################################################
+class _ScheduledModules(object):
+    """ visitor collecting the labels of all modules of the paths and their tasks """
+    def __init__(self):
+        self.labels = set()
+    def enter(self, visitee):
+        if isinstance(visitee, (cms.EDProducer, cms.EDFilter, cms.EDAnalyzer)) and visitee.hasLabel_():
+            self.labels.add(visitee.label())
+    def leave(self, visitee):
+        pass
+
+
+def _inputTagReferences(module, pset, references):
+    """ collect (module, pset, name, index, label) for every InputTag in pset, recursively """
+    for name in pset.parameterNames_():
+        value = getattr(pset, name)
+        if isinstance(value, cms.InputTag):
+            references.append((module, pset, name, None, value.getModuleLabel()))
+        elif isinstance(value, cms.VInputTag):
+            for index, tag in enumerate(value):
+                if isinstance(tag, cms.InputTag):
+                    references.append((module, pset, name, index, tag.getModuleLabel()))
+                else:
+                    references.append((module, pset, name, index, str(tag).split(':')[0]))
+        elif isinstance(value, cms.PSet):
+            _inputTagReferences(module, value, references)
+        elif isinstance(value, cms.VPSet):
+            for entry in value:
+                _inputTagReferences(module, entry, references)
+    return references
+
+
+def _rewire(reference, label):
+    """ point the InputTag of a reference (see _inputTagReferences) to another module label """
+    (module, pset, name, index, oldLabel) = reference
+    value = getattr(pset, name)
+    if index is None:
+        value.setModuleLabel(label)
+    elif isinstance(value[index], cms.InputTag):
+        value[index].setModuleLabel(label)
+    else:
+        value[index] = label + str(value[index])[len(oldLabel):]
+
+
+def _removeFromSchedule(process, module, replacement = None):
+    """
+    take module out of all paths, sequences and tasks. Where replacement is
+    given, module is replaced by it, unless replacement is already there.
+    Paths come first so that nested sequences are not left with duplicates.
+    """
+    containers = list(process.paths_().values()) + list(process.endpaths_().values()) + \
+                 list(process.sequences_().values()) + list(process.tasks_().values())
+    for container in containers:
+        names = container.moduleNames()
+        if module.label() not in names:
+            continue
+        if replacement is None or replacement.label() in names:
+            container.remove(module)
+        else:
+            container.replace(module, replacement)
+
+
+def mergeDuplicateModules(process, keep = [], verbose = True):
+    """
+    mergeDuplicateModules takes the following parameters:
+    =====================================================
+      process:            the CMSSW process object, after addAlgorithm,
+                          planAlgorithms or addAlgorithms
+      keep:               module labels which must not be removed; labels
+                          kept by an output module are added automatically
+      verbose:            print the savings report
+    it looks for scheduled EDProducers and EDFilters with the same type and
+    parameters, including their inputs, e.g. <alg>PtEtaUncor which is a copy
+    of <alg>PtEta for uncorrected algorithms, or the GenPtEta selections and
+    GenToParton matchers of algorithms with the same reference jets. Every
+    group of duplicates is merged into its shortest label, the consumers are
+    rewired and the paths, sequences and tasks updated. This is repeated
+    until nothing changes, since the rewired consumers may become duplicates
+    themselves. Afterwards, MatchRecToGen modules matching a collection to
+    itself which only feed srcJetToUncorJetMap of uncorrected (empty
+    jecLabel) JetResponseAnalyzers are dropped, that map is only read to
+    correct jets. Returns a dict mapping every removed label to the label
+    which replaces it ('' for dropped matchers).
+    """
+    protected = set(keep)
+    for output in process.outputModules_().values():
+        if hasattr(output, 'outputCommands'):
+            for command in output.outputCommands:
+                fields = command.split()[-1].split('_')
+                if len(fields) == 4 and '*' not in fields[1] and '?' not in fields[1]:
+                    protected.add(fields[1])
+
+    removed = {}
+    while True:
+        scheduled = _ScheduledModules()
+        for path in list(process.paths_().values()) + list(process.endpaths_().values()):
+            path.visit(scheduled)
+
+        ## group the candidates by kind, type and parameters
+        groups = {}
+        for kind in (process.producers_(), process.filters_()):
+            for label in sorted(kind):
+                module = kind[label]
+                if label not in scheduled.labels or module.label() != label:
+                    continue
+                key = (module.__class__.__name__, module.type_(), module.dumpPython())
+                groups.setdefault(key, []).append(label)
+
+        merges = {}
+        for labels in groups.values():
+            if len(labels) < 2:
+                continue
+            labels.sort(key = lambda label: (label not in protected, len(label), label))
+            for label in labels[1:]:
+                if label not in protected:
+                    merges[label] = labels[0]
+        if len(merges) == 0:
+            break
+
+        references = []
+        for kind in (process.producers_(), process.filters_(), process.analyzers_(), process.outputModules_()):
+            for label in kind:
+                _inputTagReferences(kind[label], kind[label], references)
+        for reference in references:
+            if reference[4] in merges:
+                _rewire(reference, merges[reference[4]])
+        for label in sorted(merges):
+            _removeFromSchedule(process, getattr(process, label), getattr(process, merges[label]))
+            delattr(process, label)
+            for (old, new) in removed.items():
+                if new == label:
+                    removed[old] = merges[label]
+            removed[label] = merges[label]
+
+    ## drop the jet to uncorrected jet matchers which match a collection to itself
+    jraTypes = ('JetResponseAnalyzer', 'JetResponseAnalyzerProducer')
+    references = []
+    for kind in (process.producers_(), process.filters_(), process.analyzers_(), process.outputModules_()):
+        for label in kind:
+            _inputTagReferences(kind[label], kind[label], references)
+    for label in sorted(process.producers_()):
+        module = getattr(process, label)
+        if module.type_() != 'MatchRecToGen' or label in protected or \
+           module.srcGen.value() != module.srcRec.value():
+            continue
+        consumers = [reference for reference in references if reference[4] == label]
+        if len(consumers) == 0 or \
+           not all([reference[0].type_() in jraTypes and reference[2] == 'srcJetToUncorJetMap' and
+                    hasattr(reference[1], 'jecLabel') and reference[1].jecLabel.value() == ''
+                    for reference in consumers]):
+            continue
+        for reference in consumers:
+            setattr(reference[1], 'srcJetToUncorJetMap', cms.InputTag(''))
+        _removeFromSchedule(process, module)
+        delattr(process, label)
+        removed[label] = ''
+
+    if verbose:
+        merged  = sorted([label for label in removed if removed[label] != ''])
+        dropped = sorted([label for label in removed if removed[label] == ''])
+        print("mergeDuplicateModules: %i duplicated modules merged, %i identity matchers dropped, "
+              "%i fewer modules per event" % (len(merged), len(dropped), len(removed)))
+        survivors = {}
+        for label in merged:
+            survivors.setdefault(removed[label], []).append(label)
+        for survivor in sorted(survivors):
+            print("  %-40s replaces %s" % (survivor, ", ".join(survivors[survivor])))
+        if len(dropped) > 0:
+            print("  dropped: " + ", ".join(dropped))
+    return removed
+
+
+################################################################################
+## import time budget
+################################################################################
+## the jet configurations are imported lazily (see jetObject), importing this
+## file is expected to take well below importTimeBudget seconds
+importTimeBudget = 0.1
+importTime = time.time() - _importStart
+if importTime > importTimeBudget:
+    print("addAlgorithm: import took %.3f s, more than the budget of %.3f s" % (importTime, importTimeBudget))
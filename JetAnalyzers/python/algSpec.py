@@ -0,0 +1,151 @@
+import re
+
+################################################################################
+## algorithm specification parser
+################################################################################
+## the algorithm strings used throughout JetMETAnalysis follow the grammar
+##
+##   algorithm := alg size type [tau] [l1 | l1off] [l2l3]
+##   alg       := ak | kt | ic | sc | ca
+##   size      := 1..10 (cone size x10)
+##   type      := calo | caloHLT | pf | pfHLT | pfchs | pfchsHLT | puppi
+##              | jpt | trk | tau
+##   tau       := (HPSall | TaNCall | <tauDiscriminator> [<tauDecayMode>])
+##
+## e.g. ak4pfchsl1l2l3 or ak5tauHPSmediumCombDBcorrOneProng1Pi0
+
+stdAlgorithms = ['ak','kt','ic','sc','ca']
+
+## jet type in the algorithm string -> (type used by addAlgorithm, payload suffix)
+stdJetTypes = {
+    'calo'     : ('Calo',     'Calo'),
+    'caloHLT'  : ('CaloHLT',  'CaloHLT'),
+    'pf'       : ('PF',       'PF'),
+    'pfHLT'    : ('PFHLT',    'PFHLT'),
+    'pfchs'    : ('PFchs',    'PFchs'),
+    'pfchsHLT' : ('PFchsHLT', 'PFchsHLT'),
+    'puppi'    : ('PUPPI',    'PFPuppi'),
+    'jpt'      : ('JPT',      'JPT'),
+    'trk'      : ('Track',    'TRK'),
+    'tau'      : ('TAU',      None),
+}
+
+tauAllNames          = ['HPSall','TaNCall']
+tauDiscriminatorNames = ['HPSlooseCombDBcorr','HPSmediumCombDBcorr','HPStightCombDBcorr']
+tauDecayModeNames    = ['All','OneProng0Pi0','OneProng1Pi0','OneProng2Pi0','ThreeProng0Pi0']
+
+def _alternatives(names):
+    ## longest first, so that e.g. pfchs is tried before pf
+    return '|'.join(sorted(names, key = len, reverse = True))
+
+_grammar = re.compile(
+    r'^(?P<alg>'   + _alternatives(stdAlgorithms)   + r')'
+    r'(?P<size>10|[1-9])'
+    r'(?P<type>'   + _alternatives(stdJetTypes)     + r')'
+    r'(?:(?<=tau)(?:(?P<tauAll>' + _alternatives(tauAllNames) + r')'
+    r'|(?P<tauDisc>' + _alternatives(tauDiscriminatorNames) + r')'
+    r'(?P<tauMode>'  + _alternatives(tauDecayModeNames)     + r')?))?'
+    r'(?P<l1>l1off|l1)?'
+    r'(?P<l2l3>l2l3)?$'
+)
+
+
+class AlgSpec(object):
+    """
+    immutable description of an algorithm string, see parseAlgorithm.
+    name, alg, size, jetType, type, corrections, tauDiscriminator and
+    tauDecayMode are what the string says, the properties below derive the
+    labels used by addAlgorithm, the workflow scripts and the DB tools.
+    """
+    __slots__ = ('name','alg','size','jetType','type','corrections','tauDiscriminator','tauDecayMode')
+
+    def __init__(self, name, alg, size, jetType, type, corrections, tauDiscriminator, tauDecayMode):
+        for slot, value in zip(AlgSpec.__slots__,
+                               (name, alg, size, jetType, type, corrections, tauDiscriminator, tauDecayMode)):
+            object.__setattr__(self, slot, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("AlgSpec is immutable")
+    def __delattr__(self, name):
+        raise AttributeError("AlgSpec is immutable")
+
+    def __eq__(self, other):
+        return isinstance(other, AlgSpec) and self.name == other.name
+    def __ne__(self, other):
+        return not self == other
+    def __hash__(self):
+        return hash(self.name)
+    def __repr__(self):
+        return "AlgSpec('%s')" % self.name
+
+    @property
+    def alg_size(self):
+        """ e.g. ak4 """
+        return self.alg + str(self.size)
+    @property
+    def alg_size_type(self):
+        """ the name without the correction levels, e.g. ak4pfchs """
+        return self.alg_size + self.jetType + (self.tauDiscriminator or '') + (self.tauDecayMode or '')
+    @property
+    def correction(self):
+        """ the correction suffix, e.g. l1l2l3 """
+        return ''.join(self.corrections)
+    @property
+    def correctl1(self):
+        return len(self.corrections) > 0 and self.corrections[0].startswith('l1')
+    @property
+    def correctl1off(self):
+        return 'l1off' in self.corrections
+    @property
+    def correctl2l3(self):
+        return 'l2l3' in self.corrections
+    @property
+    def isHLT(self):
+        return self.jetType.endswith('HLT')
+    @property
+    def payloadName(self):
+        """ the JetCorrectorParametersCollection label, e.g. AK4PFchs """
+        suffix = stdJetTypes[self.jetType][1]
+        if suffix is None:
+            raise ValueError("No JEC payload for " + self.name)
+        return self.alg.upper() + str(self.size) + suffix
+
+    def payloadTag(self, era):
+        """ the DB tag of the payload for the given era """
+        return 'JetCorrectorParametersCollection_' + era + '_' + self.payloadName
+
+    def withCorrection(self, correction):
+        """ the same algorithm with the given correction levels, e.g. l2l3 """
+        return parseAlgorithm(self.alg_size_type + correction)
+
+
+_cache = {}
+
+def parseAlgorithm(name):
+    """
+    parse an algorithm string like ak4pfchsl1l2l3 into an AlgSpec, raising
+    ValueError for anything which does not follow the grammar. Results are
+    cached, parsing the same string twice returns the same object.
+    """
+    spec = _cache.get(name)
+    if spec is not None:
+        return spec
+    match = _grammar.match(name)
+    if match is None:
+        raise ValueError("Can't parse algorithm '" + name + "': expected <alg><size><type>[<tau>][l1|l1off][l2l3] "
+                         "with type calo|caloHLT|pf|pfchs|pfHLT|pfchsHLT|jpt|trk|tau|puppi")
+    jetType = match.group('type')
+    tauDiscriminator = match.group('tauAll') or match.group('tauDisc')
+    if jetType == 'tau' and tauDiscriminator is None:
+        raise ValueError("Can't parse algorithm '" + name + "': tau needs one of " +
+                         ", ".join(tauAllNames + tauDiscriminatorNames))
+    corrections = tuple([level for level in (match.group('l1'), match.group('l2l3')) if level])
+    spec = AlgSpec(name, match.group('alg'), int(match.group('size')), jetType, stdJetTypes[jetType][0],
+                   corrections, tauDiscriminator, match.group('tauMode'))
+    _cache[name] = spec
+    return spec
+
+
+def algorithmName(alg, size, jetType, correction = ''):
+    """ build and validate an algorithm string from its parts """
+    return parseAlgorithm(str(alg) + str(size) + str(jetType) + str(correction)).name
@@ -0,0 +1,136 @@
+import sys
+import types
+
+################################################################################
+## lazily generated clone families
+################################################################################
+## the _cff files define long ladders of clones, e.g. ak1PFJets ... ak10PFJets
+## or ak1PUPPIL2Relative ... ak10PUPPIL2Relative. CloneFamilies holds the
+## recipe of every member and builds it the first time its name is looked up,
+## so importing the _cff only costs the recipes. dir() lists all members, hence
+## process.load, 'from X import *' and jetObject see the same names as before.
+##
+## in the _cff:
+##
+##   _families = CloneFamilies(__name__)
+##   _families.clones('ak%iPFJets', 'ak4PFJets', [1,2,3], rParam = lambda size: size/10.)
+##   __getattr__, __dir__ = _families.getattr, _families.dir
+##   _families.install()
+
+class CloneFamilies(object):
+    """
+    the recipes of the lazily built objects of the module moduleName. The
+    objects are built from snapshots of their bases taken when the recipes
+    are registered, so later changes to a base (e.g. by addAlgorithm) don't
+    leak into its clones, just like with clones made at import.
+    """
+    def __init__(self, moduleName):
+        self.moduleName = moduleName
+        self.recipes    = {}
+        self.order      = []
+        self.snapshots  = {}  # bases as defined, never handed out
+
+    def namespace(self):
+        return vars(sys.modules[self.moduleName])
+
+    def add(self, name, build):
+        """ register build(), which returns a new object called name """
+        if name not in self.recipes:
+            self.order.append(name)
+        self.recipes[name] = build
+
+    def clones(self, pattern, base, sizes, **parameters):
+        """
+        register pattern % size = (base % size).clone(**parameters) for all
+        sizes. A parameter value is a string or a list of strings, formatted
+        with the size if they contain %i, or a function of the size, e.g.
+          clones('ak%iPUPPIL2L3', 'ak1PUPPIL2L3', range(2,11),
+                 correctors = ['ak%iPUPPIL2Relative','ak%iPUPPIL3Absolute'])
+        """
+        for size in sizes:
+            baseName = base
+            if '%' in base:
+                baseName = base % size
+            if baseName not in self.recipes and baseName not in self.snapshots:
+                self.snapshots[baseName] = self.namespace()[baseName].clone()
+            self.add(pattern % size, self._cloner(baseName, size, parameters))
+
+    def sequences(self, pattern, members, sizes):
+        """ register pattern % size = cms.Sequence(member1 * member2 ...) for all sizes """
+        import FWCore.ParameterSet.Config as cms
+        def sequencer(size):
+            def build():
+                expression = self.get(members[0] % size)
+                for member in members[1:]:
+                    expression = expression * self.get(member % size)
+                return cms.Sequence(expression)
+            return build
+        for size in sizes:
+            self.add(pattern % size, sequencer(size))
+
+    def _cloner(self, baseName, size, parameters):
+        def build():
+            values = {}
+            for (name, value) in parameters.items():
+                if callable(value):
+                    value = value(size)
+                elif isinstance(value, list):
+                    value = [_format(item, size) for item in value]
+                else:
+                    value = _format(value, size)
+                values[name] = value
+            return self.fresh(baseName).clone(**values)
+        return build
+
+    def fresh(self, name):
+        """ name as it was defined, to be cloned only """
+        if name not in self.snapshots:
+            self.snapshots[name] = self.recipes[name]()
+        return self.snapshots[name]
+
+    def get(self, name):
+        """ the object called name, built and cached on first use """
+        namespace = self.namespace()
+        if name not in namespace:
+            namespace[name] = self.recipes[name]()
+        return namespace[name]
+
+    def getattr(self, name):
+        """ module level __getattr__ (PEP 562) """
+        if name in self.recipes:
+            return self.get(name)
+        raise AttributeError("module '%s' has no attribute '%s'" % (self.moduleName, name))
+
+    def dir(self):
+        """ module level __dir__ (PEP 562) """
+        return sorted(set(self.namespace()) | set(self.order))
+
+    def install(self):
+        """
+        make the module look up its members lazily. Python >= 3.7 uses the
+        module level __getattr__ & __dir__, older versions get the module
+        replaced in sys.modules by a _LazyModule with the same content.
+        """
+        module = sys.modules[self.moduleName]
+        module.__all__ = [name for name in self.dir() if not name.startswith('_')]
+        if sys.version_info < (3, 7):
+            lazy = _LazyModule(self.moduleName, self)
+            lazy.__dict__.update(module.__dict__)
+            sys.modules[self.moduleName] = lazy
+
+
+def _format(value, size):
+    if isinstance(value, str) and '%' in value:
+        return value % size
+    return value
+
+
+class _LazyModule(types.ModuleType):
+    """ module type forwarding unknown attributes to its CloneFamilies """
+    def __init__(self, name, families):
+        types.ModuleType.__init__(self, name)
+        self.__dict__['_LazyModule__families'] = families
+    def __getattr__(self, name):
+        return self.__families.getattr(name)
+    def __dir__(self):
+        return self.__families.dir()
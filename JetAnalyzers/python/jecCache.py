@@ -0,0 +1,232 @@
+import os
+import time
+import hashlib
+import sqlite3
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+from JetMETAnalysis.JetAnalyzers.jecPayloads import PayloadDB, dbPath, decodePayload, readTxt, runTasks
+
+################################################################################
+## cache of decoded JEC payloads
+################################################################################
+## every closure or comparison run reads the <era>.db files or the text files
+## of the eras again and decodes or parses the same payloads. PayloadCache
+## keeps the decoded payloads (the JetCorrectorParameters, not the text) in a
+## directory, every one in a file named after the sha1 of its key: the era,
+## the tag, the payload name and the sha1 of the DB or text file it was
+## decoded from. The checksum of a file is kept with its size and
+## modification time, so an unchanged file is only read once, and a payload
+## found in the cache is taken from it without opening the DB. The entries are
+## listed in index.db, the least recently used ones are removed when the
+## cache grows beyond maxSize:
+##
+##   cache = PayloadCache()                    # $JEC_PAYLOAD_CACHE or ~/.cache/jecPayloads
+##   cache.collections('Winter14_V4_MC.db', 'Winter14_V4_MC')   # {payloadName : [(key, JetCorrectorParameters)]}
+##   cache.readTxt('Winter14_V4_MC_L2Relative_AK5PF.txt')        # JetCorrectorParameters
+##   writeTxts('Winter14_V4_MC.db', 'Winter14_V4_MC', cache = cache)
+##   FactorizedEvaluator.fromDB('Winter14_V4_MC.db', 'Winter14_V4_MC', 'AK5PF', levels, cache = cache)
+
+defaultDirectory = os.environ.get('JEC_PAYLOAD_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'jecPayloads'))
+defaultMaxSize   = 1 << 30
+
+schema = """
+create table if not exists sources (
+  path     text primary key,
+  size     integer,
+  mtime    real,
+  sha1     text
+);
+create table if not exists entries (
+  key      text primary key,
+  kind     text,
+  era      text,
+  tag      text,
+  name     text,
+  source   text,
+  sha1     text,
+  size     integer,
+  used     real
+);
+create index if not exists entriesByUse on entries (used);
+"""
+
+class PayloadCache(object):
+    """ the decoded JEC payloads, in directory, at most maxSize bytes """
+    def __init__(self, directory = None, maxSize = defaultMaxSize):
+        self.directory = directory or defaultDirectory
+        self.maxSize   = maxSize
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        self.db = sqlite3.connect(os.path.join(self.directory, 'index.db'))
+        self.db.text_factory = str
+        self.db.executescript(schema)
+        self.hits   = 0
+        self.misses = 0
+
+    def close(self):
+        self.db.close()
+
+    ## keys
+    def sourceHash(self, fileName):
+        """
+        sha1 of the content of fileName, cached by size and modification
+        time. The entries of an older content of the file are removed.
+        """
+        path = os.path.abspath(fileName)
+        info = os.stat(path)
+        row = self.db.execute("select size, mtime, sha1 from sources where path = ?", (path,)).fetchone()
+        if row is not None and row[0] == info.st_size and row[1] == info.st_mtime:
+            return row[2]
+        sha1 = hashlib.sha1()
+        content = open(path, 'rb')
+        block = content.read(1 << 20)
+        while block:
+            sha1.update(block)
+            block = content.read(1 << 20)
+        content.close()
+        if row is not None and row[2] != sha1.hexdigest():
+            for (key,) in self.db.execute("select key from entries where source = ? and sha1 != ?",
+                                          (path, sha1.hexdigest())).fetchall():
+                self.remove(key)
+        self.db.execute("insert or replace into sources (path, size, mtime, sha1) values (?, ?, ?, ?)",
+                        (path, info.st_size, info.st_mtime, sha1.hexdigest()))
+        self.db.commit()
+        return sha1.hexdigest()
+
+    def key(self, *fields):
+        """ the sha1 of the fields, which names the entry """
+        return hashlib.sha1("\n".join([str(field) for field in fields]).encode()).hexdigest()
+
+    def fileName(self, key):
+        return os.path.join(self.directory, key[:2], key + '.pkl')
+
+    ## entries
+    def get(self, key):
+        """ the object of the entry key, None if it isn't cached """
+        row = self.db.execute("select key from entries where key = ?", (key,)).fetchone()
+        if row is None or not os.path.isfile(self.fileName(key)):
+            self.misses += 1
+            return None
+        entryFile = open(self.fileName(key), 'rb')
+        try:
+            value = pickle.load(entryFile)
+        except Exception:
+            ## written by another pickle protocol or truncated
+            entryFile.close()
+            self.remove(key)
+            self.misses += 1
+            return None
+        entryFile.close()
+        self.db.execute("update entries set used = ? where key = ?", (time.time(), key))
+        self.db.commit()
+        self.hits += 1
+        return value
+
+    def put(self, key, value, kind, era, tag, name, source, sha1):
+        """ cache value as the entry key, then evict the least recently used entries beyond maxSize """
+        fileName = self.fileName(key)
+        if not os.path.isdir(os.path.dirname(fileName)):
+            os.makedirs(os.path.dirname(fileName))
+        ## written under another name and renamed, so that a concurrent
+        ## reader never sees a partial entry
+        temporary = "%s.%i" % (fileName, os.getpid())
+        entryFile = open(temporary, 'wb')
+        pickle.dump(value, entryFile, 2)
+        entryFile.close()
+        os.rename(temporary, fileName)
+        self.db.execute("insert or replace into entries (key, kind, era, tag, name, source, sha1, size, used) "
+                        "values (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (key, kind, era, tag, name, source, sha1, os.path.getsize(fileName), time.time()))
+        self.db.commit()
+        self.evict()
+
+    def remove(self, key):
+        if os.path.isfile(self.fileName(key)):
+            os.remove(self.fileName(key))
+        self.db.execute("delete from entries where key = ?", (key,))
+        self.db.commit()
+
+    def size(self):
+        """ the bytes of all entries """
+        return self.db.execute("select coalesce(sum(size), 0) from entries").fetchone()[0]
+
+    def evict(self, maxSize = None):
+        """ remove the least recently used entries until the cache has at most maxSize bytes """
+        if maxSize is None:
+            maxSize = self.maxSize
+        size = self.size()
+        if size <= maxSize:
+            return
+        for (key, entrySize) in self.db.execute("select key, size from entries order by used").fetchall():
+            if size <= maxSize:
+                break
+            self.remove(key)
+            size -= entrySize
+
+    def clear(self):
+        self.evict(0)
+
+    ## payloads
+    def collections(self, dbFileName, era, payloadNames = None, run = 1, jobs = None):
+        """
+        {payloadName : [(key, JetCorrectorParameters)]} of the payloads of era
+        (only payloadNames, if given) in the SQLite DB dbFileName valid for
+        run. The DB is only read for the payloads which aren't cached, and
+        those are decoded in jobs processes.
+        """
+        path = os.path.abspath(dbPath(dbFileName))
+        if not os.path.isfile(path):
+            raise IOError("no conditions DB " + path)
+        sha1 = self.sourceHash(path)
+        tagsKey = self.key('tags', era, sha1)
+        tags = self.get(tagsKey)
+        db = None
+        if tags is None:
+            db = PayloadDB(path)
+            tags = db.tags(era)
+            self.put(tagsKey, tags, 'tags', era, '', '', path, sha1)
+        if payloadNames is not None:
+            missing = [payloadName for payloadName in payloadNames if payloadName not in tags]
+            if len(missing) > 0:
+                raise ValueError("%s has no payloads %s of era %s" % (path, ", ".join(missing), era))
+            tags = dict([(payloadName, tags[payloadName]) for payloadName in payloadNames])
+        collections = {}
+        keys = {}
+        for (payloadName, tag) in tags.items():
+            keys[payloadName] = self.key('collection', era, tag, payloadName, run, sha1)
+            collection = self.get(keys[payloadName])
+            if collection is not None:
+                collections[payloadName] = collection
+        missing = sorted([payloadName for payloadName in tags if payloadName not in collections])
+        if len(missing) > 0:
+            if db is None:
+                db = PayloadDB(path)
+            payloads = db.payloads([tags[payloadName] for payloadName in missing], run)
+            tasks = [(payloadName, payloads[tags[payloadName]]) for payloadName in missing if tags[payloadName] in payloads]
+            for ((payloadName, data), collection) in zip(tasks, runTasks(decodePayload, tasks, jobs)):
+                collections[payloadName] = collection
+                self.put(keys[payloadName], collection, 'collection', era, tags[payloadName], payloadName, path, sha1)
+        if db is not None:
+            db.close()
+        return collections
+
+    def collection(self, dbFileName, era, payloadName, run = 1):
+        """ the [(key, JetCorrectorParameters)] of payloadName of era in dbFileName valid for run """
+        collections = self.collections(dbFileName, era, [payloadName], run, 1)
+        if payloadName not in collections:
+            raise ValueError("%s has no payload of %s of era %s for run %i" % (dbFileName, payloadName, era, run))
+        return collections[payloadName]
+
+    def readTxt(self, fileName, section = ''):
+        """ the JetCorrectorParameters of section of the text file fileName, see jecPayloads.readTxt """
+        path = os.path.abspath(fileName)
+        sha1 = self.sourceHash(path)
+        key = self.key('txt', section, sha1)
+        parameters = self.get(key)
+        if parameters is None:
+            parameters = readTxt(path, section)
+            self.put(key, parameters, 'txt', '', section, os.path.basename(path), path, sha1)
+        return parameters
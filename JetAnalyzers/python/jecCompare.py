@@ -0,0 +1,232 @@
+import re
+import glob
+import numpy
+
+from JetMETAnalysis.JetAnalyzers.jecPayloads import readCollections, readTxt, runTasks
+from JetMETAnalysis.JetAnalyzers.jecEvaluator import FactorizedEvaluator
+
+################################################################################
+## JEC eras compared bin by bin
+################################################################################
+## compareJEC.C and the jet_draw_*_x programs evaluate the corrections point
+## by point through FactorizedJetCorrector. compareEras() evaluates the
+## payloads of two or more eras on a dense (pT, eta, rho) grid with
+## jecEvaluator, every payload of the eras in one call, the payloads in
+## parallel, and compares every era to the first one:
+##
+##   comparisons = compareEras([('Summer12_V7_MC', 'Summer12_V7_MC.db'),
+##                              ('Winter14_V4_MC', 'Winter14_V4_MC_txts_fromDB/Winter14_V4_MC')],
+##                             tolerance = 0.01, jobs = 8, cache = PayloadCache())
+##   comparison = comparisons['AK5PF']
+##   comparison.ratio['Winter14_V4_MC']        # [pt, eta, rho] Winter14 / Summer12
+##   comparison.difference['Winter14_V4_MC']   # [pt, eta, rho] Winter14 - Summer12
+##   comparison.flagged['Winter14_V4_MC']      # [pt, eta, rho] |ratio - 1| > tolerance
+##   writeSummary(comparisons, 'Winter14_vs_Summer12.txt')
+##
+## The source of an era is a SQLite DB (*.db, sqlite:<file>) or the prefix
+## of its text files, <prefix>_<level>_<payloadName>.txt. pT is the raw jet
+## pT, the jet area that of the cone of the payload (pi R^2) and the jet
+## energy pT cosh(eta), as in compareJEC.C.
+
+standardLevels = ['L1FastJet', 'L2Relative', 'L3Absolute', 'L2L3Residual']
+
+defaultPt  = numpy.logspace(1., numpy.log10(5000.), 100)
+defaultEta = numpy.linspace(-5.15, 5.15, 104)
+defaultRho = numpy.array([0., 10., 20., 30., 40.])
+
+def isDB(source):
+    return source.startswith('sqlite') or source.endswith('.db')
+
+def jetArea(payloadName):
+    """ the area of the cone of payloadName (AK5PF: pi 0.5^2), of R = 0.5 if it has no cone size """
+    match = re.match(r'[A-Za-z]+?(\d+)', payloadName)
+    radius = int(match.group(1))/10. if match is not None else 0.5
+    return numpy.pi*radius*radius
+
+def loadPayloads(era, source, payloadNames = None, run = 1, jobs = None, cache = None, levels = None):
+    """
+    {payloadName : [JetCorrectorParameters]} of era in source, a SQLite DB
+    or a text file prefix, through cache (jecCache.PayloadCache) if given.
+    Of a text file prefix only the files of the levels (default
+    standardLevels) are read, not e.g. the UncertaintySources.
+    """
+    if isDB(source):
+        if cache is not None:
+            collections = cache.collections(source, era, payloadNames, run, jobs)
+        else:
+            collections = readCollections(source, era, payloadNames, run, jobs)
+        return dict([(payloadName, [parameters for (key, parameters) in collection])
+                     for (payloadName, collection) in collections.items()])
+    read = cache.readTxt if cache is not None else readTxt
+    payloads = {}
+    for level in levels or standardLevels:
+        prefix = "%s_%s_" % (source, level)
+        for fileName in sorted(glob.glob(prefix + '*.txt')):
+            payloadName = fileName[len(prefix):-len('.txt')]
+            if '_' in payloadName:
+                continue
+            if payloadNames is None or payloadName in payloadNames:
+                payloads.setdefault(payloadName, []).append(read(fileName))
+    if len(payloads) == 0:
+        raise ValueError("no JEC text files %s_<level>_<payloadName>.txt of era %s" % (source, era))
+    return payloads
+
+def selectLevels(payload, levels = None):
+    """
+    the JetCorrectorParameters of the levels (default: those of
+    standardLevels in the payload) out of payload, in the order of levels
+    """
+    parameters = {}
+    for level in payload:
+        parameters.setdefault(level.level, level)
+    if levels is None:
+        levels = [level for level in standardLevels if level in parameters]
+        if len(levels) == 0:
+            raise ValueError("none of the levels " + ", ".join(standardLevels))
+    missing = [level for level in levels if level not in parameters]
+    if len(missing) > 0:
+        raise ValueError("no levels " + ", ".join(missing))
+    return [parameters[level] for level in levels]
+
+
+class Comparison(object):
+    """
+    the corrections of the eras for payloadName on the grid pt x eta x rho,
+    and the ratio and difference of every era to the reference (the first
+    era), flagged where the ratio differs from 1 by more than tolerance
+    """
+    def __init__(self, payloadName, eras, pt, eta, rho, corrections, tolerance):
+        self.payloadName = payloadName
+        self.eras        = eras
+        self.reference   = eras[0]
+        self.pt          = pt
+        self.eta         = eta
+        self.rho         = rho
+        self.tolerance   = tolerance
+        self.corrections = corrections
+        self.ratio       = {}
+        self.difference  = {}
+        self.flagged     = {}
+        reference = corrections[self.reference]
+        for era in eras[1:]:
+            with numpy.errstate(all = 'ignore'):
+                self.ratio[era] = corrections[era]/reference
+            self.difference[era] = corrections[era] - reference
+            ## bins which can't be compared are flagged as well
+            self.flagged[era] = ~(numpy.abs(self.ratio[era] - 1.) <= tolerance)
+
+    def summary(self):
+        """
+        [{era, maxDeviation, pt, eta, rho, meanDeviation, flagged, bins}] of
+        every era against the reference: the largest |ratio - 1|, the grid
+        point it is at, the mean |ratio - 1| and the number of flagged bins
+        """
+        rows = []
+        for era in self.eras[1:]:
+            deviation = numpy.abs(self.ratio[era] - 1.)
+            deviation = numpy.where(numpy.isfinite(deviation), deviation, numpy.inf)
+            (iPt, iEta, iRho) = numpy.unravel_index(numpy.argmax(deviation), deviation.shape)
+            finite = deviation[numpy.isfinite(deviation)]
+            rows.append({'era'           : era,
+                         'maxDeviation'  : float(deviation[iPt, iEta, iRho]),
+                         'pt'            : float(self.pt[iPt]),
+                         'eta'           : float(self.eta[iEta]),
+                         'rho'           : float(self.rho[iRho]),
+                         'meanDeviation' : float(finite.mean()) if len(finite) > 0 else float('nan'),
+                         'flagged'       : int(numpy.count_nonzero(self.flagged[era])),
+                         'bins'          : int(deviation.size)})
+        return rows
+
+
+def evaluateGrid(levels, payloadName, pt, eta, rho):
+    """ the corrections of levels ([JetCorrectorParameters]) on the grid pt x eta x rho """
+    (ptGrid, etaGrid, rhoGrid) = numpy.meshgrid(pt, eta, rho, indexing = 'ij')
+    ptGrid = ptGrid.ravel()
+    etaGrid = etaGrid.ravel()
+    evaluator = FactorizedEvaluator(levels)
+    factors = evaluator.correction(pt = ptGrid, eta = etaGrid,
+                                   area = numpy.full(len(ptGrid), jetArea(payloadName)), rho = rhoGrid.ravel(),
+                                   energy = ptGrid*numpy.cosh(etaGrid))
+    return factors.reshape(len(pt), len(eta), len(rho))
+
+def compareTask(task):
+    """ the Comparison of (payloadName, eras, {era : [JetCorrectorParameters]}, pt, eta, rho, tolerance) """
+    (payloadName, eras, levels, pt, eta, rho, tolerance) = task
+    corrections = dict([(era, evaluateGrid(levels[era], payloadName, pt, eta, rho)) for era in eras])
+    return Comparison(payloadName, eras, pt, eta, rho, corrections, tolerance)
+
+def compareEras(sources, payloadNames = None, levels = None, pt = None, eta = None, rho = None,
+                tolerance = 0.01, run = 1, jobs = None, cache = None, verbose = True):
+    """
+    compare the eras of sources [(era, source)], the first being the
+    reference, on the grid pt x eta x rho (default defaultPt, defaultEta and
+    defaultRho). All payloads the eras have in common (only payloadNames, if
+    given) are compared in jobs processes, every one with the levels
+    (default: the standardLevels it has). Returns {payloadName : Comparison}.
+    """
+    if len(sources) < 2:
+        raise ValueError("need at least two eras to compare")
+    eras = [era for (era, source) in sources]
+    if len(set(eras)) != len(eras):
+        raise ValueError("the eras to compare are not distinct: " + ", ".join(eras))
+    pt  = numpy.asarray(defaultPt  if pt  is None else pt,  dtype = numpy.float64)
+    eta = numpy.asarray(defaultEta if eta is None else eta, dtype = numpy.float64)
+    rho = numpy.asarray(defaultRho if rho is None else rho, dtype = numpy.float64)
+    payloads = dict([(era, loadPayloads(era, source, payloadNames, run, jobs, cache, levels)) for (era, source) in sources])
+    common = set(payloads[eras[0]])
+    for era in eras[1:]:
+        common &= set(payloads[era])
+    tasks = []
+    for payloadName in sorted(set().union(*[set(payloads[era]) for era in eras])):
+        if payloadName not in common:
+            if verbose:
+                print("jecCompare: %s is not in all eras, not comparing it" % payloadName)
+            continue
+        selected = {}
+        for era in eras:
+            try:
+                selected[era] = selectLevels(payloads[era][payloadName], levels)
+            except ValueError as error:
+                raise ValueError("payload %s of era %s: %s" % (payloadName, era, error))
+        if verbose and len(set([tuple([level.level for level in selected[era]]) for era in eras])) > 1:
+            print("jecCompare: the eras have different levels of %s: %s" %
+                  (payloadName, "; ".join(["%s %s" % (era, " ".join([level.level for level in selected[era]])) for era in eras])))
+        tasks.append((payloadName, eras, selected, pt, eta, rho, tolerance))
+    if len(tasks) == 0:
+        raise ValueError("the eras %s have no payloads in common" % ", ".join(eras))
+    return dict([(comparison.payloadName, comparison) for comparison in runTasks(compareTask, tasks, jobs)])
+
+def summaryLines(comparisons):
+    """ one line per payload and era of the summaries of comparisons {payloadName : Comparison} """
+    lines = ["%-14s %-24s %-24s %10s %9s %6s %5s %10s %14s" %
+             ('payload', 'era', 'reference', 'max|r-1|', 'pt', 'eta', 'rho', 'mean|r-1|', 'flagged')]
+    for payloadName in sorted(comparisons):
+        comparison = comparisons[payloadName]
+        for row in comparison.summary():
+            lines.append("%-14s %-24s %-24s %10.4g %9.1f %6.2f %5.1f %10.4g %14s" %
+                         (payloadName, row['era'], comparison.reference, row['maxDeviation'], row['pt'], row['eta'],
+                          row['rho'], row['meanDeviation'], "%i/%i" % (row['flagged'], row['bins'])))
+    return lines
+
+def writeSummary(comparisons, fileName):
+    """ write the summaries of comparisons to the text file fileName """
+    summaryFile = open(fileName, 'w')
+    tolerances = sorted(set([comparison.tolerance for comparison in comparisons.values()]))
+    summaryFile.write("# bins flagged where |ratio - 1| > %s\n" % ", ".join(["%g" % tolerance for tolerance in tolerances]))
+    for line in summaryLines(comparisons):
+        summaryFile.write(line + "\n")
+    summaryFile.close()
+
+def saveComparisons(comparisons, fileName):
+    """ save the grid, corrections, ratios and differences of comparisons to the NumPy file fileName (.npz) """
+    arrays = {}
+    for (payloadName, comparison) in comparisons.items():
+        arrays['pt'] = comparison.pt
+        arrays['eta'] = comparison.eta
+        arrays['rho'] = comparison.rho
+        for era in comparison.eras:
+            arrays['%s/%s/correction' % (payloadName, era)] = comparison.corrections[era]
+        for era in comparison.eras[1:]:
+            arrays['%s/%s/ratio' % (payloadName, era)] = comparison.ratio[era]
+            arrays['%s/%s/difference' % (payloadName, era)] = comparison.difference[era]
+    numpy.savez_compressed(fileName, **arrays)
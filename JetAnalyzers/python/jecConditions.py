@@ -0,0 +1,120 @@
+import os
+import re
+import FWCore.ParameterSet.Config as cms
+from JetMETAnalysis.JetAnalyzers.algSpec import parseAlgorithm
+from JetMETAnalysis.JetAnalyzers.jecPayloads import PayloadDB, tagPrefix
+
+################################################################################
+## JEC payloads to load from a DB, found out instead of hard-coded
+################################################################################
+## the DB reader configurations and run_JRA_cfg.py used to list the
+## JetCorrectionsRecord PSets of the ESSource by hand and comment them in and
+## out. findPayloads() looks up which payloads of an era a SQLite file or an
+## offline tag listing (e.g. the output of 'conddb listTags') has, and keeps
+## the requested ones, so that the ESSource only fetches what exists:
+##
+##   payloads = findPayloads(era, 'sqlite:' + era + '.db', requested = ['ak4pfchs', 'AK8PFPuppi'])
+##   process.jec = cms.ESSource('PoolDBESSource', CondDBSetup,
+##                              connect = cms.string('sqlite:' + era + '.db'),
+##                              toGet = jecToGet(era, payloads))
+##   process.p = addJecReaders(process, payloads, outputPrefix)
+
+def payloadName(name):
+    """
+    the payload of an algorithm string (ak4pfchs) or payload name (AK4PFchs),
+    None for algorithms without JEC payload (tau)
+    """
+    try:
+        spec = parseAlgorithm(name)
+    except ValueError:
+        return name
+    if spec.type == 'TAU':
+        return None
+    return spec.payloadName
+
+def listedPayloads(era, listing):
+    """ {payloadName : tag} of the tags of era in the text file listing """
+    pattern = re.compile(re.escape(tagPrefix + era + '_') + r'(\w+)')
+    tags = {}
+    listingFile = open(listing)
+    for line in listingFile:
+        for match in pattern.finditer(line):
+            tags[match.group(1)] = match.group(0)
+    listingFile.close()
+    return tags
+
+def availablePayloads(era, source):
+    """
+    {payloadName : tag} of the JEC tags of era in source, a SQLite file
+    ('sqlite:<file>', 'sqlite_file:<file>' or a *.db path) or a text file
+    listing tags. None if source can't be looked into (e.g. frontier, a
+    SQLite file written before CondDB v2 or one which isn't there).
+    """
+    if source.startswith('sqlite') or source.endswith('.db'):
+        try:
+            db = PayloadDB(source)
+        except (IOError, ValueError) as error:
+            print("jecConditions: %s" % error)
+            return None
+        tags = db.tags(era)
+        db.close()
+        return tags
+    if '://' not in source and os.path.isfile(source):
+        return listedPayloads(era, source)
+    return None
+
+def findPayloads(era, source = None, requested = None, verbose = True):
+    """
+    the sorted payload names of era to load: the requested ones (algorithm
+    strings or payload names, default all) which source has. Requested
+    payloads which source doesn't have are dropped with a warning. Without a
+    source, or one which can't be looked into, the requested ones are trusted.
+    """
+    available = None
+    if source is not None:
+        available = availablePayloads(era, source)
+    if requested is None:
+        if available is None:
+            raise ValueError("can't find out the JEC payloads of %s in %s, request them" % (era, source))
+        return sorted(available)
+    payloads = []
+    for name in requested:
+        payload = payloadName(name)
+        if payload is None or payload in payloads:
+            continue
+        if available is not None and payload not in available:
+            if verbose:
+                print("jecConditions: %s has no payload %s of era %s, not loading it" % (source, payload, era))
+            continue
+        payloads.append(payload)
+    return sorted(payloads)
+
+def jecToGet(era, payloads):
+    """ the toGet VPSet of a PoolDBESSource loading the payloads of era """
+    toGet = cms.VPSet()
+    for payload in payloads:
+        toGet.append(cms.PSet(record = cms.string('JetCorrectionsRecord'),
+                              tag    = cms.string(tagPrefix + era + '_' + payload),
+                              label  = cms.untracked.string(payload)))
+    return toGet
+
+def addJecReaders(process, payloads, outputPrefix, createTextFile = True, printScreen = False):
+    """
+    add a JetCorrectorDBReader demo<payload> writing the text files of every
+    payload to process, returns the path running them
+    """
+    readers = []
+    for payload in payloads:
+        reader = cms.EDAnalyzer('JetCorrectorDBReader',
+                                payloadName    = cms.untracked.string(payload),
+                                printScreen    = cms.untracked.bool(printScreen),
+                                createTextFile = cms.untracked.bool(createTextFile),
+                                globalTag      = cms.untracked.string(outputPrefix))
+        setattr(process, 'demo' + payload, reader)
+        readers.append(reader)
+    if len(readers) == 0:
+        raise ValueError("no JEC payloads to read")
+    sequence = readers[0]
+    for reader in readers[1:]:
+        sequence = sequence * reader
+    return cms.Path(sequence)
@@ -0,0 +1,265 @@
+import re
+import numpy
+
+from JetMETAnalysis.JetAnalyzers.jecPayloads import PayloadDB, readTxt
+
+################################################################################
+## JEC text files evaluated on arrays of jets
+################################################################################
+## jet_apply_jec_x corrects one jet at a time through FactorizedJetCorrector.
+## LevelEvaluator holds the records of one level as NumPy arrays and its
+## formula compiled once into a NumPy expression, and evaluates the level for
+## whole arrays of jets: the bins are looked up with searchsorted, the
+## parameter variables are clamped to the ranges of their bin as
+## SimpleJetCorrector does, Response levels are inverted iteratively.
+## FactorizedEvaluator applies the levels one after the other, every level
+## seeing the jet pT (and energy) corrected by the levels before:
+##
+##   jec = FactorizedEvaluator.fromTxt('Winter14_V4_MC_txts_fromDB/Winter14_V4_MC', 'AK5PF',
+##                                     ['L1FastJet', 'L2Relative', 'L3Absolute'])
+##   factor = jec.correction(pt = pt, eta = eta, area = area, rho = rho)
+##   (factor, levelFactors) = jec.corrections(pt = pt, eta = eta, area = area, rho = rho)
+##
+## fromDB() takes the levels from a SQLite DB instead; with a
+## jecCache.PayloadCache both take the decoded levels from the cache.
+
+## TFormula functions -> NumPy
+functions = {
+    'log'   : numpy.log,     'TMath::Log'   : numpy.log,
+    'log10' : numpy.log10,   'TMath::Log10' : numpy.log10,
+    'exp'   : numpy.exp,     'TMath::Exp'   : numpy.exp,
+    'pow'   : numpy.power,   'TMath::Power' : numpy.power,
+    'sqrt'  : numpy.sqrt,    'TMath::Sqrt'  : numpy.sqrt,
+    'abs'   : numpy.abs,     'fabs'         : numpy.abs,     'TMath::Abs' : numpy.abs,
+    'max'   : numpy.maximum, 'TMath::Max'   : numpy.maximum,
+    'min'   : numpy.minimum, 'TMath::Min'   : numpy.minimum,
+    'sin'   : numpy.sin,     'cos'          : numpy.cos,     'tan'        : numpy.tan,
+    'atan'  : numpy.arctan,  'TMath::ATan'  : numpy.arctan,
+    'cosh'  : numpy.cosh,    'TMath::CosH'  : numpy.cosh,
+    'pi'    : numpy.pi,      'TMath::Pi'    : lambda: numpy.pi,
+}
+variables = ['x', 'y', 'z', 't']
+
+_tokens = re.compile(r'\s*(?:(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)|(?P<parameter>\[(?P<index>\d+)\])'
+                     r'|(?P<name>[A-Za-z_][A-Za-z_0-9]*(?:::[A-Za-z_][A-Za-z_0-9]*)?)|(?P<operator>\*\*|[-+*/^(),]))')
+
+def compileFormula(formula):
+    """
+    the code object of the TFormula formula as a NumPy expression of the
+    variables v[0..3] (x, y, z, t) and the parameters p[i] ([i])
+    """
+    expression = []
+    position = 0
+    formula = formula.strip()
+    while position < len(formula):
+        match = _tokens.match(formula, position)
+        if match is None:
+            raise ValueError("can't evaluate the formula %s: unknown '%s'" % (formula, formula[position:]))
+        position = match.end()
+        if match.group('number') is not None:
+            expression.append(match.group('number'))
+        elif match.group('parameter') is not None:
+            expression.append('p[%s]' % match.group('index'))
+        elif match.group('name') is not None:
+            name = match.group('name')
+            if name in variables:
+                expression.append('v[%i]' % variables.index(name))
+            elif name in functions:
+                expression.append('f[%r]' % name)
+            else:
+                raise ValueError("can't evaluate the formula %s: unknown function %s" % (formula, name))
+        elif match.group('operator') == '^':
+            expression.append('**')
+        else:
+            expression.append(match.group('operator'))
+    if len(expression) == 0:
+        expression = ['1.']
+    return compile(' '.join(expression), formula or '1', 'eval')
+
+
+class LevelEvaluator(object):
+    """
+    the correction level of parameters (jecPayloads.JetCorrectorParameters)
+    evaluated on arrays. The records are kept in float32 as in
+    JetCorrectorParameters, hence the factors are those of the C++ code.
+    """
+    maxIterations = 50
+    precision     = 0.0001
+
+    def __init__(self, parameters):
+        self.level      = parameters.level
+        self.binVar     = list(parameters.binVar)
+        self.parVar     = list(parameters.parVar)
+        self.isResponse = parameters.isResponse
+        self.formula    = parameters.formula
+        self.code       = compileFormula(parameters.formula)
+        records = parameters.records
+        if len(records) == 0:
+            raise ValueError("level %s has no records" % self.level)
+        nParameters = max([len(record[2]) for record in records])
+        self.xMin = numpy.array([record[0] for record in records], dtype = numpy.float32).astype(numpy.float64)
+        self.xMax = numpy.array([record[1] for record in records], dtype = numpy.float32).astype(numpy.float64)
+        self.xMin = self.xMin.reshape(len(records), len(self.binVar))
+        self.xMax = self.xMax.reshape(len(records), len(self.binVar))
+        self.parameters = numpy.full((len(records), nParameters), numpy.nan)
+        for (index, record) in enumerate(records):
+            self.parameters[index, :len(record[2])] = numpy.array(record[2], dtype = numpy.float32)
+        ## the records sorted by their lower bin edges, the first variable first,
+        ## for the lookup with searchsorted
+        self.order = numpy.lexsort(self.xMin.T[::-1]) if len(self.binVar) > 0 else numpy.arange(len(records))
+        ## the columns of the records contiguous, for gathering them per jet
+        self.xMinT = numpy.ascontiguousarray(self.xMin.T)
+        self.xMaxT = numpy.ascontiguousarray(self.xMax.T)
+        self.parametersT = numpy.ascontiguousarray(self.parameters.T)
+        self.invertVar = None
+        if self.isResponse:
+            for name in ('JetPt', 'JetE'):
+                if name in self.parVar:
+                    self.invertVar = self.parVar.index(name)
+                    break
+            if self.invertVar is None:
+                raise ValueError("response level %s has neither JetPt nor JetE to invert" % self.level)
+
+    def binIndex(self, binValues, n):
+        """ the record of each of the n jets, -1 if its binValues are in no bin """
+        if len(self.binVar) == 0:
+            return numpy.zeros(n, dtype = int)
+        index = numpy.full(n, -1, dtype = int)
+        self._lookup(binValues, self.order, numpy.arange(n), 0, index)
+        ## every jet has to be inside all ranges of its record
+        found = numpy.flatnonzero(index >= 0)
+        records = index[found]
+        inside = numpy.ones(len(found), dtype = bool)
+        for (dimension, values) in enumerate(binValues):
+            values = values.take(found)
+            inside &= (values >= self.xMinT[dimension].take(records)) & \
+                      (values <  self.xMaxT[dimension].take(records))
+        index[found[~inside]] = -1
+        return index
+
+    def _lookup(self, binValues, records, jets, dimension, index):
+        """ find the records of jets among records, sorted by their lower edges in dimension and after """
+        edges = self.xMin[records, dimension]
+        lower = numpy.unique(edges)
+        bins = numpy.searchsorted(lower, binValues[dimension][jets], side = 'right') - 1
+        if dimension == len(self.binVar) - 1:
+            ## the first record with the lower edge, as the C++ code takes the first matching record
+            first = records[numpy.searchsorted(edges, lower, side = 'left')]
+            found = bins >= 0
+            index[jets[found]] = first[bins[found]]
+            return
+        for (bin, edge) in enumerate(lower):
+            selected = jets[bins == bin]
+            if len(selected) > 0:
+                self._lookup(binValues, records[edges == edge], selected, dimension + 1, index)
+
+    def evaluate(self, values):
+        """ the factors of the jets, values: {variable : array}; 1 for jets outside the bins """
+        binValues = [numpy.asarray(values[name], dtype = numpy.float64) for name in self.binVar]
+        n = len(numpy.asarray(values[self.parVar[0]])) if len(binValues) == 0 else len(binValues[0])
+        factors = numpy.ones(n)
+        index = self.binIndex(binValues, n)
+        found = numpy.flatnonzero(index >= 0)
+        if len(found) == 0:
+            return factors
+        everywhere = len(found) == n
+        if not everywhere:
+            index = index.take(found)
+        columns = [column.take(index) for column in self.parametersT]
+        v = []
+        for (i, name) in enumerate(self.parVar):
+            value = numpy.asarray(values[name], dtype = numpy.float64)
+            if not everywhere:
+                value = value.take(found)
+            v.append(numpy.clip(value, columns[2*i], columns[2*i + 1]))
+        p = numpy.array(columns[2*len(self.parVar):])
+        with numpy.errstate(all = 'ignore'):
+            if self.isResponse:
+                result = self.invert(v, p)
+            else:
+                result = self.formulaValues(v, p, len(index))
+        if everywhere:
+            return result
+        factors[found] = result
+        return factors
+
+    def formulaValues(self, v, p, n):
+        """ the formula of n jets, constant formulas give n times their value """
+        return eval(self.code, {'__builtins__' : {}}, {'v' : v, 'p' : p, 'f' : functions}) + numpy.zeros(n)
+
+    def invert(self, v, p):
+        """ 1/response at the pT (energy) whose response times pT gives v, as SimpleJetCorrector::invert """
+        target = v[self.invertVar]
+        x = list(v)
+        x[self.invertVar] = target.copy()
+        response = numpy.ones(len(target))
+        active = numpy.ones(len(target), dtype = bool)
+        for iteration in range(self.maxIterations):
+            xActive = [value[active] for value in x]
+            rsp = self.formulaValues(xActive, p[:, active], len(xActive[0]))
+            response[active] = rsp
+            error = numpy.abs(xActive[self.invertVar]*rsp - target[active]) / target[active]
+            x[self.invertVar][active] = target[active] / rsp
+            active[numpy.flatnonzero(active)[error <= self.precision]] = False
+            if not numpy.any(active):
+                break
+        return 1. / response
+
+
+class FactorizedEvaluator(object):
+    """ the levels (LevelEvaluators or JetCorrectorParameters) applied one after the other """
+    def __init__(self, levels):
+        self.levels = [level if isinstance(level, LevelEvaluator) else LevelEvaluator(level) for level in levels]
+
+    @classmethod
+    def fromTxt(cls, prefix, payloadName, levels, cache = None):
+        """ the levels read from <prefix>_<level>_<payloadName>.txt, through cache (jecCache.PayloadCache) if given """
+        read = cache.readTxt if cache is not None else readTxt
+        return cls([read("%s_%s_%s.txt" % (prefix, level, payloadName)) for level in levels])
+
+    @classmethod
+    def fromDB(cls, dbFileName, era, payloadName, levels, run = 1, cache = None):
+        """ the levels of the payload payloadName of era in the SQLite DB dbFileName, through cache if given """
+        if cache is not None:
+            collection = cache.collection(dbFileName, era, payloadName, run)
+        else:
+            db = PayloadDB(dbFileName)
+            tags = db.selectTags(era, [payloadName])
+            collection = db.collection(tags[payloadName], run)
+            db.close()
+        parameters = dict([(level.level, level) for (key, level) in reversed(collection)])
+        missing = [level for level in levels if level not in parameters]
+        if len(missing) > 0:
+            raise ValueError("payload %s of era %s has no levels %s" % (payloadName, era, ", ".join(missing)))
+        return cls([parameters[level] for level in levels])
+
+    def corrections(self, pt, eta, area = None, rho = None, energy = None, phi = None, **others):
+        """
+        the total correction factors of the jets and the factors of every
+        level. The jet variables of the levels are JetPt, JetEta, AbsJetEta,
+        JetA (area), Rho, JetE (energy), JetPhi and any others given by name.
+        """
+        pt = numpy.asarray(pt, dtype = numpy.float64)
+        values = dict([(name, numpy.asarray(value, dtype = numpy.float64)) for (name, value) in others.items()])
+        values['JetEta'] = numpy.asarray(eta, dtype = numpy.float64)
+        values['AbsJetEta'] = numpy.abs(values['JetEta'])
+        for (name, value) in (('JetA', area), ('Rho', rho), ('JetPhi', phi)):
+            if value is not None:
+                values[name] = numpy.asarray(value, dtype = numpy.float64)
+        total = numpy.ones(len(pt))
+        levelFactors = []
+        for level in self.levels:
+            values['JetPt'] = pt*total
+            if energy is not None:
+                values['JetE'] = numpy.asarray(energy, dtype = numpy.float64)*total
+            missing = [name for name in level.binVar + level.parVar if name not in values]
+            if len(missing) > 0:
+                raise ValueError("level %s needs %s" % (level.level, ", ".join(missing)))
+            factors = level.evaluate(values)
+            levelFactors.append(factors)
+            total = total*factors
+        return (total, levelFactors)
+
+    def correction(self, pt, eta, area = None, rho = None, energy = None, phi = None, **others):
+        """ the total correction factors of the jets """
+        return self.corrections(pt, eta, area, rho, energy, phi, **others)[0]
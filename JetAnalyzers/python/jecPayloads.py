@@ -0,0 +1,423 @@
+import os
+import struct
+import sqlite3
+import multiprocessing
+
+################################################################################
+## JEC payloads of a local SQLite conditions DB, without cmsRun
+################################################################################
+## writeTxtFromLocalDB.py runs one JetCorrectorDBReader per payload in cmsRun,
+## which needs a CMSSW setup and fetches and writes the payloads one after the
+## other. PayloadDB reads the JetCorrectorParametersCollection payloads of an
+## era straight from the tables of the DB (CondDB v2: TAG, IOV, PAYLOAD) in
+## one pass, and decodes them in Python from the portable binary archive
+## CMSSW serializes them with:
+##
+##   db = PayloadDB('Winter14_V4_MC.db')
+##   db.tags('Winter14_V4_MC')                 # {payloadName : tag}
+##   collection = db.collection(tag)          # [(key, JetCorrectorParameters)]
+##   writeTxts('Winter14_V4_MC.db', 'Winter14_V4_MC', jobs = 8)
+##
+## writeTxts() writes the text files of all payloads of the era in parallel,
+## with the names and the format JetCorrectorDBReader writes them:
+## <outputPrefix>_<level>_<payloadName>.txt. readTxt() reads such a file back
+## into JetCorrectorParameters. jecCache.PayloadCache keeps the decoded
+## payloads, writeTxts(..., cache = cache) only reads the DB for those it
+## doesn't have.
+
+tagPrefix = 'JetCorrectorParametersCollection_'
+
+class JetCorrectorParameters(object):
+    """
+    the definitions (isResponse, level, formula, parVar, binVar) and records
+    of one correction level, every record (xMin, xMax, parameters) with the
+    bin ranges of the binVar and the parameters, which start with the ranges
+    of the parVar
+    """
+    def __init__(self, isResponse, level, formula, parVar, binVar, records):
+        self.isResponse = isResponse
+        self.level      = level
+        self.formula    = formula
+        self.parVar     = parVar
+        self.binVar     = binVar
+        self.records    = records
+
+    def text(self):
+        """ the text file, as JetCorrectorParameters::printFile writes it """
+        ## printFile right-aligns every field in 15 characters with setw(15)
+        ## before it, which std::ostream resets after every field. Hence the
+        ## first field of a line is not padded and the newline of a record is.
+        fields = ["{", "%i" % len(self.binVar)]
+        widths = [0, 0]
+        for name in self.binVar:
+            fields.append(name)
+            widths.append(15)
+        fields.append("%i" % len(self.parVar))
+        widths.append(15)
+        for name in self.parVar:
+            fields.append(name)
+            widths.append(15)
+        fields.append(self.formula)
+        widths.append(len(self.formula) + 15)
+        fields.append(self.isResponse and "Response" or "Correction")
+        widths.append(15)
+        fields.append(self.level)
+        widths.append(15)
+        lines = ["".join([field.rjust(width) for (field, width) in zip(fields, widths)]) + "}\n"]
+        for (xMin, xMax, parameters) in self.records:
+            fields = []
+            for index in range(len(self.binVar)):
+                fields.extend([number(xMin[index]), number(xMax[index])])
+            fields.append("%i" % len(parameters))
+            fields.extend([number(parameter) for parameter in parameters])
+            lines.append(fields[0] + "".join([field.rjust(15) for field in fields[1:]]) + "\n".rjust(15))
+        return "".join(lines)
+
+    def printFile(self, fileName):
+        txtFile = open(fileName, "w")
+        txtFile.write(self.text())
+        txtFile.close()
+
+def number(value):
+    """ value as std::ostream writes a float by default """
+    return "%g" % value
+
+def readTxt(fileName, section = ''):
+    """
+    the JetCorrectorParameters of section ('' for the lines before the first
+    [section]) of the text file fileName, read as the constructor of
+    JetCorrectorParameters reads it
+    """
+    txtFile = open(fileName)
+    current = ''
+    parameters = None
+    for (lineNumber, line) in enumerate(txtFile):
+        line = line.strip()
+        if line == '' or line.startswith('#'):
+            continue
+        if line.startswith('['):
+            current = line[1:line.index(']')]
+            continue
+        if current != section:
+            continue
+        if line.startswith('{'):
+            tokens = line.strip('{}').split()
+            nBinVar = int(tokens[0])
+            nParVar = int(tokens[nBinVar + 1])
+            formula = tokens[nBinVar + nParVar + 2]
+            if formula == '""':
+                formula = ''
+            level = ''
+            if len(tokens) > nBinVar + nParVar + 4:
+                level = tokens[nBinVar + nParVar + 4]
+            parameters = JetCorrectorParameters(tokens[nBinVar + nParVar + 3] == "Response", level, formula,
+                                                tokens[nBinVar + 2:nBinVar + nParVar + 2], tokens[1:nBinVar + 1], [])
+            continue
+        if parameters is None:
+            raise ValueError("%s:%i: record before the definitions" % (fileName, lineNumber + 1))
+        tokens = line.split()
+        nBinVar = len(parameters.binVar)
+        values = [float(token) for token in tokens]
+        if len(values) < 2*nBinVar + 1 or int(values[2*nBinVar]) != len(values) - 2*nBinVar - 1:
+            raise ValueError("%s:%i: the record doesn't have the number of parameters it says" % (fileName, lineNumber + 1))
+        parameters.records.append((values[0:2*nBinVar:2], values[1:2*nBinVar:2], values[2*nBinVar + 1:]))
+    txtFile.close()
+    if parameters is None:
+        raise ValueError("%s has no definitions of section '%s'" % (fileName, section))
+    return parameters
+
+
+################################################################################
+## the portable binary archive
+################################################################################
+## CMSSW serializes payloads with boost::serialization into an
+## eos::portable_oarchive: a magic byte and the library version, then every
+## integer as a signed byte with its length followed by its little-endian
+## bytes (a negative length for negative values), a bool as a byte, a string
+## as its length and its characters and a float as the integer of its bits.
+## The first object of every class is preceded by its tracking level and
+## version, vectors by their size and (library version > 3) item version.
+
+magicByte = 0x7f
+
+class ArchiveError(ValueError):
+    pass
+
+class PortableArchive(object):
+    """
+    reader of the portable binary archive data. vectorInfo: whether vectors
+    of floats have class information, hasValid: whether the valid_ flag of
+    JetCorrectorParameters is serialized (the layouts of CMSSW releases)
+    """
+    def __init__(self, data, vectorInfo = False, hasValid = True):
+        self.data       = bytearray(data)
+        self.position   = 0
+        self.vectorInfo = vectorInfo
+        self.hasValid   = hasValid
+        self.classes    = set()
+        if self.byte() != magicByte:
+            raise ArchiveError("not a portable binary archive")
+        self.libraryVersion = self.integer()
+
+    def byte(self):
+        if self.position >= len(self.data):
+            raise ArchiveError("archive ends at byte %i" % self.position)
+        value = self.data[self.position]
+        self.position += 1
+        return value
+
+    def integer(self):
+        size = self.byte()
+        if size > 127:
+            size -= 256
+        length = abs(size)
+        if length > 8 or self.position + length > len(self.data):
+            raise ArchiveError("invalid integer at byte %i" % (self.position - 1))
+        value = 0
+        for index in range(length):
+            value |= self.data[self.position + index] << (8*index)
+        self.position += length
+        if size < 0:
+            value -= 1 << (8*length)
+        return value
+
+    def boolean(self):
+        value = self.byte()
+        if value > 1:
+            raise ArchiveError("invalid bool at byte %i" % (self.position - 1))
+        return value == 1
+
+    def string(self):
+        length = self.integer()
+        if length < 0 or self.position + length > len(self.data):
+            raise ArchiveError("invalid string at byte %i" % self.position)
+        value = bytes(self.data[self.position:self.position + length]).decode('latin-1')
+        self.position += length
+        return str(value)
+
+    def real(self):
+        return struct.unpack('<f', struct.pack('<I', self.integer() & 0xffffffff))[0]
+
+    def preamble(self, className):
+        """ the tracking level and version of the first object of className """
+        if className in self.classes:
+            return
+        self.classes.add(className)
+        if self.libraryVersion > 6:
+            self.integer()
+        else:
+            self.boolean()
+        self.integer()
+
+    def vector(self, className, item):
+        if className is not None:
+            self.preamble(className)
+        count = self.integer()
+        if count < 0 or count > len(self.data) - self.position:
+            raise ArchiveError("invalid vector size %i at byte %i" % (count, self.position))
+        if self.libraryVersion > 3:
+            self.integer()
+        return [item() for index in range(count)]
+
+    ## the JetMETObjects classes, members in the order they are declared
+    def floats(self):
+        return self.vector(self.vectorInfo and 'vector<float>' or None, self.real)
+
+    def record(self):
+        self.preamble('JetCorrectorParameters::Record')
+        nVar = self.integer()
+        xMin = self.floats()
+        xMax = self.floats()
+        parameters = self.floats()
+        if len(xMin) != nVar or len(xMax) != nVar:
+            raise ArchiveError("record with %i variables has %i/%i bin ranges" % (nVar, len(xMin), len(xMax)))
+        return (xMin, xMax, parameters)
+
+    def parameters(self):
+        self.preamble('JetCorrectorParameters')
+        self.preamble('JetCorrectorParameters::Definitions')
+        isResponse = self.boolean()
+        level = self.string()
+        formula = self.string()
+        parVar = self.vector('vector<string>', self.string)
+        binVar = self.vector('vector<string>', self.string)
+        records = self.vector('vector<JetCorrectorParameters::Record>', self.record)
+        if self.hasValid:
+            self.boolean()
+        for (xMin, xMax, parameters) in records:
+            if len(xMin) != len(binVar):
+                raise ArchiveError("records of %s don't match its %i bin variables" % (level, len(binVar)))
+        return JetCorrectorParameters(isResponse, level, formula, parVar, binVar, records)
+
+    def pair(self):
+        self.preamble('pair<int,JetCorrectorParameters>')
+        return (self.integer(), self.parameters())
+
+    def collection(self):
+        """ the corrections, L5Flavor and L7Parton sections of a JetCorrectorParametersCollection """
+        self.preamble('JetCorrectorParametersCollection')
+        sections = [self.vector('vector<pair<int,JetCorrectorParameters> >', self.pair) for index in range(3)]
+        if self.position != len(self.data):
+            raise ArchiveError("%i bytes left after the collection" % (len(self.data) - self.position))
+        return sections
+
+def decodeCollection(data):
+    """
+    the [(key, JetCorrectorParameters)] of the serialized
+    JetCorrectorParametersCollection data, the L5Flavor and L7Parton sections
+    after the corrections. Every layout is tried until one reads the whole data.
+    """
+    problems = []
+    for (vectorInfo, hasValid) in [(False, True), (True, True), (False, False), (True, False)]:
+        try:
+            return sum(PortableArchive(data, vectorInfo, hasValid).collection(), [])
+        except ArchiveError as error:
+            problems.append(str(error))
+    raise ArchiveError("can't decode JetCorrectorParametersCollection: " + "; ".join(problems))
+
+
+################################################################################
+## the conditions DB
+################################################################################
+
+def dbPath(dbFileName):
+    """ the file of the SQLite DB dbFileName, without sqlite_file: or sqlite: """
+    for prefix in ('sqlite_file:', 'sqlite:'):
+        if dbFileName.startswith(prefix):
+            dbFileName = dbFileName[len(prefix):]
+    return dbFileName
+
+class PayloadDB(object):
+    """ the JEC tags and payloads of the SQLite conditions DB dbFileName """
+    def __init__(self, dbFileName):
+        dbFileName = dbPath(dbFileName)
+        if not os.path.isfile(dbFileName):
+            raise IOError("no conditions DB " + dbFileName)
+        self.fileName = dbFileName
+        self.db = sqlite3.connect(dbFileName)
+        tables = [name.upper() for (name,) in self.db.execute("select name from sqlite_master where type = 'table'")]
+        if 'TAG' not in tables or 'IOV' not in tables or 'PAYLOAD' not in tables:
+            raise ValueError("%s has no TAG, IOV and PAYLOAD tables, it was written by CMSSW before CondDB v2 "
+                             "(convert it with conddb_migrate)" % dbFileName)
+
+    def close(self):
+        self.db.close()
+
+    def tags(self, era):
+        """ {payloadName : tag} of the JetCorrectorParametersCollection tags of era """
+        prefix = tagPrefix + era + '_'
+        return dict([(name[len(prefix):], name) for (name,) in self.db.execute("select NAME from TAG")
+                     if name.startswith(prefix)])
+
+    def selectTags(self, era, payloadNames = None):
+        """ {payloadName : tag} of the payloadNames (default all) of era, ValueError if some are missing """
+        tags = self.tags(era)
+        if payloadNames is None:
+            return tags
+        missing = [payloadName for payloadName in payloadNames if payloadName not in tags]
+        if len(missing) > 0:
+            raise ValueError("%s has no payloads %s of era %s" % (self.fileName, ", ".join(missing), era))
+        return dict([(payloadName, tags[payloadName]) for payloadName in payloadNames])
+
+    def payloads(self, tags, run = 1):
+        """ {tag : data} of the payloads of tags valid for run, read in one query """
+        tags = set(tags)
+        hashes = {}
+        for (tag, since, payloadHash) in self.db.execute(
+            "select TAG_NAME, SINCE, PAYLOAD_HASH from IOV order by TAG_NAME, SINCE, INSERTION_TIME"):
+            if tag in tags and since <= run:
+                hashes[tag] = payloadHash
+        data = {}
+        for (payloadHash, payloadData) in self.db.execute(
+            "select HASH, DATA from PAYLOAD where HASH in (%s)" % ", ".join(["?"]*len(hashes)), list(hashes.values())):
+            data[payloadHash] = payloadData
+        return dict([(tag, bytes(data[payloadHash])) for (tag, payloadHash) in hashes.items() if payloadHash in data])
+
+    def collection(self, tag, run = 1):
+        """ the [(key, JetCorrectorParameters)] of tag valid for run """
+        payloads = self.payloads([tag], run)
+        if tag not in payloads:
+            raise ValueError("%s has no payload of %s for run %i" % (self.fileName, tag, run))
+        return decodeCollection(payloads[tag])
+
+
+def txtFileNames(outputPrefix, payloadName, collection):
+    """
+    the text file names of the levels of collection, as JetCorrectorDBReader
+    names them. Levels which repeat (the L5Flavor and L7Parton sections) get
+    their key appended instead of overwriting each other.
+    """
+    levels = [parameters.level for (key, parameters) in collection]
+    fileNames = []
+    for (key, parameters) in collection:
+        level = parameters.level
+        if levels.count(level) > 1:
+            level += "_%i" % key
+        fileNames.append("%s_%s_%s.txt" % (outputPrefix, level, payloadName))
+    return fileNames
+
+def decodePayload(task):
+    """ the collection of (payloadName, data) """
+    return decodeCollection(task[1])
+
+def runTasks(function, tasks, jobs = None):
+    """ [function(task) for task in tasks], run in jobs processes """
+    jobs = min(jobs or multiprocessing.cpu_count(), max(len(tasks), 1))
+    if jobs <= 1:
+        return [function(task) for task in tasks]
+    pool = multiprocessing.Pool(jobs)
+    results = pool.map(function, tasks)
+    pool.close()
+    pool.join()
+    return results
+
+def readCollections(dbFileName, era, payloadNames = None, run = 1, jobs = None):
+    """
+    {payloadName : [(key, JetCorrectorParameters)]} of the payloads of era
+    (only payloadNames, if given) in dbFileName valid for run, decoded in
+    jobs processes
+    """
+    db = PayloadDB(dbFileName)
+    tags = db.selectTags(era, payloadNames)
+    payloads = db.payloads(tags.values(), run)
+    db.close()
+    tasks = [(payloadName, payloads[tag]) for (payloadName, tag) in sorted(tags.items()) if tag in payloads]
+    return dict(zip([task[0] for task in tasks], runTasks(decodePayload, tasks, jobs)))
+
+def writeTxt(task):
+    """
+    write the text files of (payloadName, payload, outputPrefix), the payload
+    either the serialized data or the decoded collection
+    """
+    (payloadName, payload, outputPrefix) = task
+    collection = payload if isinstance(payload, list) else decodeCollection(payload)
+    fileNames = txtFileNames(outputPrefix, payloadName, collection)
+    for ((key, parameters), fileName) in zip(collection, fileNames):
+        parameters.printFile(fileName)
+    return fileNames
+
+def writeTxts(dbFileName, era, outputPrefix = None, payloadNames = None, jobs = None, run = 1, cache = None):
+    """
+    write the text files of the payloads of era (only payloadNames, if given)
+    in dbFileName, decoded in jobs processes. The files are named
+    <outputPrefix>_<level>_<payloadName>.txt, outputPrefix defaults to
+    <era>_txts_fromDB/<era> as in writeTxtFromLocalDB.py. With a cache
+    (jecCache.PayloadCache) the payloads decoded before are taken from it
+    without reading the DB. Returns {payloadName : [text files]}.
+    """
+    if outputPrefix is None:
+        outputPrefix = os.path.join(era + '_txts_fromDB', era)
+    if cache is not None:
+        collections = cache.collections(dbFileName, era, payloadNames, run, jobs)
+        tasks = [(payloadName, collections[payloadName], outputPrefix) for payloadName in sorted(collections)]
+    else:
+        db = PayloadDB(dbFileName)
+        tags = db.selectTags(era, payloadNames)
+        payloads = db.payloads(tags.values(), run)
+        db.close()
+        tasks = [(payloadName, payloads[tag], outputPrefix) for (payloadName, tag) in sorted(tags.items()) if tag in payloads]
+    outputDir = os.path.dirname(outputPrefix)
+    if outputDir and not os.path.isdir(outputDir):
+        os.makedirs(outputDir)
+    fileNames = runTasks(writeTxt, tasks, jobs)
+    return dict(zip([task[0] for task in tasks], fileNames))
@@ -0,0 +1,290 @@
+import os
+import re
+import time
+import sqlite3
+
+################################################################################
+## catalogue of the ntuples in grid output directories
+################################################################################
+## listing a grid output directory with tens of thousands of files takes
+## minutes on HDFS. NtupleCatalogue keeps the files of a directory, with the
+## sample, gridJob, gridTry and gridId parsed from their names, their sizes
+## and (on request) event counts in an SQLite file. refresh() only lists the
+## directory again if its modification time changed, and then only parses
+## the files which are new. The sizes of the others (e.g. of files which were
+## still being transferred) are updated by restat(), which deduplicated()
+## calls for the files it judges.
+##
+##   catalogue = NtupleCatalogue('ntuples.db', inputFilePath, ntupleFile_regex)
+##   catalogue.refresh()
+##   catalogue.files('Ztautau')        # all files of the sample
+##   catalogue.latest('Ztautau')       # the latest try of every grid job
+##   (files, dropped) = catalogue.deduplicated('Ztautau', check = True, treeNames = ['ak5tauHPSlooseCombDBcorrAll/t'])
+##                                     # the newest good try of every grid job
+
+fields = ['sample', 'gridJob', 'gridTry', 'gridId']
+
+schema = """
+create table if not exists directories (
+  path     text primary key,
+  mtime    real,
+  pattern  text,
+  listed   real
+);
+create table if not exists files (
+  directory text,
+  name      text,
+  sample    text,
+  gridJob   integer,
+  gridTry   integer,
+  gridId    text,
+  size      integer,
+  mtime     real,
+  events    integer,
+  primary key (directory, name)
+);
+create index if not exists filesBySample on files (directory, sample, gridJob, gridTry);
+create table if not exists checks (
+  directory text,
+  name      text,
+  mtime     real,
+  trees     text,
+  problem   text,
+  primary key (directory, name)
+);
+"""
+
+class NtupleCatalogue(object):
+    """
+    the files of directory whose names match pattern, a regular expression
+    with the groups sample, gridJob, gridTry and/or gridId, catalogued in the
+    SQLite file dbFileName
+    """
+    def __init__(self, dbFileName, directory, pattern):
+        self.directory = os.path.abspath(directory)
+        self.pattern   = pattern
+        self.matcher   = re.compile(pattern)
+        self.db        = sqlite3.connect(dbFileName)
+        self.db.text_factory = str
+        self.db.executescript(schema)
+
+    def close(self):
+        self.db.close()
+
+    ## filling
+    def parse(self, name):
+        """ the fields parsed from the file name, None if it doesn't match """
+        match = self.matcher.match(name)
+        if match is None:
+            return None
+        groups = match.groupdict()
+        values = [groups.get(field) for field in fields]
+        for index in (1, 2):
+            if values[index] is not None:
+                values[index] = int(values[index]) if values[index] != '' else None
+        return values
+
+    def refresh(self, force = False):
+        """
+        bring the catalogue up to date with the directory, returns the
+        numbers of (added, removed) files. The directory is listed only if
+        its modification time or the pattern changed, or with force = True,
+        and then only the new files are stat'ed; see restat() for the others.
+        """
+        mtime = os.stat(self.directory).st_mtime
+        row = self.db.execute("select mtime, pattern from directories where path = ?", (self.directory,)).fetchone()
+        if row is not None and row[1] != self.pattern:
+            ## a new pattern parses the names differently
+            self.db.execute("delete from files where directory = ?", (self.directory,))
+            row = None
+        if row is not None and row[0] == mtime and not force:
+            return (0, 0)
+
+        names = set(os.listdir(self.directory))
+        known = set([name for (name,) in self.db.execute("select name from files where directory = ?", (self.directory,))])
+        removed = known - names
+        added = []
+        for name in sorted(names - known):
+            values = self.parse(name)
+            if values is None:
+                continue
+            info = os.stat(os.path.join(self.directory, name))
+            added.append([self.directory, name] + values + [info.st_size, info.st_mtime])
+        self.db.executemany("delete from files where directory = ? and name = ?",
+                            [(self.directory, name) for name in removed])
+        self.db.executemany("insert into files (directory, name, sample, gridJob, gridTry, gridId, size, mtime) "
+                            "values (?, ?, ?, ?, ?, ?, ?, ?)", added)
+        self.db.execute("insert or replace into directories (path, mtime, pattern, listed) values (?, ?, ?, ?)",
+                        (self.directory, mtime, self.pattern, time.time()))
+        self.db.commit()
+        return (len(added), len(removed))
+
+    def restat(self, names):
+        """
+        update the size and modification time of the catalogued files names
+        which changed, their event counts and checks are dropped. Returns the
+        number of files updated.
+        """
+        changed = []
+        for name in names:
+            row = self.db.execute("select size, mtime from files where directory = ? and name = ?",
+                                  (self.directory, name)).fetchone()
+            if row is None:
+                continue
+            try:
+                info = os.stat(self.path(name))
+            except OSError:
+                continue
+            if (info.st_size, info.st_mtime) != (row[0], row[1]):
+                changed.append((info.st_size, info.st_mtime, self.directory, name))
+        self.db.executemany("update files set size = ?, mtime = ?, events = null where directory = ? and name = ?", changed)
+        self.db.executemany("delete from checks where directory = ? and name = ?", [row[2:] for row in changed])
+        self.db.commit()
+        return len(changed)
+
+    def countEvents(self, sample = None, treeName = 't', names = None):
+        """
+        fill in the event counts (entries of treeName in the first directory
+        of the file) of the files which don't have one yet, only of names if
+        given. Needs PyROOT.
+        """
+        import ROOT
+        query = "select name from files where directory = ? and events is null"
+        arguments = [self.directory]
+        if sample is not None:
+            query += " and sample = ?"
+            arguments.append(sample)
+        uncounted = [name for (name,) in self.db.execute(query, arguments).fetchall()]
+        if names is not None:
+            names = set(names)
+            uncounted = [name for name in uncounted if name in names]
+        counts = []
+        for name in uncounted:
+            rootFile = ROOT.TFile.Open(os.path.join(self.directory, name))
+            if not rootFile or rootFile.IsZombie():
+                continue
+            tree = rootFile.Get(treeName)
+            if not tree:
+                for key in rootFile.GetListOfKeys():
+                    if key.GetClassName() == 'TDirectoryFile':
+                        tree = rootFile.Get(key.GetName() + '/' + treeName)
+                        break
+            if tree:
+                counts.append((tree.GetEntries(), self.directory, name))
+            rootFile.Close()
+        self.db.executemany("update files set events = ? where directory = ? and name = ?", counts)
+        self.db.commit()
+        return len(counts)
+
+    def check(self, name, treeNames):
+        """
+        the problem of the file name, None if it opens and has all trees in
+        treeNames. Needs PyROOT, the result is kept until the file changes.
+        """
+        (mtime,) = self.db.execute("select mtime from files where directory = ? and name = ?",
+                                   (self.directory, name)).fetchone()
+        trees = ','.join(treeNames)
+        row = self.db.execute("select mtime, trees, problem from checks where directory = ? and name = ?",
+                              (self.directory, name)).fetchone()
+        if row is not None and row[0] == mtime and row[1] == trees:
+            return row[2]
+        import ROOT
+        problem = None
+        rootFile = ROOT.TFile.Open(self.path(name))
+        if not rootFile or rootFile.IsZombie():
+            problem = "can't be opened"
+        else:
+            if rootFile.TestBit(ROOT.TFile.kRecovered):
+                problem = "was not closed properly"
+            for treeName in treeNames:
+                if problem is None and not rootFile.Get(treeName):
+                    problem = "has no tree " + treeName
+            rootFile.Close()
+        self.db.execute("insert or replace into checks (directory, name, mtime, trees, problem) values (?, ?, ?, ?, ?)",
+                        (self.directory, name, mtime, trees, problem))
+        self.db.commit()
+        return problem
+
+    ## queries
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def samples(self):
+        """ the samples in the directory """
+        return [sample for (sample,) in self.db.execute(
+            "select distinct sample from files where directory = ? order by sample", (self.directory,))]
+
+    def files(self, sample):
+        """ the paths of all files of sample """
+        return [self.path(name) for (name,) in self.db.execute(
+            "select name from files where directory = ? and sample = ? order by name", (self.directory, sample))]
+
+    def latest(self, sample):
+        """ the paths of the latest try of every grid job of sample """
+        return [self.path(name) for (name,) in self.db.execute(
+            "select name from files join "
+            "(select gridJob as job, max(gridTry) as try from files where directory = ? and sample = ? group by gridJob) "
+            "on gridJob = job and gridTry = try where directory = ? and sample = ? order by gridJob",
+            (self.directory, sample, self.directory, sample))]
+
+    def deduplicated(self, sample, check = False, treeNames = ['t']):
+        """
+        the paths of the newest good try of every grid job of sample, and the
+        dropped files as (path, reason). Tries with an empty file are not
+        good, with check = True neither are those which don't open or lack a
+        tree of treeNames (needs PyROOT). Files without a grid job in their
+        name can't be told apart from other tries and are dropped. The files
+        are stat'ed again, so a file which changed since it was catalogued or
+        checked is judged as it is now.
+        """
+        tries = {}
+        files = []
+        dropped = []
+        for (name, gridJob) in self.db.execute(
+            "select name, gridJob from files where directory = ? and sample = ? "
+            "order by gridJob, gridTry desc, mtime desc", (self.directory, sample)).fetchall():
+            if gridJob is None:
+                dropped.append((self.path(name), "has no grid job in its name"))
+                continue
+            tries.setdefault(gridJob, []).append(name)
+        ## the decisions rest on the current sizes and modification times, of
+        ## the newest tries all at once, of the older ones when they are needed
+        self.restat([names[0] for names in tries.values()])
+        for gridJob in sorted(tries):
+            kept = None
+            for (index, name) in enumerate(tries[gridJob]):
+                if kept is not None:
+                    dropped.append((self.path(name), "older try of grid job %s than %s" % (gridJob, kept)))
+                    continue
+                if index > 0:
+                    self.restat([name])
+                (size,) = self.db.execute("select size from files where directory = ? and name = ?",
+                                          (self.directory, name)).fetchone()
+                problem = None
+                if size == 0:
+                    problem = "is empty"
+                elif check:
+                    problem = self.check(name, treeNames)
+                if problem is not None:
+                    dropped.append((self.path(name), problem))
+                    continue
+                kept = name
+                files.append(self.path(name))
+            if kept is None:
+                dropped.append((None, "grid job %s has no good try" % gridJob))
+        return (files, dropped)
+
+    def records(self, sample = None):
+        """ all catalogued fields of the files (of sample), as dicts """
+        columns = ['name'] + fields + ['size', 'mtime', 'events']
+        query = "select %s from files where directory = ?" % ', '.join(columns)
+        arguments = [self.directory]
+        if sample is not None:
+            query += " and sample = ?"
+            arguments.append(sample)
+        return [dict(zip(columns, row)) for row in self.db.execute(query + " order by name", arguments)]
+
+    def summary(self, sample):
+        """ (files, bytes, events) of sample; events counts only the files counted so far """
+        return self.db.execute("select count(*), coalesce(sum(size), 0), coalesce(sum(events), 0) from files "
+                               "where directory = ? and sample = ?", (self.directory, sample)).fetchone()
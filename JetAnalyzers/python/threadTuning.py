@@ -0,0 +1,81 @@
+import os
+import json
+import multiprocessing
+
+import FWCore.ParameterSet.Config as cms
+
+################################################################################
+## thread & stream settings tuned per algorithm list and node
+################################################################################
+## test/ConfigTools/tuneThreads.py runs short calibration passes of a
+## configuration at several numberOfThreads/numberOfStreams and stores the
+## best setting in tuningFile next to the configuration, keyed by the number
+## of cores the job may run on (its CPU affinity, the slot of a batch job,
+## not all cores of the host) and the algorithm list. The configuration then picks
+## it up with setThreads.
+
+tuningFile = 'jraThreads.json'
+
+def tuningFileFor(config):
+    """ the tuning file of the configuration file config, next to it """
+    return os.path.join(os.path.dirname(os.path.abspath(config)), tuningFile)
+
+def availableCores():
+    """ the cores this process may run on, all cores of the node where the affinity is unknown """
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return multiprocessing.cpu_count()
+
+def tuningKey(algorithms, cores = None):
+    """ the key of the tuned settings for algorithms on a node with cores cores (default availableCores()) """
+    if cores is None:
+        cores = availableCores()
+    return '%i cores: %s' % (cores, ','.join(sorted(algorithms)))
+
+
+def readTuning(fileName = tuningFile):
+    """ all tuned settings stored in fileName, {} if there are none """
+    if not os.path.exists(fileName):
+        return {}
+    tuningJSON = open(fileName)
+    tuning = json.load(tuningJSON)
+    tuningJSON.close()
+    return tuning
+
+
+def writeTuning(key, result, fileName = tuningFile):
+    """ store the tuned setting result under key, keeping the other keys """
+    tuning = readTuning(fileName)
+    tuning[key] = result
+    tuningJSON = open(fileName, 'w')
+    json.dump(tuning, tuningJSON, indent = 2, sort_keys = True)
+    tuningJSON.close()
+
+
+def tunedThreads(algorithms, fileName = tuningFile, cores = None):
+    """ (numberOfThreads, numberOfStreams) tuned for algorithms on this node, or None """
+    result = readTuning(fileName).get(tuningKey(algorithms, cores))
+    if result is None:
+        return None
+    return (result['numberOfThreads'], result['numberOfStreams'])
+
+
+def setThreads(process, threads, streams, algorithms = None, fileName = tuningFile):
+    """
+    set numberOfThreads & numberOfStreams of the process. With algorithms,
+    the setting tuned for them on this node is used if fileName has one,
+    threads & streams otherwise. Returns the setting used.
+    """
+    if algorithms is not None:
+        tuned = tunedThreads(algorithms, fileName)
+        if tuned is None:
+            print("setThreads: no tuned setting for %s in %s, using %i threads and %i streams"
+                  % (tuningKey(algorithms), fileName, threads, streams))
+        else:
+            (threads, streams) = tuned
+            print("setThreads: using the tuned %i threads and %i streams" % (threads, streams))
+    if not hasattr(process, 'options'):
+        process.options = cms.untracked.PSet()
+    process.options.numberOfThreads = cms.untracked.uint32(threads)
+    process.options.numberOfStreams = cms.untracked.uint32(streams)
+    return (threads, streams)
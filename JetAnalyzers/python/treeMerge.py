@@ -0,0 +1,261 @@
+import os
+import sys
+import json
+import time
+import shutil
+import subprocess
+import multiprocessing
+
+################################################################################
+## merging ROOT files in a tree of bounded fan-in
+################################################################################
+## hadd of all job outputs in one command uses one core, keeps all files open
+## and can exceed the maximum length of a command line. TreeMerger merges at
+## most fanIn files per hadd, runs up to jobs hadds in parallel and merges the
+## merged files again, until one file is left:
+##
+##   job outputs (level 0)  ->  partial merges (level 1)  ->  ...  ->  output
+##
+## The partial merges and the job outputs they contain are kept in a state
+## file next to the output. With incremental = True merging goes on from that
+## state: add() job outputs as they arrive, merge() folds every fanIn files of
+## a level into a partial merge of the next level, finish() merges what is
+## left into the output. Running again with more job outputs after finish()
+## merges only the new ones with the previous output. The job outputs are
+## known by their size and modification time as well, if one of them changed
+## or the output is gone, everything is merged again. Without incremental
+## every run starts from scratch, as hadd -f does.
+
+def emptyState():
+    ## levels[i]: the files to be merged at level i, partial merges are
+    ## {'fileName', 'inputs'} with the job outputs they contain; the
+    ## signatures are the [size, mtime] of the job outputs when they were added
+    return {'levels' : [[]], 'merged' : [], 'running' : [], 'counter' : 0, 'signatures' : {}}
+
+def signature(fileName):
+    info = os.stat(fileName)
+    return [info.st_size, info.st_mtime]
+
+
+class TreeMerger(object):
+    """
+    merge job outputs into outputFileName, fanIn files per hadd, jobs hadds
+    at a time. The partial merges are written to workDir (default
+    <outputFileName>.merge/), the state to <outputFileName>.merge.json,
+    which is only taken up again with incremental = True.
+    """
+    def __init__(self, outputFileName, fanIn = 8, jobs = None, hadd = 'hadd -f', workDir = None, verbose = True,
+                 incremental = False):
+        if fanIn < 2:
+            raise ValueError("TreeMerger needs a fan-in of at least 2, not %i" % fanIn)
+        self.outputFileName = outputFileName
+        self.fanIn          = fanIn
+        self.jobs           = jobs or multiprocessing.cpu_count()
+        self.hadd           = hadd
+        self.workDir        = workDir or outputFileName + '.merge'
+        self.stateFileName  = outputFileName + '.merge.json'
+        self.verbose        = verbose
+        self.counter        = 0
+        self.statistics     = {'files' : 0, 'bytes' : 0, 'merges' : 0, 'seconds' : 0.}
+        self.state = emptyState()
+        if os.path.exists(self.stateFileName):
+            stateFile = open(self.stateFileName)
+            self.state = json.load(stateFile)
+            stateFile.close()
+            ## state files written before the job outputs had signatures
+            self.state.setdefault('signatures', {})
+            if not incremental:
+                self.reset()
+        self.counter = self.state['counter']
+        ## merges interrupted by a crash are redone
+        for job in self.state['running']:
+            if os.path.exists(job['fileName']):
+                os.remove(job['fileName'])
+            self.state['levels'][job['level']][0:0] = job['items']
+        self.state['running'] = []
+
+    def log(self, message):
+        if self.verbose:
+            print("%s %s" % (time.strftime('%H:%M:%S'), message))
+            sys.stdout.flush()
+
+    def saveState(self):
+        self.state['counter'] = self.counter
+        stateFile = open(self.stateFileName + '.tmp', 'w')
+        json.dump(self.state, stateFile, indent = 1, sort_keys = True)
+        stateFile.close()
+        os.rename(self.stateFileName + '.tmp', self.stateFileName)
+
+    def reset(self, reason = None):
+        """ forget the state and remove the partial merges, to merge everything again """
+        if reason is not None:
+            self.log("treeMerge: %s, merging everything again" % reason)
+        items = [item for level in self.state['levels'] for item in level] + \
+                [item for job in self.state['running'] for item in job['items']] + \
+                [{'fileName' : job['fileName']} for job in self.state['running']]
+        for item in items:
+            if self.owned(item) and os.path.exists(item['fileName']):
+                os.remove(item['fileName'])
+        self.state = emptyState()
+        self.counter = 0
+
+    def known(self):
+        """ the job outputs which are merged or waiting to be merged """
+        known = set(self.state['merged'])
+        for level in self.state['levels']:
+            for item in level:
+                known.update(item['inputs'])
+        return known
+
+    def add(self, fileNames):
+        """
+        queue the job outputs fileNames which aren't merged yet, returns how
+        many are new. If a job output merged before changed, or the output
+        of the merged ones is gone, all are merged again.
+        """
+        known = self.known()
+        signatures = self.state['signatures']
+        changed = [fileName for fileName in fileNames
+                   if fileName in known and signatures.get(fileName) != signature(fileName)]
+        if len(changed) > 0:
+            self.reset("%i inputs changed since they were merged, e.g. %s" % (len(changed), changed[0]))
+        elif len(self.state['merged']) > 0 and not os.path.exists(self.outputFileName):
+            self.reset("%s is gone" % self.outputFileName)
+        known = self.known()
+        signatures = self.state['signatures']
+        new = [fileName for fileName in fileNames if fileName not in known]
+        for fileName in new:
+            self.state['levels'][0].append({'fileName' : fileName, 'inputs' : [fileName]})
+            signatures[fileName] = signature(fileName)
+        ## after finish() the output only holds the job outputs merged so far:
+        ## it becomes a partial merge again, to be merged with the new ones
+        if len(new) > 0 and os.path.exists(self.outputFileName) and len(self.state['merged']) > 0:
+            partialFileName = self.partialFileName()
+            if not os.path.exists(self.workDir):
+                os.makedirs(self.workDir)
+            shutil.move(self.outputFileName, partialFileName)
+            self.state['levels'][0].append({'fileName' : partialFileName, 'inputs' : self.state['merged']})
+            self.state['merged'] = []
+        self.saveState()
+        return len(new)
+
+    def partialFileName(self):
+        self.counter += 1
+        return os.path.join(self.workDir, 'partial_%06i.root' % self.counter)
+
+    def owned(self, item):
+        """ partial merges are deleted once merged further, job outputs never """
+        return os.path.dirname(os.path.abspath(item['fileName'])) == os.path.abspath(self.workDir)
+
+    ## merging
+    def merge(self, final = False):
+        """
+        merge every fanIn files of a level into a file of the next level, in
+        parallel, as long as there are fanIn files. With final = True the
+        files left over in all levels are merged into outputFileName too.
+        If a merge fails, no more are started, the running ones are waited
+        for and the state is saved before raising, so that a rerun retries.
+        """
+        if not os.path.exists(self.workDir):
+            os.makedirs(self.workDir)
+        start = time.time()
+        running = []
+        failures = []
+        while True:
+            for (index, level) in enumerate(self.state['levels']):
+                while len(level) >= self.fanIn and len(running) < self.jobs and len(failures) == 0:
+                    items = level[:self.fanIn]
+                    del level[:self.fanIn]
+                    running.append(self.startMerge(index, items, self.partialFileName()))
+            if final and len(running) == 0 and len(failures) == 0:
+                leftovers = [item for level in self.state['levels'] for item in level]
+                if len(leftovers) == 0:
+                    break
+                self.state['levels'] = [[] for level in self.state['levels']]
+                if len(leftovers) <= self.fanIn:
+                    running.append(self.startMerge(0, leftovers, self.outputFileName))
+                else:
+                    ## fewer than fanIn files in every level, but more than
+                    ## fanIn together: merge them as one level
+                    self.state['levels'][-1] = leftovers
+                    continue
+            if len(running) == 0:
+                break
+            self.state['running'] = [dict([(key, job[key]) for key in ('level', 'items', 'fileName')]) for job in running]
+            self.saveState()
+            time.sleep(0.1)
+            for job in list(running):
+                if job['process'].poll() is None:
+                    continue
+                running.remove(job)
+                failure = self.finishMerge(job)
+                if failure is not None:
+                    failures.append(failure)
+                    if len(running) > 0:
+                        self.log("treeMerge: %s, waiting for the %i merges running" % (failure, len(running)))
+            self.state['running'] = [dict([(key, job[key]) for key in ('level', 'items', 'fileName')]) for job in running]
+            self.saveState()
+        self.statistics['seconds'] += time.time() - start
+        self.saveState()
+        if len(failures) > 0:
+            raise RuntimeError("; ".join(failures))
+
+    def startMerge(self, index, items, outputFileName):
+        fileNames = [item['fileName'] for item in items]
+        logFileName = os.path.join(self.workDir, os.path.basename(outputFileName) + '.log')
+        log = open(logFileName, 'w')
+        ## merging a single file is a copy
+        if len(fileNames) == 1:
+            command = ['cp', fileNames[0], outputFileName]
+        else:
+            command = self.hadd.split() + [outputFileName] + fileNames
+        process = subprocess.Popen(command, stdout = log, stderr = subprocess.STDOUT)
+        log.close()
+        return {'process' : process, 'level' : index, 'items' : items, 'fileName' : outputFileName,
+                'logFileName' : logFileName, 'start' : time.time()}
+
+    def finishMerge(self, job):
+        """ take the output of the finished merge job into the state, None if it succeeded, the error otherwise """
+        items = job['items']
+        if job['process'].returncode != 0:
+            ## put the files back, so that a rerun can retry
+            self.state['levels'][job['level']][0:0] = items
+            if os.path.exists(job['fileName']):
+                os.remove(job['fileName'])
+            return "merging %s failed, see %s" % (job['fileName'], job['logFileName'])
+        seconds = time.time() - job['start']
+        size = 0
+        for item in items:
+            size += os.path.getsize(item['fileName'])
+            if not self.owned(item):
+                self.statistics['files'] += 1
+                self.statistics['bytes'] += os.path.getsize(item['fileName'])
+        self.statistics['merges'] += 1
+        self.log("  merged %i files (%.1f MB) into %s in %.1f s, %.1f MB/s"
+                 % (len(items), size / 1e6, os.path.basename(job['fileName']), seconds, size / 1e6 / max(seconds, 1e-3)))
+        for item in items:
+            if self.owned(item):
+                os.remove(item['fileName'])
+        os.remove(job['logFileName'])
+        inputs = [fileName for item in items for fileName in item['inputs']]
+        if job['fileName'] == self.outputFileName:
+            self.state['merged'] = inputs
+            return None
+        while len(self.state['levels']) < job['level'] + 2:
+            self.state['levels'].append([])
+        self.state['levels'][job['level'] + 1].append({'fileName' : job['fileName'], 'inputs' : inputs})
+        return None
+
+    def finish(self):
+        """ merge everything into outputFileName """
+        self.merge(final = True)
+        if os.path.exists(self.workDir) and len(os.listdir(self.workDir)) == 0:
+            os.rmdir(self.workDir)
+
+    def report(self):
+        """ the job outputs merged per second and their MB per second """
+        seconds = max(self.statistics['seconds'], 1e-3)
+        return "%i files, %.1f MB in %i merges and %.1f s: %.2f files/s, %.1f MB/s" % \
+               (self.statistics['files'], self.statistics['bytes'] / 1e6, self.statistics['merges'],
+                self.statistics['seconds'], self.statistics['files'] / seconds,
+                self.statistics['bytes'] / 1e6 / seconds)
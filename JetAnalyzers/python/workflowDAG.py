@@ -0,0 +1,493 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import subprocess
+import multiprocessing
+
+################################################################################
+## workflow of command line stages with content-hash caching
+################################################################################
+## a Workflow is a DAG of Stages, each running one executable with a command
+## line, reading input files and writing output files. A stage depends on the
+## stages writing its inputs. Every stage gets a key, the hash of
+##   - the content of its executable,
+##   - its command line and the content of its config files,
+##   - the keys of the stages writing its inputs, or the content of the inputs
+##     which aren't written by any stage. Inputs larger than hashLimit (e.g.
+##     the grid ntuples) are not read, their size and modification time
+##     stand for their content; with hashLimit = None they are hashed too,
+##     in parallel.
+## The keys of the last successful runs are kept in a state file. Stages whose
+## key is unchanged and whose outputs exist are skipped, the others run as
+## soon as their inputs are ready, up to jobs at a time. Changing e.g. a fit
+## option therefore reruns the fit and what depends on it, nothing upstream,
+## and touching a (small) file without changing it reruns nothing.
+##
+## Every stage run is measured (wall and CPU time, peak memory, bytes read and
+## written) and the measurements of the last runs are kept in a report file,
+## see run(). At the end of a run the time per executable, the critical path
+## and the stages which got slower or bigger than in the previous runs are
+## printed.
+
+def contentHash(fileName):
+    """ sha1 of the content of fileName """
+    sha1 = hashlib.sha1()
+    content = open(fileName, 'rb')
+    block = content.read(1 << 20)
+    while block:
+        sha1.update(block)
+        block = content.read(1 << 20)
+    content.close()
+    return sha1.hexdigest()
+
+
+class Stage(object):
+    """
+    one command of the workflow: executable commandLine &> logFileName.
+    outputFileNames may be empty for stages writing e.g. a directory of plots.
+    configFileNames are files read by the command which no stage writes.
+    cost is what the time of the stage is expected to scale with (e.g.
+    events x algorithms), it is kept in the run report with the time taken.
+    """
+    def __init__(self, name, executable, commandLine, inputFileNames = [], outputFileNames = [],
+                 logFileName = None, configFileNames = [], cost = None):
+        self.name            = name
+        self.executable      = executable
+        self.commandLine     = commandLine
+        self.inputFileNames  = list(inputFileNames)
+        self.outputFileNames = list(outputFileNames)
+        self.logFileName     = logFileName
+        self.configFileNames = list(configFileNames)
+        self.cost            = cost
+
+    def command(self):
+        command = "%s %s" % (self.executable, self.commandLine)
+        if self.logFileName:
+            command += " > %s 2>&1" % self.logFileName
+        return command
+
+    def __repr__(self):
+        return "Stage('%s')" % self.name
+
+
+class Workflow(object):
+    """
+    the stages of a workflow, see the top of this file. The state (keys of
+    the last successful runs, hashes of the files) is kept in stateFileName,
+    the measurements of the last keepRuns runs in reportFileName (default
+    stateFileName with _report.json). Files larger than hashLimit bytes are
+    known by their size and modification time instead of their content.
+    """
+    def __init__(self, stateFileName, jobs = None, verbose = True, reportFileName = None, keepRuns = 20,
+                 hashLimit = 1 << 26):
+        self.stateFileName  = stateFileName
+        self.hashLimit      = hashLimit
+        self.reportFileName = reportFileName or os.path.splitext(stateFileName)[0] + '_report.json'
+        self.keepRuns       = keepRuns
+        self.jobs           = jobs or multiprocessing.cpu_count()
+        self.verbose        = verbose
+        self.stages        = []
+        self.state         = {'keys' : {}, 'files' : {}}
+        if os.path.exists(stateFileName):
+            stateFile = open(stateFileName)
+            self.state = json.load(stateFile)
+            stateFile.close()
+
+    def add(self, stage):
+        if stage.name in [other.name for other in self.stages]:
+            raise ValueError("Workflow already has a stage called " + stage.name)
+        self.stages.append(stage)
+        return stage
+
+    def addMerge(self, name, fileNames, outputFileName, logFileName, executable = 'hadd -f', fanIn = 8):
+        """
+        add the stages merging fileNames into outputFileName. More than fanIn
+        files are merged as a tree: groups of fanIn files are merged in
+        parallel, then the merged files, and so on. Returns the last stage.
+        """
+        (outputBase, outputExtension) = os.path.splitext(outputFileName)
+        (logBase, logExtension) = os.path.splitext(logFileName)
+        fileNames = list(fileNames)
+        level = 0
+        while len(fileNames) > fanIn:
+            mergedFileNames = []
+            for group in range(0, (len(fileNames) + fanIn - 1) // fanIn):
+                groupFileNames = fileNames[group*fanIn:(group + 1)*fanIn]
+                if len(groupFileNames) == 1:
+                    mergedFileNames.extend(groupFileNames)
+                    continue
+                suffix = '_merge%i_%i' % (level, group)
+                mergedFileName = outputBase + suffix + outputExtension
+                self.add(Stage(name + suffix, executable, '%s %s' % (mergedFileName, ' '.join(groupFileNames)),
+                               groupFileNames, [mergedFileName], logBase + suffix + logExtension))
+                mergedFileNames.append(mergedFileName)
+            fileNames = mergedFileNames
+            level += 1
+        return self.add(Stage(name, executable, '%s %s' % (outputFileName, ' '.join(fileNames)),
+                              fileNames, [outputFileName], logFileName))
+
+    ## dependencies
+    def producers(self):
+        """ map every output file to the stage writing it """
+        producers = {}
+        for stage in self.stages:
+            for fileName in stage.outputFileNames:
+                if fileName in producers:
+                    raise ValueError("%s is written by %s and %s" % (fileName, producers[fileName].name, stage.name))
+                producers[fileName] = stage
+        return producers
+
+    def dependencies(self, stage, producers):
+        return [producers[fileName] for fileName in stage.inputFileNames if fileName in producers]
+
+    def ordered(self):
+        """ the stages in an order where every stage comes after its dependencies """
+        producers = self.producers()
+        order = []
+        visiting = set()
+        def visit(stage):
+            if stage in order:
+                return
+            if stage.name in visiting:
+                raise RuntimeError("dependency cycle through stage " + stage.name)
+            visiting.add(stage.name)
+            for dependency in self.dependencies(stage, producers):
+                visit(dependency)
+            visiting.discard(stage.name)
+            order.append(stage)
+        for stage in self.stages:
+            visit(stage)
+        return order
+
+    ## keys
+    def fileHash(self, fileName):
+        """
+        sha1 of the content of fileName, cached by size and modification
+        time, so that an unchanged file is only read once. Files larger than
+        hashLimit are not read, their size and modification time are taken.
+        """
+        if not os.path.exists(fileName):
+            return 'missing'
+        info = os.stat(fileName)
+        signature = '%i:%.6f' % (info.st_size, info.st_mtime)
+        if self.hashLimit is not None and info.st_size > self.hashLimit:
+            return 'signature:' + signature
+        cached = self.state['files'].get(fileName)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        self.state['files'][fileName] = [signature, contentHash(fileName)]
+        return self.state['files'][fileName][1]
+
+    def hashFiles(self, fileNames):
+        """ fill in the content hashes of the fileNames which fileHash() would read, jobs at a time """
+        toHash = []
+        for fileName in sorted(set(fileNames)):
+            if not os.path.isfile(fileName):
+                continue
+            info = os.stat(fileName)
+            if self.hashLimit is not None and info.st_size > self.hashLimit:
+                continue
+            cached = self.state['files'].get(fileName)
+            if cached is None or cached[0] != '%i:%.6f' % (info.st_size, info.st_mtime):
+                toHash.append((fileName, '%i:%.6f' % (info.st_size, info.st_mtime)))
+        if len(toHash) < 2 or self.jobs < 2:
+            return
+        pool = multiprocessing.Pool(min(self.jobs, len(toHash)))
+        hashes = pool.map(contentHash, [fileName for (fileName, signature) in toHash])
+        pool.close()
+        pool.join()
+        for ((fileName, signature), sha1) in zip(toHash, hashes):
+            self.state['files'][fileName] = [signature, sha1]
+
+    def executableHash(self, executable):
+        """ hash of the file run by the executable, or of its name if it isn't a file """
+        program = executable.split()[0]
+        if not os.path.isabs(program):
+            for path in os.environ.get('PATH', '').split(os.pathsep):
+                if os.path.isfile(os.path.join(path, program)):
+                    program = os.path.join(path, program)
+                    break
+        if os.path.isfile(program):
+            return self.fileHash(program)
+        return program
+
+    def keys(self):
+        """ the key of every stage """
+        producers = self.producers()
+        self.hashFiles([fileName for stage in self.stages for fileName in stage.configFileNames + stage.inputFileNames
+                        if fileName not in producers])
+        keys = {}
+        for stage in self.ordered():
+            sha1 = hashlib.sha1()
+            sha1.update(self.executableHash(stage.executable).encode())
+            sha1.update(stage.executable.encode())
+            sha1.update(stage.commandLine.encode())
+            for fileName in stage.configFileNames:
+                sha1.update(self.fileHash(fileName).encode())
+            for fileName in stage.inputFileNames:
+                if fileName in producers:
+                    sha1.update(keys[producers[fileName].name].encode())
+                else:
+                    sha1.update(self.fileHash(fileName).encode())
+            keys[stage.name] = sha1.hexdigest()
+        return keys
+
+    def upToDate(self, stage, keys):
+        return self.state['keys'].get(stage.name) == keys[stage.name] and \
+               all([os.path.exists(fileName) for fileName in stage.outputFileNames])
+
+    def saveState(self):
+        stateFile = open(self.stateFileName + '.tmp', 'w')
+        json.dump(self.state, stateFile, indent = 1, sort_keys = True)
+        stateFile.close()
+        os.rename(self.stateFileName + '.tmp', self.stateFileName)
+
+    ## running
+    def log(self, message):
+        if self.verbose:
+            print("%s %s" % (time.strftime('%H:%M:%S'), message))
+            sys.stdout.flush()
+
+    def outdated(self):
+        """ the stages which are not up to date or depend on one, in the order they run """
+        producers = self.producers()
+        keys = self.keys()
+        order = self.ordered()
+        todo = [stage for stage in order if not self.upToDate(stage, keys)]
+        ## a stage is rerun when a stage it depends on is rerun
+        for stage in order:
+            if stage not in todo and any([dependency in todo for dependency in self.dependencies(stage, producers)]):
+                todo.append(stage)
+        return [stage for stage in order if stage in todo]
+
+    def run(self, dryRun = False):
+        """
+        run the stages which are not up to date, return the names of the
+        stages which failed or couldn't run because a dependency failed
+        """
+        producers = self.producers()
+        keys = self.keys()
+        order = self.ordered()
+        todo = self.outdated()
+        self.log("workflow: %i stages, %i up to date, %i to run on %i jobs"
+                 % (len(order), len(order) - len(todo), len(todo), self.jobs))
+        if dryRun:
+            for stage in todo:
+                self.log("  would run %s: %s" % (stage.name, stage.command()))
+            return []
+
+        runStart     = time.time()
+        measurements = {}
+        done    = set([stage.name for stage in order if stage not in todo])
+        failed  = []
+        running = {}
+        waiting = list(todo)
+        while len(waiting) > 0 or len(running) > 0:
+            ## start what is ready
+            for stage in list(waiting):
+                dependencies = [dependency.name for dependency in self.dependencies(stage, producers)]
+                if any([name in failed for name in dependencies]):
+                    waiting.remove(stage)
+                    failed.append(stage.name)
+                    self.log("  skipped %s, a stage it depends on failed" % stage.name)
+                elif all([name in done for name in dependencies]) and len(running) < self.jobs:
+                    waiting.remove(stage)
+                    self.log("  start   %s" % stage.name)
+                    running[stage.name] = (stage, subprocess.Popen(stage.command(), shell = True), time.time())
+            ## collect what finished, with the resources it used
+            for name in list(running):
+                (stage, job, start) = running[name]
+                (pid, status, usage) = os.wait4(job.pid, os.WNOHANG)
+                if pid == 0:
+                    continue
+                if os.WIFSIGNALED(status):
+                    job.returncode = -os.WTERMSIG(status)
+                else:
+                    job.returncode = os.WEXITSTATUS(status)
+                measurements[name] = self.measure(stage, job.returncode, start, usage)
+                del running[name]
+                if job.returncode == 0:
+                    done.add(name)
+                    self.state['keys'][name] = keys[name]
+                    self.saveState()
+                    self.log("  done    %s (%.0f s)" % (name, time.time() - start))
+                else:
+                    failed.append(name)
+                    self.state['keys'].pop(name, None)
+                    self.saveState()
+                    self.log("  FAILED  %s (exit code %i), see %s" % (name, job.returncode, stage.logFileName))
+            if len(running) > 0:
+                time.sleep(0.2)
+        self.saveState()
+        self.log("workflow: %i stages run, %i failed" % (len(todo) - len(failed), len(failed)))
+        if len(measurements) > 0:
+            self.report(measurements, failed, runStart)
+        return failed
+
+    ## run report
+    def measure(self, stage, returnCode, start, usage):
+        """
+        the measurements of a stage run: usage is the resource usage of its
+        process, including the processes it started
+        """
+        def size(fileNames):
+            return sum([os.path.getsize(fileName) for fileName in fileNames if os.path.isfile(fileName)])
+        return {
+            'executable'     : os.path.basename(stage.executable.split()[0]),
+            'exitCode'       : returnCode,
+            'cost'           : stage.cost,
+            'start'          : start,
+            'seconds'        : time.time() - start,
+            'cpuSeconds'     : usage.ru_utime + usage.ru_stime,
+            'maxRSS'         : usage.ru_maxrss * 1024,   # kB on Linux
+            'diskReadBytes'  : usage.ru_inblock * 512,
+            'diskWriteBytes' : usage.ru_oublock * 512,
+            'inputBytes'     : size(stage.inputFileNames),
+            'outputBytes'    : size(stage.outputFileNames)
+        }
+
+    def criticalPath(self, measurements):
+        """
+        the stages of the run measured which took longest one after the other,
+        and their wall time. Stages which didn't run take no time.
+        """
+        producers = self.producers()
+        finish = {}
+        previous = {}
+        for stage in self.ordered():
+            dependencies = self.dependencies(stage, producers)
+            latest = None
+            for dependency in dependencies:
+                if latest is None or finish[dependency.name] > finish[latest]:
+                    latest = dependency.name
+            finish[stage.name] = measurements.get(stage.name, {}).get('seconds', 0.)
+            if latest is not None:
+                finish[stage.name] += finish[latest]
+            previous[stage.name] = latest
+        last = max(finish, key = lambda name: finish[name])
+        seconds = finish[last]
+        path = []
+        while last is not None:
+            if last in measurements:
+                path.insert(0, last)
+            last = previous[last]
+        return (path, seconds)
+
+    def rates(self):
+        """
+        the seconds per unit of cost of every executable, from the last run
+        of the report in which it ran with a cost
+        """
+        rates = {}
+        for run in reversed(self.loadReport()['runs']):
+            totals = {}
+            for measurement in run['stages'].values():
+                if measurement.get('cost') and measurement['exitCode'] == 0:
+                    total = totals.setdefault(measurement['executable'], [0., 0.])
+                    total[0] += measurement['seconds']
+                    total[1] += measurement['cost']
+            for executable in totals:
+                if executable not in rates:
+                    rates[executable] = totals[executable][0] / totals[executable][1]
+        return rates
+
+    def loadReport(self):
+        if not os.path.exists(self.reportFileName):
+            return {'runs' : []}
+        reportFile = open(self.reportFileName)
+        report = json.load(reportFile)
+        reportFile.close()
+        return report
+
+    def report(self, measurements, failed, runStart):
+        """
+        add the measurements of this run to the report file, and print the
+        time per executable, the critical path and the stages which got
+        slower or bigger than when they last ran
+        """
+        report = self.loadReport()
+        previousRuns = report['runs']
+        (path, pathSeconds) = self.criticalPath(measurements)
+        run = {
+            'start'               : runStart,
+            'seconds'             : time.time() - runStart,
+            'jobs'                : self.jobs,
+            'failed'              : failed,
+            'criticalPath'        : path,
+            'criticalPathSeconds' : pathSeconds,
+            'stages'              : measurements
+        }
+        report['runs'] = (previousRuns + [run])[-self.keepRuns:]
+        reportFile = open(self.reportFileName + '.tmp', 'w')
+        json.dump(report, reportFile, indent = 1, sort_keys = True)
+        reportFile.close()
+        os.rename(self.reportFileName + '.tmp', self.reportFileName)
+
+        self.log("workflow report (%s):" % self.reportFileName)
+        self.log("  %.0f s wall, %.0f s CPU on %i jobs" % (run['seconds'],
+                 sum([measurement['cpuSeconds'] for measurement in measurements.values()]), self.jobs))
+        executables = {}
+        for measurement in measurements.values():
+            total = executables.setdefault(measurement['executable'], {'stages' : 0, 'seconds' : 0., 'cpuSeconds' : 0., 'maxRSS' : 0,
+                                                                       'diskReadBytes' : 0, 'diskWriteBytes' : 0})
+            total['stages'] += 1
+            total['maxRSS'] = max(total['maxRSS'], measurement['maxRSS'])
+            for key in ('seconds', 'cpuSeconds', 'diskReadBytes', 'diskWriteBytes'):
+                total[key] += measurement[key]
+        self.log("  %-32s %6s %9s %9s %9s %9s %9s" % ('executable', 'stages', 'wall [s]', 'CPU [s]', 'RSS [MB]', 'read [MB]', 'wrote [MB]'))
+        for executable in sorted(executables, key = lambda executable: -executables[executable]['seconds']):
+            total = executables[executable]
+            self.log("  %-32s %6i %9.1f %9.1f %9.1f %9.1f %9.1f" % (executable, total['stages'], total['seconds'], total['cpuSeconds'],
+                     total['maxRSS'] / 1e6, total['diskReadBytes'] / 1e6, total['diskWriteBytes'] / 1e6))
+        self.log("  critical path (%.0f s): %s" % (pathSeconds, " -> ".join(path)))
+
+        ## compare with the last run of every stage which succeeded
+        for name in sorted(measurements):
+            measurement = measurements[name]
+            if measurement['exitCode'] != 0:
+                continue
+            for previousRun in reversed(previousRuns):
+                previous = previousRun['stages'].get(name)
+                if previous is None or previous['exitCode'] != 0:
+                    continue
+                if measurement['seconds'] > 1.5*previous['seconds'] and measurement['seconds'] - previous['seconds'] > 10.:
+                    self.log("  %s got slower: %.0f s -> %.0f s" % (name, previous['seconds'], measurement['seconds']))
+                if measurement['maxRSS'] > 1.2*previous['maxRSS'] and measurement['maxRSS'] - previous['maxRSS'] > 100e6:
+                    self.log("  %s needs more memory: %.0f MB -> %.0f MB" % (name, previous['maxRSS'] / 1e6, measurement['maxRSS'] / 1e6))
+                break
+
+    def clean(self):
+        """ delete all outputs and forget the state """
+        for stage in self.stages:
+            for fileName in stage.outputFileNames:
+                if os.path.exists(fileName):
+                    os.remove(fileName)
+        if os.path.exists(self.stateFileName):
+            os.remove(self.stateFileName)
+        self.state = {'keys' : {}, 'files' : {}}
+
+    def writeMakefile(self, makeFileName):
+        """
+        write the stages as a Makefile, for running with make where the
+        workflow can't run in-process. make only compares modification times.
+        """
+        targets = {}
+        for stage in self.stages:
+            targets[stage.name] = stage.outputFileNames or [stage.name]
+        makeFile = open(makeFileName, "w")
+        makeFile.write("\n")
+        makeFile.write("all: %s\n" % " ".join([target for stage in self.stages for target in targets[stage.name]]))
+        makeFile.write("\techo 'Finished running workflow.'\n")
+        makeFile.write("\n")
+        for stage in self.ordered():
+            makeFile.write("%s: %s\n" % (" ".join(targets[stage.name]), " ".join(stage.inputFileNames)))
+            makeFile.write("\t%s %s &> %s\n" % (stage.executable, stage.commandLine, stage.logFileName))
+        makeFile.write("\n")
+        makeFile.write(".PHONY: clean %s\n" % " ".join([stage.name for stage in self.stages if not stage.outputFileNames]))
+        makeFile.write("clean:\n")
+        makeFile.write("\trm -f %s\n" % " ".join([fileName for stage in self.stages for fileName in stage.outputFileNames]))
+        makeFile.write("\techo 'Finished deleting old files.'\n")
+        makeFile.write("\n")
+        makeFile.close()
@@ -0,0 +1,499 @@
+import os
+import argparse
+
+from JetMETAnalysis.JetAnalyzers.algSpec import parseAlgorithm
+from JetMETAnalysis.JetAnalyzers.workflowDAG import Stage, Workflow
+from JetMETAnalysis.JetAnalyzers.ntupleCatalogue import NtupleCatalogue
+
+################################################################################
+## jet response workflows described by a spec
+################################################################################
+## a spec is a dict with the samples, algorithms, binning and options of a
+## workflow and a list of its stages, see test/runJRAtauWorkflow.py.
+## runSpec() expands it into a Workflow (python/workflowDAG.py) and runs it.
+## With --dry-run it prints the stages which would run and estimates their
+## cost from the events, algorithms and bins, and the histograms they book.
+## The events of a sample are extrapolated from the sizes of its files and
+## the events counted in estimateFiles of them; --count-events counts them
+## in all files (the counts are kept in the ntuple catalogue).
+##
+## Every stage of the spec is a dict with
+##   name         the workflow stages are <name>_<sample>[_part<i>[_shard<j>]]
+##   executable   in $CMSSW_BASE/bin/$SCRAM_ARCH unless it is a path
+##   inputs       the stages it reads, 'ntuples' for the ntuples of the sample
+##   output, log  file names in outputFilePath, %(sample)s is the sample
+##   config       file name of a jet_response_analyzer_x config with the binning
+##   commandLine  with %(inputs)s (%(input0)s, %(input1)s, ...), %(ntuples)s,
+##                %(output)s, %(config)s, %(algs)s and the options of the spec
+##   algs         'plain' or 'withL2L3' (every algorithm and its l2l3 version)
+##   algFormat    how every algorithm is written in %(algs)s, default '%s'
+##   split        one task per group of algorithmsPerTask algorithms, merged
+##   shards       every task split into numberOfShards event ranges, merged
+##   cost         what the time scales with: 'events' (x algorithms),
+##                'histograms' (x algorithms) or 'algorithms'; the cost of
+##                plot stages is the number of plots
+## Plot stages have plots, the commandLine of one plot with %(algs)s,
+## %(refVariable)s and %(plotPath)s, and plotList instead of output and log:
+## the plots for every algorithm and refVariable are made from plot lists.
+
+executable_shell = '/bin/csh'
+
+estimateFiles = 20
+
+def vstring(values):
+    return " ".join(values)
+
+def vdouble(values):
+    return " ".join([ "%2.1f" % value for value in values ])
+
+
+def responseHistograms(ptBinning, etaBinning, nbinspt = 50, nbinseta = 25, nbinsrelrsp = 50):
+    """
+    the (histograms, bins) jet_response_analyzer_x books per algorithm with
+    the options used by the workflows (relative response in bins of reference
+    pT, eta and both, no flavors)
+    """
+    npt = len(ptBinning) - 1
+    neta = len(etaBinning) - 1
+    nbinspthat = int(ptBinning[-1] / 10.)
+    ## RefPt, JetPt, pThat, RelRsp, 4 eta regions of RefPt, JetPt and RelRsp
+    histograms = npt*16 + neta*2 + neta*npt*4
+    bins = npt*(5*nbinspt + 5*3*nbinspt + nbinspthat + 5*nbinsrelrsp) + \
+           neta*(nbinseta + nbinsrelrsp) + \
+           neta*npt*(nbinspt + 3*nbinspt + nbinspthat + nbinsrelrsp)
+    return (histograms, bins)
+
+def histogramMemory(histograms, bins):
+    """ bytes of TH1Fs with Sumw2 (float content, double errors, ~1 kB per object) """
+    return histograms*(1024 + 2*12) + bins*12
+
+
+def buildConfigFile_hadd(haddCommand, shellFileName_full, inputFileNames, outputFileName_full):
+
+    """Build shell script to run 'hadd' command in order to add all histograms
+       in files specified by inputFileNames argument and write the sum to file outputFileName.
+       The files are listed in a manifest and merged by jraMerge.py in a tree of hadds
+       of at most 8 files each, in parallel"""
+
+    manifestFileName_full = shellFileName_full.replace('.csh', '.txt')
+    manifestFile = open(manifestFileName_full, "w")
+    for inputFileName in inputFileNames:
+        manifestFile.write("%s\n" % inputFileName)
+    manifestFile.close()
+
+    shellFile = open(shellFileName_full, "w")
+    shellFile.write("#!/bin/csh -f\n")
+    shellFile.write("\n")
+    # CV: delete output file in case it exists
+    shellFile.write("rm -f %s %s.merge.json\n" % (outputFileName_full, outputFileName_full))
+    shellFile.write("\n")
+    shellFile.write("jraMerge.py %s %s --fan-in 8 --hadd '%s'\n" % (outputFileName_full, manifestFileName_full, haddCommand))
+    shellFile.close()
+
+    logFileName_full = shellFileName_full.replace('.csh', '.log')
+
+    retVal = {}
+    retVal['shellFileName']  = shellFileName_full
+    retVal['outputFileName'] = outputFileName_full
+    retVal['logFileName']    = logFileName_full
+
+    return retVal
+
+
+class WorkflowBuilder(object):
+    """ expands a spec into the stages of a Workflow, see the top of this file """
+    def __init__(self, spec, jobs = None, hashLimit = 1 << 26):
+        self.spec       = spec
+        self.outputPath = spec['outputFilePath']
+        self.algorithms = spec['algorithms']
+        # fail here rather than in the middle of the workflow on a misspelled algorithm
+        for algorithm in self.algorithms:
+            parseAlgorithm(algorithm)
+        perTask = spec['algorithmsPerTask']
+        self.algorithmGroups = [ self.algorithms[i:i + perTask] for i in range(0, len(self.algorithms), perTask) ]
+        self.execDir = "%s/bin/%s/" % (os.environ['CMSSW_BASE'], os.environ['SCRAM_ARCH'])
+        for path in [ self.outputPath, os.path.join(self.outputPath, "plots") ]:
+            if not os.path.exists(path):
+                os.mkdir(path)
+        self.workflow = Workflow(os.path.join(self.outputPath, "workflowState_%s_%s.json" % (spec['name'], spec['version'])),
+                                 jobs = jobs, hashLimit = hashLimit)
+        self.ntuples   = {}
+        self.estimates = {}
+
+    def path(self, fileName, sample, **values):
+        values['sample'] = sample
+        return os.path.join(self.outputPath, fileName % values)
+
+    def executable(self, executable):
+        if os.path.isabs(executable) or ' ' in executable:
+            return executable
+        return self.execDir + executable
+
+    def algs(self, stageSpec, algorithmGroup):
+        """ the algorithms a stage processes for algorithmGroup """
+        if stageSpec.get('algs', 'plain') == 'withL2L3':
+            return [ parseAlgorithm(algorithm).withCorrection(suffix).name
+                     for algorithm in algorithmGroup for suffix in [ "", "l2l3" ] ]
+        return list(algorithmGroup)
+
+    ## ntuples
+    def findNtuples(self, catalogue, sample):
+        """ the ntuples of sample, listed in a manifest or merged with hadd (mergeNtuples) """
+        spec = self.spec
+        fileNames, droppedFileNames = \
+          catalogue.deduplicated(sample, spec['checkNtuples'], [ "%s/t" % algorithm for algorithm in self.algorithms ])
+        print("sample = %s: found %i input files." % (sample, len(fileNames)))
+        droppedReportFileName = self.path("ntupleJRAtau_%(sample)s_dropped.txt", sample)
+        droppedReport = open(droppedReportFileName, "w")
+        for droppedFileName, reason in droppedFileNames:
+            droppedReport.write("%s: %s\n" % (droppedFileName or "-", reason))
+        droppedReport.close()
+        if len(droppedFileNames) > 0:
+            print("sample = %s: dropped %i files, see %s." % (sample, len(droppedFileNames), droppedReportFileName))
+
+        ntuples = { 'fileNames' : fileNames, 'catalogue' : catalogue }
+        if spec['mergeNtuples']:
+            haddOutputFileName = os.path.join(spec['inputFilePath'], 'ntupleJRAtau_%s_all.root' % sample)
+            retVal_hadd = buildConfigFile_hadd(spec['hadd'], self.path('harvestJRAtauNtuples_%(sample)s.csh', sample),
+                                               fileNames, haddOutputFileName)
+            if len(fileNames) > 0:
+                self.workflow.add(Stage("hadd_%s" % sample, executable_shell, retVal_hadd['shellFileName'],
+                                        fileNames, [ haddOutputFileName ], retVal_hadd['logFileName'],
+                                        configFileNames = [ retVal_hadd['shellFileName'] ]))
+            ntuples['inputFileNames'] = [ haddOutputFileName ]
+            ntuples['input']          = haddOutputFileName
+        else:
+            manifestFileName = self.path('ntupleJRAtau_%(sample)s.txt', sample)
+            manifestFile = open(manifestFileName, "w")
+            for fileName in fileNames:
+                manifestFile.write("%s\n" % fileName)
+            manifestFile.close()
+            ntuples['inputFileNames'] = fileNames
+            ntuples['input']          = manifestFileName
+        self.ntuples[sample] = ntuples
+
+    def writeAnalyzerConfig(self, configFileName):
+        configFile = open(configFileName, "w")
+        for (key, value) in self.spec['analyzerConfig']:
+            configFile.write("%s = %s\n" % (key, value))
+        configFile.write("binspt = %s\n" % vdouble(self.spec['ptBinning']))
+        configFile.write("binseta = %s\n" % vdouble(self.spec['etaBinning']))
+        configFile.close()
+
+    ## stages
+    def addStage(self, stageSpec, sample, outputs):
+        """ add the stages of stageSpec for sample, outputs maps stage names to (output, part outputs) """
+        spec = self.spec
+        name = "%s_%s" % (stageSpec['name'], sample)
+        inputFileNames = []
+        upstreamParts = None
+        for inputName in stageSpec['inputs']:
+            if inputName == 'ntuples':
+                inputFileNames.extend(self.ntuples[sample]['inputFileNames'])
+            else:
+                inputFileNames.append(outputs[inputName][0])
+                if len(stageSpec['inputs']) == 1:
+                    upstreamParts = outputs[inputName][1]
+        outputFileName = self.path(stageSpec['output'], sample)
+        logFileName = self.path(stageSpec['log'], sample)
+        configFileNames = []
+        values = dict(spec['options'])
+        values['ntuples'] = self.ntuples[sample]['input']
+        if 'config' in stageSpec:
+            values['config'] = self.path(stageSpec['config'], sample)
+            self.writeAnalyzerConfig(values['config'])
+            configFileNames.append(values['config'])
+
+        def make_commandLine(inputFileNames, outputFileName, algs):
+            values['inputs'] = vstring(inputFileNames)
+            for index, inputFileName in enumerate(inputFileNames):
+                values['input%i' % index] = inputFileName
+            values['output'] = outputFileName
+            values['algs'] = vstring([ stageSpec.get('algFormat', '%s') % alg for alg in algs ])
+            return stageSpec['commandLine'] % values
+
+        def add(stageName, inputFileNames, outputFileName, logFileName, algs, shard = None):
+            commandLine = make_commandLine(inputFileNames, outputFileName, algs)
+            if shard is not None:
+                commandLine += ' -shard %i -nshards %i' % (shard, spec['numberOfShards'])
+            stage = self.workflow.add(Stage(stageName, self.executable(stageSpec['executable']), commandLine,
+                                            inputFileNames, [ outputFileName ], logFileName, configFileNames))
+            self.estimate(stage, stageSpec, sample, algs, shard is not None)
+
+        groups = [ self.algorithms ]
+        if stageSpec.get('split') and len(self.algorithmGroups) > 1:
+            groups = self.algorithmGroups
+        shards = 1
+        if stageSpec.get('shards'):
+            shards = spec['numberOfShards']
+        partOutputFileNames = []
+        for part, algorithmGroup in enumerate(groups):
+            partName = name
+            partInputFileNames = inputFileNames
+            partOutputFileName = outputFileName
+            partLogFileName = logFileName
+            if len(groups) > 1:
+                partName += "_part%i" % part
+                # a part reads the part of the upstream stage with the same algorithms, if there is one
+                if upstreamParts is not None:
+                    partInputFileNames = [ upstreamParts[part] ]
+                partOutputFileName = outputFileName.replace(".root", "_part%i.root" % part)
+                partLogFileName = logFileName.replace(".log", "_part%i.log" % part)
+            partOutputFileNames.append(partOutputFileName)
+            algs = self.algs(stageSpec, algorithmGroup)
+            if shards < 2:
+                add(partName, partInputFileNames, partOutputFileName, partLogFileName, algs)
+                continue
+            for shard in range(shards):
+                add("%s_shard%i" % (partName, shard), partInputFileNames,
+                    partOutputFileName.replace(".root", "_shard%i.root" % shard),
+                    partLogFileName.replace(".log", "_shard%i.log" % shard), algs, shard)
+            self.workflow.addMerge(partName,
+                                   [ partOutputFileName.replace(".root", "_shard%i.root" % shard) for shard in range(shards) ],
+                                   partOutputFileName, partLogFileName.replace(".log", "_hadd.log"),
+                                   spec['hadd'], spec['mergeFanIn'])
+        if len(groups) > 1:
+            self.workflow.addMerge(name, partOutputFileNames, outputFileName, logFileName.replace(".log", "_hadd.log"),
+                                   spec['hadd'], spec['mergeFanIn'])
+            outputs[stageSpec['name']] = (outputFileName, partOutputFileNames)
+        else:
+            outputs[stageSpec['name']] = (outputFileName, None)
+
+    def addPlotStage(self, stageSpec, sample, outputs):
+        """
+        add the stages making the plots of stageSpec for every algorithm and
+        refVariable from plotBatches plot lists
+        """
+        spec = self.spec
+        inputFileNames = [ outputs[inputName][0] for inputName in stageSpec['inputs'] ]
+        plots = []
+        for algorithm in self.algorithms:
+            plotPath = os.path.join(self.outputPath, "plots", algorithm)
+            if not os.path.exists(plotPath):
+                os.mkdir(plotPath)
+            for refVariable in spec['refVariables']:
+                values = dict(spec['options'])
+                values.update({ 'inputs'      : vstring(inputFileNames),
+                                'algs'        : vstring(self.algs(stageSpec, [ algorithm ])),
+                                'refVariable' : refVariable,
+                                'plotPath'    : plotPath })
+                plots.append(stageSpec['plots'] % values)
+        batches = spec['plotBatches']
+        for batch in range(batches):
+            plots_batch = plots[batch::batches]
+            if len(plots_batch) == 0:
+                continue
+            suffix = ""
+            if batches > 1:
+                suffix = "_batch%i" % batch
+            plotListFileName = self.path(stageSpec['plotList'], sample, batch = suffix)
+            plotListFile = open(plotListFileName, "w")
+            for plot in plots_batch:
+                plotListFile.write("%s\n" % plot)
+            plotListFile.close()
+            # the plots go to a directory per algorithm, hence these stages have no output files
+            stage = self.workflow.add(Stage("%s_%s%s" % (stageSpec['name'], sample, suffix),
+                                            self.executable(stageSpec['executable']),
+                                            '-plotlist %s' % plotListFileName, inputFileNames, [],
+                                            plotListFileName.replace('.txt', '.log'),
+                                            configFileNames = [ plotListFileName ]))
+            self.estimates[stage.name] = { 'cost' : 'plots', 'group' : "%s_%s" % (stageSpec['name'], sample),
+                                           'plots' : len(plots_batch) }
+
+    def build(self):
+        spec = self.spec
+        # the ntuples in inputFilePath are catalogued in ntupleCatalogue.db, the directory is only
+        # listed again when it changed, and then only the new files are parsed
+        catalogue = NtupleCatalogue(os.path.join(self.outputPath, "ntupleCatalogue.db"),
+                                    spec['inputFilePath'], spec['ntupleFileRegex'])
+        (numAdded, numRemoved) = catalogue.refresh()
+        if numAdded > 0 or numRemoved > 0:
+            print("ntuple catalogue: %i files added, %i removed." % (numAdded, numRemoved))
+        for sample in spec['samples']:
+            self.findNtuples(catalogue, sample)
+            outputs = {}
+            for stageSpec in spec['stages']:
+                if 'plots' in stageSpec:
+                    self.addPlotStage(stageSpec, sample, outputs)
+                else:
+                    self.addStage(stageSpec, sample, outputs)
+        return self.workflow
+
+    ## cost estimate
+    def events(self, sample, count = 0):
+        """
+        the events in the ntuples of sample and how they are known: counted,
+        extrapolated from the size of the files counted, or None if no file
+        was counted. Files not counted yet, spread over the sample, are
+        counted until count of them are, all with count = None (needs PyROOT,
+        the counts are kept in the catalogue).
+        """
+        ntuples = self.ntuples[sample]
+        catalogue = ntuples['catalogue']
+        fileNames = set(ntuples['fileNames'])
+        records = [ record for record in catalogue.records(sample) if catalogue.path(record['name']) in fileNames ]
+        uncounted = sorted([ record['name'] for record in records if record['events'] is None ])
+        if count is not None:
+            missing = max(count - (len(records) - len(uncounted)), 0)
+            if missing < len(uncounted):
+                # every n-th file, not only those of the first grid jobs
+                uncounted = [ uncounted[i*len(uncounted)//missing] for i in range(missing) ]
+        if len(uncounted) > 0:
+            try:
+                catalogue.countEvents(sample, self.algorithms[0] + '/t', uncounted)
+                records = [ record for record in catalogue.records(sample) if catalogue.path(record['name']) in fileNames ]
+            except ImportError:
+                pass
+        counted = [ record for record in records if record['events'] is not None ]
+        events = None
+        if len(records) > 0 and len(counted) == len(records):
+            events = (sum([ record['events'] for record in counted ]), 'counted')
+        elif len(counted) > 0 and sum([ record['size'] for record in counted ]) > 0:
+            perByte = float(sum([ record['events'] for record in counted ])) / sum([ record['size'] for record in counted ])
+            events = (int(perByte*sum([ record['size'] for record in records ])),
+                      'extrapolated from %i of %i files' % (len(counted), len(records)))
+        return events
+
+    def estimate(self, stage, stageSpec, sample, algs, sharded):
+        """ what the cost of stage scales with and, for stages filling histograms, the histograms it books """
+        spec = self.spec
+        (histograms, bins) = responseHistograms(spec['ptBinning'], spec['etaBinning'])
+        estimate = { 'cost' : stageSpec.get('cost'), 'group' : "%s_%s" % (stageSpec['name'], sample),
+                     'sample' : sample, 'algs' : len(algs), 'shards' : 1 }
+        if sharded:
+            estimate['shards'] = spec['numberOfShards']
+        if estimate['cost'] == 'histograms':
+            estimate['histograms'] = histograms*len(algs)
+        if 'config' in stageSpec:
+            estimate['booked'] = histograms*len(algs)
+            estimate['memory'] = histogramMemory(histograms*len(algs), bins*len(algs))
+        self.estimates[stage.name] = estimate
+
+    def assignCosts(self, count = 0):
+        """
+        set the cost of every stage, kept in the run report to estimate the
+        time of the next runs. The events of up to count ntuples of every
+        sample (all with count = None) are counted, see events().
+        """
+        events = {}
+        for sample in self.spec['samples']:
+            events[sample] = self.events(sample, count)
+        for stage in self.workflow.stages:
+            estimate = self.estimates.get(stage.name, {})
+            if estimate.get('cost') == 'events':
+                if events[estimate['sample']] is not None:
+                    stage.cost = events[estimate['sample']][0]*estimate['algs'] / estimate['shards']
+                estimate['units'] = 'events x algs'
+            elif estimate.get('cost') == 'histograms':
+                stage.cost = estimate['histograms']
+                estimate['units'] = 'histograms'
+            elif estimate.get('cost') == 'algorithms':
+                stage.cost = estimate['algs']
+                estimate['units'] = 'algs'
+            elif estimate.get('cost') == 'plots':
+                stage.cost = estimate['plots']
+                estimate['units'] = 'plots'
+        return events
+
+    def printEstimate(self, stages, count = estimateFiles):
+        """
+        print the estimated cost of stages, counting the events of up to
+        count ntuples of every sample (all with count = None) if needed. The
+        tasks of a stage of the spec are summed up in one line, with the
+        histograms and memory of the largest task.
+        """
+        rates = self.workflow.rates()
+        allEvents = self.assignCosts(count)
+        print("estimated cost of the %i stages to run:" % len(stages))
+        for sample in self.spec['samples']:
+            events = allEvents[sample]
+            if events is None:
+                print("  sample = %s: events unknown, count them with PyROOT for the estimate" % sample)
+            else:
+                print("  sample = %s: %i events (%s)" % (sample, events[0], events[1]))
+        groups = []
+        rows = {}
+        for stage in stages:
+            estimate = self.estimates.get(stage.name, {})
+            # the hadds merging parts and shards are not estimated, they're listed in one line
+            group = estimate.get('group', 'hadd')
+            if group not in rows:
+                groups.append(group)
+                rows[group] = { 'tasks' : 0, 'cost' : None, 'units' : estimate.get('units'), 'seconds' : 0.,
+                                'unknown' : 0, 'booked' : 0, 'memory' : 0 }
+            row = rows[group]
+            row['tasks'] += 1
+            if stage.cost is not None:
+                row['cost'] = (row['cost'] or 0) + stage.cost
+                executable = os.path.basename(stage.executable.split()[0])
+                if executable in rates:
+                    row['seconds'] += stage.cost*rates[executable]
+                else:
+                    row['unknown'] += 1
+            if 'booked' in estimate:
+                row['booked'] = max(row['booked'], estimate['booked'])
+                row['memory'] = max(row['memory'], estimate['memory'])
+        print("  %-36s %6s %-28s %10s %10s %10s" % ("stage", "tasks", "cost", "time [s]", "histograms", "RSS [MB]"))
+        totalSeconds = 0.
+        unknown = 0
+        maxMemory = 0
+        for group in groups:
+            row = rows[group]
+            units = "-"
+            seconds = "-"
+            if row['cost'] is None and row['units'] is not None:
+                units = "? %s" % row['units']
+                unknown += row['tasks']
+            if row['cost'] is not None:
+                units = "%.3g %s" % (row['cost'], row['units'])
+                if row['unknown'] == 0:
+                    seconds = "%.0f" % row['seconds']
+                totalSeconds += row['seconds']
+                unknown += row['unknown']
+            histograms = "-"
+            memory = "-"
+            if row['booked'] > 0:
+                histograms = "%i" % row['booked']
+                memory = "%.0f" % (row['memory'] / 1e6)
+                maxMemory = max(maxMemory, row['memory'])
+            print("  %-36s %6i %-28s %10s %10s %10s" % (group, row['tasks'], units, seconds, histograms, memory))
+        print("  total: %.0f s on one core%s, at most %.0f MB of histograms in one task" %
+              (totalSeconds, (" + %i tasks not estimated" % unknown) if unknown > 0 else "", maxMemory / 1e6))
+
+
+def runSpec(spec, argv = None):
+    """ build the workflow of spec and run, clean or write it as Makefile as the command line says """
+    parser = argparse.ArgumentParser(description = "Run the %s workflow, rerunning only the stages whose inputs changed." % spec['name'])
+    parser.add_argument('--jobs', '-j', type = int, default = None, help = "stages run in parallel (default: number of cores)")
+    parser.add_argument('--dry-run', dest = 'dryRun', action = 'store_true',
+                        help = "print the stages which would run and estimate their cost, from the events "
+                               "counted in %i ntuples of every sample (with PyROOT, kept in the catalogue)" % estimateFiles)
+    parser.add_argument('--count-events', dest = 'countEvents', action = 'store_true',
+                        help = "with --dry-run, count the events in all ntuples instead of extrapolating them")
+    parser.add_argument('--clean', action = 'store_true', help = "delete the outputs and the workflow state")
+    parser.add_argument('--hash-inputs', dest = 'hashInputs', action = 'store_true',
+                        help = "tell changed inputs by their content, also of the large ones such as the ntuples "
+                               "(read in parallel), instead of by their size and modification time")
+    parser.add_argument('--makefile', action = 'store_true', help = "write a Makefile for 'make -j' instead of running")
+    options = parser.parse_args(argv)
+
+    builder = WorkflowBuilder(spec, jobs = options.jobs, hashLimit = None if options.hashInputs else 1 << 26)
+    workflow = builder.build()
+    if options.clean:
+        workflow.clean()
+        print("Finished deleting old files.")
+    elif options.makefile:
+        makeFileName = "Makefile_%s_%s" % (spec['name'], spec['version'])
+        workflow.writeMakefile(makeFileName)
+        print("Finished building Makefile. Now execute 'make -j 8 -f %s'." % makeFileName)
+    elif options.dryRun:
+        workflow.run(dryRun = True)
+        builder.printEstimate(workflow.outdated(), None if options.countEvents else estimateFiles)
+    else:
+        builder.assignCosts()
+        failed = workflow.run()
+        if len(failed) > 0:
+            print("%s Workflow failed in: %s" % (spec['name'], vstring(failed)))
+            return 1
+        print("Finished running %s Workflow." % spec['name'])
+    return 0
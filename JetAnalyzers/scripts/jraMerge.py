@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""
+jraMerge.py merges ROOT files (job outputs) with hadd in a tree of bounded
+fan-in on several cores, see python/treeMerge.py. The inputs are files,
+manifests (*.txt, one file per line), directories or quoted glob patterns.
+Every run merges all inputs again, like hadd -f. With --incremental it goes
+on from the previous run and only merges the new inputs with the previous
+output (all again if an input changed), with --watch it keeps looking for
+new job outputs matching the inputs and merges them while the other jobs
+are still running. Examples:
+  jraMerge.py JRA.root 'JRA_*.root'
+  jraMerge.py JRA.root 'JRA_*.root' --incremental
+  jraMerge.py JRA.root outputs/ --fan-in 16 --jobs 8
+  jraMerge.py JRA.root 'crab/res/*.root' --watch --expected 500
+"""
+import os
+import sys
+import glob
+import time
+import argparse
+
+from JetMETAnalysis.JetAnalyzers.treeMerge import TreeMerger
+
+
+def findInputs(patterns, outputFileName):
+    """ the ROOT files given by patterns (files, manifests, directories, globs) """
+    fileNames = []
+    for pattern in patterns:
+        if pattern.endswith('.txt') and os.path.isfile(pattern):
+            manifest = open(pattern)
+            fileNames.extend([line.strip() for line in manifest if line.strip() and not line.startswith('#')])
+            manifest.close()
+        elif os.path.isdir(pattern):
+            fileNames.extend(sorted(glob.glob(os.path.join(pattern, '*.root'))))
+        else:
+            fileNames.extend(sorted(glob.glob(pattern)))
+    output = os.path.abspath(outputFileName)
+    return [fileName for fileName in fileNames
+            if os.path.abspath(fileName) != output and not os.path.abspath(fileName).startswith(output + '.merge')]
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Merge ROOT files with hadd in a tree of bounded fan-in.")
+    parser.add_argument('output', help = "merged file")
+    parser.add_argument('inputs', nargs = '+', help = "files, manifests (*.txt), directories or quoted glob patterns")
+    parser.add_argument('--fan-in', '-k', dest = 'fanIn', type = int, default = 8, help = "files per hadd")
+    parser.add_argument('--jobs', '-j', type = int, default = None, help = "hadds in parallel (default: number of cores)")
+    parser.add_argument('--hadd', default = 'hadd -f', help = "merge command, output and inputs are appended")
+    parser.add_argument('--incremental', action = 'store_true',
+                        help = "only merge the inputs which are new since the last run into the output")
+    parser.add_argument('--watch', action = 'store_true', help = "keep merging new inputs as they arrive (incremental)")
+    parser.add_argument('--interval', type = float, default = 60., help = "seconds between looking for new inputs")
+    parser.add_argument('--expected', type = int, default = None, help = "with --watch, stop after this many inputs")
+    parser.add_argument('--idle', type = float, default = 3600., help = "with --watch, stop after this many seconds without new inputs")
+    parser.add_argument('--quiet', '-q', action = 'store_true', help = "only print the summary")
+    args = parser.parse_args(argv)
+
+    merger = TreeMerger(args.output, args.fanIn, args.jobs, args.hadd, verbose = not args.quiet,
+                        incremental = args.incremental or args.watch)
+    if not args.watch:
+        fileNames = findInputs(args.inputs, args.output)
+        if len(fileNames) == 0:
+            print("jraMerge: no inputs in %s" % " ".join(args.inputs))
+            return 1
+        merger.add(fileNames)
+    else:
+        ## a file is taken once its size didn't change between two looks,
+        ## so that files still being written aren't merged
+        sizes = {}
+        lastNew = time.time()
+        while True:
+            stable = []
+            for fileName in findInputs(args.inputs, args.output):
+                size = os.path.getsize(fileName)
+                if sizes.get(fileName) == size:
+                    stable.append(fileName)
+                sizes[fileName] = size
+            if merger.add(stable) > 0:
+                lastNew = time.time()
+                merger.merge()
+            merged = len(merger.known())
+            merger.log("jraMerge: %i inputs so far" % merged)
+            if args.expected is not None and merged >= args.expected:
+                break
+            if time.time() - lastNew > args.idle:
+                merger.log("jraMerge: no new inputs for %.0f s, stop watching" % args.idle)
+                break
+            time.sleep(args.interval)
+    merger.finish()
+    print("jraMerge: %s, %s" % (args.output, merger.report()))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
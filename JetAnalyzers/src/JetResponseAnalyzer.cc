@@ -14,23 +14,15 @@
 // construction/destruction
 ////////////////////////////////////////////////////////////////////////////////
 
+
 //______________________________________________________________________________
 JetResponseAnalyzer::JetResponseAnalyzer(const edm::ParameterSet& iConfig)
   : moduleLabel_            (iConfig.getParameter<std::string>            ("@module_label"))
-  , srcRef_                 (consumes<reco::CandidateView>(iConfig.getParameter<edm::InputTag>                ("srcRef")))
-  , srcJetToUncorJetMap_    (consumes<reco::CandViewMatchMap>(iConfig.getParameter<edm::InputTag>("srcJetToUncorJetMap")))
-  , srcRefToJetMap_         (consumes<reco::CandViewMatchMap>(iConfig.getParameter<edm::InputTag>     ("srcRefToJetMap")))
-  , srcRhos_                (consumes<vector<double> >(iConfig.getParameter<edm::InputTag>                   ("srcRhos")))
-  , srcRho_                 (consumes<double>(iConfig.getParameter<edm::InputTag>                             ("srcRho")))
-  , srcRhoHLT_              (consumes<double>(iConfig.getParameter<edm::InputTag>                          ("srcRhoHLT")))
+  , multipleAlgorithms_     (iConfig.exists("algorithms"))
   , srcVtx_                 (consumes<reco::VertexCollection>(iConfig.getParameter<edm::InputTag>             ("srcVtx")))
   , srcGenInfo_             (consumes<GenEventInfoProduct>(edm::InputTag("generator"))                                   )
   , srcPileupInfo_          (consumes<vector<PileupSummaryInfo> >(edm::InputTag("addPileupInfo"))                        )
-  //, srcPFCandidates_      (consumes<vector<reco::PFCandidate> >(iConfig.getParameter<edm::InputTag>("srcPFCandidates")))
-  , srcPFCandidates_        (consumes<PFCandidateView>(iConfig.getParameter<edm::InputTag>("srcPFCandidates")))
-  , srcPFCandidatesAsFwdPtr_(consumes<std::vector<edm::FwdPtr<reco::PFCandidate> > >(iConfig.getParameter<edm::InputTag>("srcPFCandidates")))
   , srcGenParticles_        (consumes<vector<reco::GenParticle> >(iConfig.getParameter<edm::InputTag>("srcGenParticles")))
-  , jecLabel_      (iConfig.getParameter<std::string>                 ("jecLabel"))
   , doComposition_ (iConfig.getParameter<bool>                   ("doComposition"))
   , doFlavor_      (iConfig.getParameter<bool>                        ("doFlavor"))
   , doJetPt_       (iConfig.getParameter<bool>                         ("doJetPt"))
@@ -42,7 +34,6 @@ JetResponseAnalyzer::JetResponseAnalyzer(const edm::ParameterSet& iConfig)
   , deltaPhiMin_(3.141)
   , deltaRPartonMax_(0.0)
   , doBalancing_(false)
-  , getFlavorFromMap_(false)
   , jetCorrector_(0)
 {
   if (iConfig.exists("deltaRMax")) {
@@ -57,26 +48,24 @@ JetResponseAnalyzer::JetResponseAnalyzer(const edm::ParameterSet& iConfig)
     throw cms::Exception("MissingParameter")<<"Set *either* deltaRMax (matching)"
 					    <<" *or* deltaPhiMin (balancing)";
   
-  if (doFlavor_&&iConfig.exists("srcRefToPartonMap")) {
-     srcRefToPartonMap_=consumes<reco::JetMatchedPartonsCollection>(iConfig.getParameter<edm::InputTag>("srcRefToPartonMap"));
+  if (doFlavor_&&iConfig.exists("deltaRPartonMax")) {
     deltaRPartonMax_  =iConfig.getParameter<double>       ("deltaRPartonMax");
-    getFlavorFromMap_=true;
   }
-  
-  isCaloJet_  = (moduleLabel_.find("calo")!=string::npos);
-  isJPTJet_   = (moduleLabel_.find("jpt") !=string::npos);
-  isPFJet_    = (moduleLabel_.find("pf")  !=string::npos || moduleLabel_.find("puppi")  !=string::npos);
-  isTrackJet_ = (moduleLabel_.find("trk") !=string::npos);
-  isTauJet_   = (moduleLabel_.find("tau") !=string::npos);
 
-  int check = isCaloJet_+isJPTJet_+isPFJet_+isTrackJet_+isTauJet_;
-  assert(check<2);
-
-  //if (isCaloJet_)  cout<<"These are CaloJets  ("<<moduleLabel_<<")"<<endl;
-  //if (isJPTJet_)   cout<<"These are JPTJets   ("<<moduleLabel_<<")"<<endl;
-  //if (isPFJet_)    cout<<"These are PFJets    ("<<moduleLabel_<<")"<<endl;
-  //if (isTrackJet_) cout<<"These are TrackJets ("<<moduleLabel_<<")"<<endl;
-  //if (isTauJet_)   cout<<"These are TauJets   ("<<moduleLabel_<<")"<<endl;
+  // one tree per entry of 'algorithms', or one tree for the module itself
+  if (multipleAlgorithms_) {
+    const vector<edm::ParameterSet> algorithms =
+      iConfig.getParameter<vector<edm::ParameterSet> >("algorithms");
+    if (algorithms.empty())
+      throw cms::Exception("Configuration")<<"'algorithms' of "<<moduleLabel_<<" is empty";
+    algs_.resize(algorithms.size());
+    for (unsigned int i=0;i<algorithms.size();i++)
+      setupAlgorithm(algs_[i],algorithms[i].getParameter<std::string>("label"),algorithms[i]);
+  }
+  else {
+    algs_.resize(1);
+    setupAlgorithm(algs_[0],moduleLabel_,iConfig);
+  }
 
   //must state that we are using the TFileService
   usesResource("TFileService");
@@ -96,6 +85,48 @@ JetResponseAnalyzer::~JetResponseAnalyzer()
 // implementation of member functions
 ////////////////////////////////////////////////////////////////////////////////
 
+//______________________________________________________________________________
+void JetResponseAnalyzer::setupAlgorithm(Algorithm& alg,
+                                         const std::string& label,
+                                         const edm::ParameterSet& iConfig)
+{
+  alg.label                  = label;
+  alg.srcRef                 = consumes<reco::CandidateView>(iConfig.getParameter<edm::InputTag>     ("srcRef"));
+  alg.srcJetToUncorJetMap    = consumes<reco::CandViewMatchMap>(iConfig.getParameter<edm::InputTag>("srcJetToUncorJetMap"));
+  alg.srcRefToJetMap         = consumes<reco::CandViewMatchMap>(iConfig.getParameter<edm::InputTag>("srcRefToJetMap"));
+  alg.srcRhos                = consumes<vector<double> >(iConfig.getParameter<edm::InputTag>        ("srcRhos"));
+  alg.srcRho                 = consumes<double>(iConfig.getParameter<edm::InputTag>                  ("srcRho"));
+  alg.srcRhoHLT              = consumes<double>(iConfig.getParameter<edm::InputTag>               ("srcRhoHLT"));
+  //alg.srcPFCandidates      = consumes<vector<reco::PFCandidate> >(iConfig.getParameter<edm::InputTag>("srcPFCandidates"));
+  alg.srcPFCandidates        = consumes<PFCandidateView>(iConfig.getParameter<edm::InputTag>("srcPFCandidates"));
+  alg.srcPFCandidatesAsFwdPtr= consumes<std::vector<edm::FwdPtr<reco::PFCandidate> > >(iConfig.getParameter<edm::InputTag>("srcPFCandidates"));
+  alg.jecLabel               = iConfig.getParameter<std::string>("jecLabel");
+  alg.getFlavorFromMap       = false;
+  alg.tree                   = 0;
+  alg.JRAEvt                 = 0;
+
+  if (doFlavor_&&iConfig.exists("srcRefToPartonMap")) {
+     alg.srcRefToPartonMap=consumes<reco::JetMatchedPartonsCollection>(iConfig.getParameter<edm::InputTag>("srcRefToPartonMap"));
+    alg.getFlavorFromMap=true;
+  }
+  
+  alg.isCaloJet  = (label.find("calo")!=string::npos);
+  alg.isJPTJet   = (label.find("jpt") !=string::npos);
+  alg.isPFJet    = (label.find("pf")  !=string::npos || label.find("puppi")  !=string::npos);
+  alg.isTrackJet = (label.find("trk") !=string::npos);
+  alg.isTauJet   = (label.find("tau") !=string::npos);
+
+  int check = alg.isCaloJet+alg.isJPTJet+alg.isPFJet+alg.isTrackJet+alg.isTauJet;
+  assert(check<2);
+
+  //if (alg.isCaloJet)  cout<<"These are CaloJets  ("<<label<<")"<<endl;
+  //if (alg.isJPTJet)   cout<<"These are JPTJets   ("<<label<<")"<<endl;
+  //if (alg.isPFJet)    cout<<"These are PFJets    ("<<label<<")"<<endl;
+  //if (alg.isTrackJet) cout<<"These are TrackJets ("<<label<<")"<<endl;
+  //if (alg.isTauJet)   cout<<"These are TauJets   ("<<label<<")"<<endl;
+}
+
+
 //______________________________________________________________________________
 void JetResponseAnalyzer::beginJob()
 //void JetResponseAnalyzer::setupTree()
@@ -104,14 +135,35 @@ void JetResponseAnalyzer::beginJob()
   if (!fs) throw edm::Exception(edm::errors::Configuration,
 				"TFileService missing from configuration!");
   
-  // Configuration flags: Mapping in JRAEvent.h
-  int flag_int = (saveCandidates_*pow(2,7)) + (isPFJet_*pow(2,6)) +
-                 (isCaloJet_*pow(2,5)) + (doComposition_*pow(2,4)) +
-                 (doBalancing_*pow(2,3)) + (doFlavor_*pow(2,2)) +
-                 (doHLT_*pow(2,1)) + (1);
-  bitset<8> flags(flag_int);
-  tree_=fs->make<TTree>("t","t");
-  JRAEvt_ = new JRAEvent(tree_,flags);
+  for (unsigned int i=0;i<algs_.size();i++) {
+    Algorithm& alg = algs_[i];
+    // Configuration flags: Mapping in JRAEvent.h
+    int flag_int = (saveCandidates_*pow(2,7)) + (alg.isPFJet*pow(2,6)) +
+                   (alg.isCaloJet*pow(2,5)) + (doComposition_*pow(2,4)) +
+                   (doBalancing_*pow(2,3)) + (doFlavor_*pow(2,2)) +
+                   (doHLT_*pow(2,1)) + (1);
+    bitset<8> flags(flag_int);
+    if (multipleAlgorithms_) {
+      // same layout as one module per algorithm: <alg>/t at the top of the file
+      TDirectory* savedDir = gDirectory;
+      TDirectory* algDir = fs->file().GetDirectory(alg.label.c_str());
+      if (0==algDir) algDir = fs->file().mkdir(alg.label.c_str());
+      algDir->cd();
+      alg.tree = new TTree("t","t");
+      savedDir->cd();
+    }
+    else {
+      alg.tree=fs->make<TTree>("t","t");
+    }
+    alg.JRAEvt = new JRAEvent(alg.tree,flags);
+  }
+}
+
+
+//______________________________________________________________________________
+void JetResponseAnalyzer::beginEvent()
+{
+  for (unsigned int i=0;i<algs_.size();i++) algs_[i].JRAEvt->clear();
 }
 
 
@@ -121,98 +173,79 @@ void JetResponseAnalyzer::analyze(const edm::Event& iEvent,
 {
   beginEvent();
 
+  // the event level products are read once and copied to every algorithm
+  fillEventInfo(algs_[0].JRAEvt,iEvent);
+  for (unsigned int i=0;i<algs_.size();i++) {
+    if (i>0) copyEventInfo(algs_[0].JRAEvt,algs_[i].JRAEvt);
+    analyzeAlgorithm(algs_[i],iEvent,iSetup);
+  }
+  
+  return;
+}
+
+
+//______________________________________________________________________________
+void JetResponseAnalyzer::fillEventInfo(JRAEvent* JRAEvt, const edm::Event& iEvent)
+{
   // EVENT DATA HANDLES
   edm::Handle<GenEventInfoProduct>               genInfo;
   edm::Handle<vector<PileupSummaryInfo> >        puInfos;  
-  edm::Handle<reco::CandidateView>               refs;
-  edm::Handle<reco::CandViewMatchMap>            jetToUncorJetMap;
-  edm::Handle<reco::CandViewMatchMap>            refToJetMap;
-  edm::Handle<reco::JetMatchedPartonsCollection> refToPartonMap;
-  edm::Handle<vector<double> >                   rhos;
-  edm::Handle<double>                            rho;
-  edm::Handle<double>                            rho_hlt;
   edm::Handle<reco::VertexCollection>            vtx;
-  edm::Handle<PFCandidateView>                   pfCandidates;
-  edm::Handle<std::vector<edm::FwdPtr<reco::PFCandidate> > >  pfCandidatesAsFwdPtr;
   edm::Handle<vector<reco::GenParticle> >        genParticles;
 
-  // Jet CORRECTOR
-  jetCorrector_ = (jecLabel_.empty()) ? 0 : JetCorrector::getJetCorrector(jecLabel_,iSetup);
-
   // GENERATOR INFORMATION
-  JRAEvt_->pthat  = 0.0;
-  JRAEvt_->weight = 1.0;
+  JRAEvt->pthat  = 0.0;
+  JRAEvt->weight = 1.0;
   if (iEvent.getByToken(srcGenInfo_,genInfo)) {
-    if (genInfo->hasBinningValues()) JRAEvt_->pthat = (Float_t)genInfo->binningValues()[0];
-    JRAEvt_->weight = (Float_t)genInfo->weight();
-  }
-  
-  //RHO INFORMATION
-  JRAEvt_->rho = 0.0;
-  if (iEvent.getByToken(srcRho_,rho)) {
-    JRAEvt_->rho = *rho;
-  }
-
-  //HLT RHO INFORMATION
-  JRAEvt_->rho_hlt = 0.0;
-  if (doHLT_) {
-     if (iEvent.getByToken(srcRhoHLT_,rho_hlt)) {
-       JRAEvt_->rho_hlt = *rho_hlt;
-     }
-  }
-
-  //ETA DEPENDENT RHO INFORMATION
-  if(iEvent.getByToken(srcRhos_,rhos)) {
-     for(unsigned int i=0; i<rhos->size(); i++) {
-        JRAEvt_->rhos->push_back((*rhos)[i]);
-     }
+    if (genInfo->hasBinningValues()) JRAEvt->pthat = (Float_t)genInfo->binningValues()[0];
+    JRAEvt->weight = (Float_t)genInfo->weight();
   }
 
   //NPV INFORMATION
-  JRAEvt_->npv = 0;
+  JRAEvt->npv = 0;
   if (iEvent.getByToken(srcVtx_,vtx)) {
      const reco::VertexCollection::const_iterator vtxEnd = vtx->end();
      for (reco::VertexCollection::const_iterator vtxIter = vtx->begin(); vtxEnd != vtxIter; ++vtxIter) {
         if (!vtxIter->isFake() && vtxIter->ndof()>=4 && fabs(vtxIter->z())<=24) {
-           ++(JRAEvt_->npv);
-           JRAEvt_->refdzvtx->push_back(0);//fabs(vtxIter->z()-);
+           ++(JRAEvt->npv);
+           JRAEvt->refdzvtx->push_back(0);//fabs(vtxIter->z()-);
         }
      }
   }
  
   //EVENT INFORMATION
-  JRAEvt_->run = iEvent.id().run();
-  JRAEvt_->lumi = iEvent.id().luminosityBlock();
-  JRAEvt_->evt = iEvent.id().event();
+  JRAEvt->run = iEvent.id().run();
+  JRAEvt->lumi = iEvent.id().luminosityBlock();
+  JRAEvt->evt = iEvent.id().event();
 
   // GENERATED PV INFORMATION & PU DENSITY
-  JRAEvt_->refpvz = -1000.0;
+  JRAEvt->refpvz = -1000.0;
   iEvent.getByToken(srcGenParticles_, genParticles);
   for (size_t i = 0; i < genParticles->size(); ++i) {
      const reco::GenParticle & genIt = (*genParticles)[i];
      if ( genIt.isHardProcess() ) {
-        JRAEvt_->refpvz = genIt.vz();
+        JRAEvt->refpvz = genIt.vz();
         break;
      }
   }
-  int zbin = getBin(abs(JRAEvt_->refpvz),&vz.at(0),vz.size()-1);
+  int zbin = getBin(abs(JRAEvt->refpvz),&vz.at(0),vz.size()-1);
 
   // MC PILEUP INFORMATION
   if (iEvent.getByToken(srcPileupInfo_,puInfos)) {
      for(unsigned int i=0; i<puInfos->size(); i++) {
-        JRAEvt_->bxns->push_back((*puInfos)[i].getBunchCrossing());
-        JRAEvt_->npus->push_back((*puInfos)[i].getPU_NumInteractions());
-        JRAEvt_->tnpus->push_back((*puInfos)[i].getTrueNumInteractions());
+        JRAEvt->bxns->push_back((*puInfos)[i].getBunchCrossing());
+        JRAEvt->npus->push_back((*puInfos)[i].getPU_NumInteractions());
+        JRAEvt->tnpus->push_back((*puInfos)[i].getTrueNumInteractions());
         if((*puInfos)[i].getBunchCrossing() == 0) {
            unsigned int nzpositions = (*puInfos)[i].getPU_zpositions().size();
-           JRAEvt_->pudensity = 0;
-           JRAEvt_->gpudensity = 0;
+           JRAEvt->pudensity = 0;
+           JRAEvt->gpudensity = 0;
            for (unsigned int j=0; j<nzpositions; ++j) {
-              JRAEvt_->zpositions->push_back((*puInfos)[i].getPU_zpositions()[j]);
-              if (abs(JRAEvt_->zpositions->back()-JRAEvt_->refpvz)<0.1) JRAEvt_->pudensity++; //N_PU/mm
-              if (getBin(abs(JRAEvt_->zpositions->back()),&vz.at(0),vz.size()-1)==zbin) JRAEvt_->gpudensity++;
+              JRAEvt->zpositions->push_back((*puInfos)[i].getPU_zpositions()[j]);
+              if (abs(JRAEvt->zpositions->back()-JRAEvt->refpvz)<0.1) JRAEvt->pudensity++; //N_PU/mm
+              if (getBin(abs(JRAEvt->zpositions->back()),&vz.at(0),vz.size()-1)==zbin) JRAEvt->gpudensity++;
            }
-           JRAEvt_->gpudensity/=(20.0*(vz[zbin+1]-vz[zbin]));
+           JRAEvt->gpudensity/=(20.0*(vz[zbin+1]-vz[zbin]));
         }
         int sumptlowpttemp = 0;
         int sumpthighpttemp = 0;
@@ -230,20 +263,89 @@ void JetResponseAnalyzer::analyze(const edm::Event& iEvent,
         for(unsigned int j=0; j<(*puInfos)[i].getPU_ntrks_highpT().size(); j++) {
           ntrkshighpttemp += ((*puInfos)[i].getPU_ntrks_highpT())[j];
         }
-        JRAEvt_->sumpt_lowpt->push_back(sumptlowpttemp);
-        JRAEvt_->sumpt_highpt->push_back(sumpthighpttemp);
-        JRAEvt_->ntrks_lowpt->push_back(ntrkslowpttemp);
-        JRAEvt_->ntrks_highpt->push_back(ntrkshighpttemp);
+        JRAEvt->sumpt_lowpt->push_back(sumptlowpttemp);
+        JRAEvt->sumpt_highpt->push_back(sumpthighpttemp);
+        JRAEvt->ntrks_lowpt->push_back(ntrkslowpttemp);
+        JRAEvt->ntrks_highpt->push_back(ntrkshighpttemp);
+     }
+  }
+}
+
+
+//______________________________________________________________________________
+void JetResponseAnalyzer::copyEventInfo(const JRAEvent* from, JRAEvent* to)
+{
+  to->pthat      = from->pthat;
+  to->weight     = from->weight;
+  to->npv        = from->npv;
+  to->run        = from->run;
+  to->lumi       = from->lumi;
+  to->evt        = from->evt;
+  to->refpvz     = from->refpvz;
+  to->pudensity  = from->pudensity;
+  to->gpudensity = from->gpudensity;
+  *(to->refdzvtx)     = *(from->refdzvtx);
+  *(to->bxns)         = *(from->bxns);
+  *(to->npus)         = *(from->npus);
+  *(to->tnpus)        = *(from->tnpus);
+  *(to->zpositions)   = *(from->zpositions);
+  *(to->sumpt_lowpt)  = *(from->sumpt_lowpt);
+  *(to->sumpt_highpt) = *(from->sumpt_highpt);
+  *(to->ntrks_lowpt)  = *(from->ntrks_lowpt);
+  *(to->ntrks_highpt) = *(from->ntrks_highpt);
+}
+
+
+//______________________________________________________________________________
+void JetResponseAnalyzer::analyzeAlgorithm(Algorithm& alg,
+                                           const edm::Event& iEvent,
+                                           const edm::EventSetup& iSetup)
+{
+  JRAEvent* JRAEvt = alg.JRAEvt;
+
+  // EVENT DATA HANDLES
+  edm::Handle<reco::CandidateView>               refs;
+  edm::Handle<reco::CandViewMatchMap>            jetToUncorJetMap;
+  edm::Handle<reco::CandViewMatchMap>            refToJetMap;
+  edm::Handle<reco::JetMatchedPartonsCollection> refToPartonMap;
+  edm::Handle<vector<double> >                   rhos;
+  edm::Handle<double>                            rho;
+  edm::Handle<double>                            rho_hlt;
+  edm::Handle<PFCandidateView>                   pfCandidates;
+  edm::Handle<std::vector<edm::FwdPtr<reco::PFCandidate> > >  pfCandidatesAsFwdPtr;
+
+  // Jet CORRECTOR
+  jetCorrector_ = (alg.jecLabel.empty()) ? 0 : JetCorrector::getJetCorrector(alg.jecLabel,iSetup);
+
+  //RHO INFORMATION
+  JRAEvt->rho = 0.0;
+  if (iEvent.getByToken(alg.srcRho,rho)) {
+    JRAEvt->rho = *rho;
+  }
+
+  //HLT RHO INFORMATION
+  JRAEvt->rho_hlt = 0.0;
+  if (doHLT_) {
+     if (iEvent.getByToken(alg.srcRhoHLT,rho_hlt)) {
+       JRAEvt->rho_hlt = *rho_hlt;
+     }
+  }
+
+  //ETA DEPENDENT RHO INFORMATION
+  if(iEvent.getByToken(alg.srcRhos,rhos)) {
+     for(unsigned int i=0; i<rhos->size(); i++) {
+        JRAEvt->rhos->push_back((*rhos)[i]);
      }
   }
 
   // REFERENCES & RECOJETS
-  iEvent.getByToken(srcRef_,               refs);
-  iEvent.getByToken(srcJetToUncorJetMap_, jetToUncorJetMap); 
-  iEvent.getByToken(srcRefToJetMap_,refToJetMap);
-  if (getFlavorFromMap_) iEvent.getByToken(srcRefToPartonMap_,refToPartonMap);
+  iEvent.getByToken(alg.srcRef,               refs);
+  // empty for uncorrected jets, see mergeDuplicateModules in addAlgorithm.py
+  iEvent.getByToken(alg.srcJetToUncorJetMap, jetToUncorJetMap); 
+  iEvent.getByToken(alg.srcRefToJetMap,refToJetMap);
+  if (alg.getFlavorFromMap) iEvent.getByToken(alg.srcRefToPartonMap,refToPartonMap);
   if (doBalancing_&&refToJetMap->size()!=1) return;
-  JRAEvt_->nref = 0;
+  JRAEvt->nref = 0;
   size_t nRef=(nRefMax_==0) ? refs->size() : std::min(nRefMax_,refs->size());
   for (size_t iRef=0;iRef<nRef;iRef++) {
      
@@ -254,21 +356,21 @@ void JetResponseAnalyzer::analyze(const edm::Event& iEvent,
      reco::CandidateBaseRef jet=itMatch->val;
 
      if(doBalancing_)
-       JRAEvt_->refdphijt->push_back(reco::deltaPhi(jet->phi(),ref->phi()));
+       JRAEvt->refdphijt->push_back(reco::deltaPhi(jet->phi(),ref->phi()));
      else
-       JRAEvt_->refdrjt->push_back(reco::deltaR(jet->eta(),jet->phi(),ref->eta(),ref->phi()));
+       JRAEvt->refdrjt->push_back(reco::deltaR(jet->eta(),jet->phi(),ref->eta(),ref->phi()));
  
-     if ((!doBalancing_&&JRAEvt_->refdrjt->at(JRAEvt_->nref)>deltaRMax_)||
-         (doBalancing_&&std::abs(JRAEvt_->refdphijt->at(JRAEvt_->nref))<deltaPhiMin_)) {
-        if(doBalancing_) JRAEvt_->refdphijt->pop_back();
-        else JRAEvt_->refdrjt->pop_back();
+     if ((!doBalancing_&&JRAEvt->refdrjt->at(JRAEvt->nref)>deltaRMax_)||
+         (doBalancing_&&std::abs(JRAEvt->refdphijt->at(JRAEvt->nref))<deltaPhiMin_)) {
+        if(doBalancing_) JRAEvt->refdphijt->pop_back();
+        else JRAEvt->refdrjt->pop_back();
         continue;
      }
      
-     JRAEvt_->refpdgid->push_back(0);
-     JRAEvt_->refpdgid_algorithmicDef->push_back(0);
-     JRAEvt_->refpdgid_physicsDef->push_back(0);
-     if (getFlavorFromMap_) {
+     JRAEvt->refpdgid->push_back(0);
+     JRAEvt->refpdgid_algorithmicDef->push_back(0);
+     JRAEvt->refpdgid_physicsDef->push_back(0);
+     if (alg.getFlavorFromMap) {
         reco::JetMatchedPartonsCollection::const_iterator itPartonMatch;
         itPartonMatch=refToPartonMap->begin();
         for (;itPartonMatch!=refToPartonMap->end();++itPartonMatch) {
@@ -290,41 +392,41 @@ void JetResponseAnalyzer::analyze(const edm::Event& iEvent,
                            itPartonMatch->second.physicsDefinitionParton().get()->p4());
            
            if (refdrparton_algo<deltaRPartonMax_) {
-              JRAEvt_->refpdgid_algorithmicDef->at(JRAEvt_->nref)=itPartonMatch->second.algoDefinitionParton().get()->pdgId();
-              int absid = std::abs(JRAEvt_->refpdgid_algorithmicDef->at(JRAEvt_->nref));
+              JRAEvt->refpdgid_algorithmicDef->at(JRAEvt->nref)=itPartonMatch->second.algoDefinitionParton().get()->pdgId();
+              int absid = std::abs(JRAEvt->refpdgid_algorithmicDef->at(JRAEvt->nref));
               if (absid==4||absid==5) {
                  GenJetLeptonFinder finder(*ref);
                  finder.run();
                  if (finder.foundLeptonAndNeutrino()) {
-                    int sign  = (JRAEvt_->refpdgid_algorithmicDef->at(JRAEvt_->nref)>0) ? +1 : -1;
-                    JRAEvt_->refpdgid_algorithmicDef->at(JRAEvt_->nref) = sign*(absid*100+std::abs(finder.leptonPdgId()));
+                    int sign  = (JRAEvt->refpdgid_algorithmicDef->at(JRAEvt->nref)>0) ? +1 : -1;
+                    JRAEvt->refpdgid_algorithmicDef->at(JRAEvt->nref) = sign*(absid*100+std::abs(finder.leptonPdgId()));
                  }
               }
            }
            if (refdrparton_physics<deltaRPartonMax_) {
-              JRAEvt_->refpdgid_physicsDef->at(JRAEvt_->nref)=itPartonMatch->second.physicsDefinitionParton().get()->pdgId();
-              int absid = std::abs(JRAEvt_->refpdgid_physicsDef->at(JRAEvt_->nref));
+              JRAEvt->refpdgid_physicsDef->at(JRAEvt->nref)=itPartonMatch->second.physicsDefinitionParton().get()->pdgId();
+              int absid = std::abs(JRAEvt->refpdgid_physicsDef->at(JRAEvt->nref));
               if (absid==4||absid==5) {
                  GenJetLeptonFinder finder(*ref);
                  finder.run();
                  if (finder.foundLeptonAndNeutrino()) {
-                    int sign  = (JRAEvt_->refpdgid_physicsDef->at(JRAEvt_->nref)>0) ? +1 : -1;
-                    JRAEvt_->refpdgid_physicsDef->at(JRAEvt_->nref) = sign*(absid*100+std::abs(finder.leptonPdgId()));
+                    int sign  = (JRAEvt->refpdgid_physicsDef->at(JRAEvt->nref)>0) ? +1 : -1;
+                    JRAEvt->refpdgid_physicsDef->at(JRAEvt->nref) = sign*(absid*100+std::abs(finder.leptonPdgId()));
                  }
               }
            }
         }
      }
      else {
-        JRAEvt_->refpdgid_algorithmicDef->at(JRAEvt_->nref)=0;
-        JRAEvt_->refpdgid_physicsDef->at(JRAEvt_->nref)=0;
+        JRAEvt->refpdgid_algorithmicDef->at(JRAEvt->nref)=0;
+        JRAEvt->refpdgid_physicsDef->at(JRAEvt->nref)=0;
      }
-     JRAEvt_->refpdgid->at(JRAEvt_->nref)=ref->pdgId();
+     JRAEvt->refpdgid->at(JRAEvt->nref)=ref->pdgId();
 
      // Beta/Beta Star Calculation
-     JRAEvt_->beta = 0.0;
-     JRAEvt_->betaStar = 0.0;
-//     if (isPFJet_) {
+     JRAEvt->beta = 0.0;
+     JRAEvt->betaStar = 0.0;
+//     if (alg.isPFJet) {
 //        //---- vertex association -----------
 //        //---- get the vector of tracks -----
 //        reco::PFJetRef pfJetRef = jet.castTo<reco::PFJetRef>();
@@ -364,131 +466,131 @@ void JetResponseAnalyzer::analyze(const edm::Event& iEvent,
 //        //qcdpfjet.setBetaStar(betaStar);
 //     }
 
-     JRAEvt_->refrank ->push_back(JRAEvt_->nref);
-     JRAEvt_->refe    ->push_back(ref->energy());
-     JRAEvt_->refpt   ->push_back(ref->pt());
-     JRAEvt_->refeta  ->push_back(ref->eta());
-     JRAEvt_->refphi  ->push_back(ref->phi());
-     JRAEvt_->refy    ->push_back(ref->rapidity());
-     JRAEvt_->refarea ->push_back(ref.castTo<reco::GenJetRef>()->jetArea());
-     JRAEvt_->jte     ->push_back(jet->energy());
-     JRAEvt_->jtpt    ->push_back(jet->pt());
-     JRAEvt_->jteta   ->push_back(jet->eta());
-     JRAEvt_->jtphi   ->push_back(jet->phi());
-     JRAEvt_->jty     ->push_back(jet->rapidity());
-     JRAEvt_->jtjec   ->push_back(1.0);
-     JRAEvt_->jtarea  ->push_back(0.0);
-
-     if (isCaloJet_) {
-        JRAEvt_->jtarea->at(JRAEvt_->nref) = jet.castTo<reco::CaloJetRef>()->jetArea();
+     JRAEvt->refrank ->push_back(JRAEvt->nref);
+     JRAEvt->refe    ->push_back(ref->energy());
+     JRAEvt->refpt   ->push_back(ref->pt());
+     JRAEvt->refeta  ->push_back(ref->eta());
+     JRAEvt->refphi  ->push_back(ref->phi());
+     JRAEvt->refy    ->push_back(ref->rapidity());
+     JRAEvt->refarea ->push_back(ref.castTo<reco::GenJetRef>()->jetArea());
+     JRAEvt->jte     ->push_back(jet->energy());
+     JRAEvt->jtpt    ->push_back(jet->pt());
+     JRAEvt->jteta   ->push_back(jet->eta());
+     JRAEvt->jtphi   ->push_back(jet->phi());
+     JRAEvt->jty     ->push_back(jet->rapidity());
+     JRAEvt->jtjec   ->push_back(1.0);
+     JRAEvt->jtarea  ->push_back(0.0);
+
+     if (alg.isCaloJet) {
+        JRAEvt->jtarea->at(JRAEvt->nref) = jet.castTo<reco::CaloJetRef>()->jetArea();
      }
-     else if (isJPTJet_) {
+     else if (alg.isJPTJet) {
         const reco::JPTJet& jptjet = dynamic_cast <const reco::JPTJet&> (*jet);
         edm::RefToBase<reco::Jet> jptjetRef = jptjet.getCaloJetRef();
         reco::CaloJet const * rawcalojet = dynamic_cast<reco::CaloJet const *>( &* jptjetRef);
-        JRAEvt_->jtarea->at(JRAEvt_->nref) = rawcalojet->jetArea();
+        JRAEvt->jtarea->at(JRAEvt->nref) = rawcalojet->jetArea();
      }
-     else if (isPFJet_) {
-        JRAEvt_->jtarea->at(JRAEvt_->nref) = jet.castTo<reco::PFJetRef>()->jetArea();
+     else if (alg.isPFJet) {
+        JRAEvt->jtarea->at(JRAEvt->nref) = jet.castTo<reco::PFJetRef>()->jetArea();
      }
 
      if (0!=jetCorrector_) {
         if (!jetCorrector_->vectorialCorrection()) {
-           if (jetCorrector_->eventRequired()||isJPTJet_) {
-              if (isCaloJet_) {
+           if (jetCorrector_->eventRequired()||alg.isJPTJet) {
+              if (alg.isCaloJet) {
                  reco::CaloJetRef caloJetRef;
                  caloJetRef = jet.castTo<reco::CaloJetRef>();
-                 JRAEvt_->jtjec->at(JRAEvt_->nref) = jetCorrector_->correction(*caloJetRef,iEvent,iSetup);
+                 JRAEvt->jtjec->at(JRAEvt->nref) = jetCorrector_->correction(*caloJetRef,iEvent,iSetup);
               }
-              else if (isJPTJet_) {
+              else if (alg.isJPTJet) {
                  reco::JPTJetRef jptJetRef;
                  jptJetRef = jet.castTo<reco::JPTJetRef>();
-                 JRAEvt_->jtjec->at(JRAEvt_->nref) = jetCorrector_->correction(*jptJetRef,iEvent,iSetup);
+                 JRAEvt->jtjec->at(JRAEvt->nref) = jetCorrector_->correction(*jptJetRef,iEvent,iSetup);
               }
-              else if (isPFJet_) {
+              else if (alg.isPFJet&&jetToUncorJetMap.isValid()) {
                  reco::CandViewMatchMap::const_iterator jetMatch=jetToUncorJetMap->find(jet);
                  if (jetMatch!=jetToUncorJetMap->end()) {
                     reco::CandidateBaseRef ujet = jetMatch->val;
                     reco::PFJetRef pfJetRef;
                     pfJetRef=ujet.castTo<reco::PFJetRef>();
-                    JRAEvt_->jtjec->at(JRAEvt_->nref) = jetCorrector_->correction(*pfJetRef,iEvent,iSetup);
+                    JRAEvt->jtjec->at(JRAEvt->nref) = jetCorrector_->correction(*pfJetRef,iEvent,iSetup);
                  }
               }
            }
            else {
-              JRAEvt_->jtjec->at(JRAEvt_->nref) = jetCorrector_->correction(jet->p4());
+              JRAEvt->jtjec->at(JRAEvt->nref) = jetCorrector_->correction(jet->p4());
            }
         }
      }
      
      if (doComposition_) {
         
-        if (isCaloJet_) {
+        if (alg.isCaloJet) {
            reco::CaloJetRef caloJetRef;
            caloJetRef=jet.castTo<reco::CaloJetRef>();
-           JRAEvt_->jtemf->push_back(caloJetRef->emEnergyFraction());
+           JRAEvt->jtemf->push_back(caloJetRef->emEnergyFraction());
         }
         
-        else if (isPFJet_) {
+        else if (alg.isPFJet) {
            reco::PFJetRef pfJetRef;
            pfJetRef=jet.castTo<reco::PFJetRef>();
-           JRAEvt_->jtchf ->push_back(pfJetRef->chargedHadronEnergyFraction()*JRAEvt_->jtjec->at(JRAEvt_->nref));
-           JRAEvt_->jtnhf ->push_back(pfJetRef->neutralHadronEnergyFraction()*JRAEvt_->jtjec->at(JRAEvt_->nref));
-           JRAEvt_->jtnef ->push_back(pfJetRef->photonEnergyFraction()       *JRAEvt_->jtjec->at(JRAEvt_->nref));
-           JRAEvt_->jtcef ->push_back(pfJetRef->electronEnergyFraction()     *JRAEvt_->jtjec->at(JRAEvt_->nref));
-           JRAEvt_->jtmuf ->push_back(pfJetRef->muonEnergyFraction()         *JRAEvt_->jtjec->at(JRAEvt_->nref));
-           JRAEvt_->jthfhf->push_back(pfJetRef->HFHadronEnergyFraction()     *JRAEvt_->jtjec->at(JRAEvt_->nref));
-           JRAEvt_->jthfef->push_back(pfJetRef->HFEMEnergyFraction()         *JRAEvt_->jtjec->at(JRAEvt_->nref));
+           JRAEvt->jtchf ->push_back(pfJetRef->chargedHadronEnergyFraction()*JRAEvt->jtjec->at(JRAEvt->nref));
+           JRAEvt->jtnhf ->push_back(pfJetRef->neutralHadronEnergyFraction()*JRAEvt->jtjec->at(JRAEvt->nref));
+           JRAEvt->jtnef ->push_back(pfJetRef->photonEnergyFraction()       *JRAEvt->jtjec->at(JRAEvt->nref));
+           JRAEvt->jtcef ->push_back(pfJetRef->electronEnergyFraction()     *JRAEvt->jtjec->at(JRAEvt->nref));
+           JRAEvt->jtmuf ->push_back(pfJetRef->muonEnergyFraction()         *JRAEvt->jtjec->at(JRAEvt->nref));
+           JRAEvt->jthfhf->push_back(pfJetRef->HFHadronEnergyFraction()     *JRAEvt->jtjec->at(JRAEvt->nref));
+           JRAEvt->jthfef->push_back(pfJetRef->HFEMEnergyFraction()         *JRAEvt->jtjec->at(JRAEvt->nref));
         } 
      }
      
-     JRAEvt_->nref++;
+     JRAEvt->nref++;
   }
      
   // PFCANDIDATE INFORMATION
   //Dual handle idea from https://github.com/aperloff/cmssw/blob/CMSSW_7_6_X/RecoJets/JetProducers/plugins/VirtualJetProducer.cc
   //Random-Cone algo from https://github.com/cihar29/OffsetAnalysis/blob/master/run_offset.py
   //                  and https://github.com/cihar29/OffsetAnalysis/blob/master/plugins/OffsetAnalysis.cc
-  if (saveCandidates_ && isPFJet_) {
-      bool isView = iEvent.getByToken(srcPFCandidates_, pfCandidates);
+  if (saveCandidates_ && alg.isPFJet) {
+      bool isView = iEvent.getByToken(alg.srcPFCandidates, pfCandidates);
       if ( isView ) {
           for (auto i_pf=pfCandidates->begin(); i_pf != pfCandidates->end(); ++i_pf) {
               auto i_pfc = (i_pf);
               JRAEvent::Flavor pf_id = getFlavor( i_pfc->particleId() );
               if (pf_id == JRAEvent::X) continue;
-              JRAEvt_->pfcand_px ->push_back(i_pfc->px());
-              JRAEvt_->pfcand_py ->push_back(i_pfc->py());
-              JRAEvt_->pfcand_pt ->push_back(i_pfc->pt());
-              JRAEvt_->pfcand_eta->push_back(i_pfc->eta());
-              JRAEvt_->pfcand_phi->push_back(i_pfc->phi());
-              JRAEvt_->pfcand_e  ->push_back(i_pfc->energy());
-              JRAEvt_->pfcand_id ->push_back(pf_id);
+              JRAEvt->pfcand_px ->push_back(i_pfc->px());
+              JRAEvt->pfcand_py ->push_back(i_pfc->py());
+              JRAEvt->pfcand_pt ->push_back(i_pfc->pt());
+              JRAEvt->pfcand_eta->push_back(i_pfc->eta());
+              JRAEvt->pfcand_phi->push_back(i_pfc->phi());
+              JRAEvt->pfcand_e  ->push_back(i_pfc->energy());
+              JRAEvt->pfcand_id ->push_back(pf_id);
           }
       }
       else {
-          bool isPF = iEvent.getByToken(srcPFCandidatesAsFwdPtr_, pfCandidatesAsFwdPtr);
+          bool isPF = iEvent.getByToken(alg.srcPFCandidatesAsFwdPtr, pfCandidatesAsFwdPtr);
           if ( isPF ) {
               for (auto i_pf=pfCandidatesAsFwdPtr->begin(); i_pf != pfCandidatesAsFwdPtr->end(); ++i_pf) {
                   auto i_pfc = (*i_pf);
                   JRAEvent::Flavor pf_id = getFlavor( i_pfc->particleId() );
                   if (pf_id == JRAEvent::X) continue;
-                  JRAEvt_->pfcand_px ->push_back(i_pfc->px());
-                  JRAEvt_->pfcand_py ->push_back(i_pfc->py());
-                  JRAEvt_->pfcand_pt ->push_back(i_pfc->pt());
-                  JRAEvt_->pfcand_eta->push_back(i_pfc->eta());
-                  JRAEvt_->pfcand_phi->push_back(i_pfc->phi());
-                  JRAEvt_->pfcand_e  ->push_back(i_pfc->energy());
-                  JRAEvt_->pfcand_id ->push_back(pf_id);
+                  JRAEvt->pfcand_px ->push_back(i_pfc->px());
+                  JRAEvt->pfcand_py ->push_back(i_pfc->py());
+                  JRAEvt->pfcand_pt ->push_back(i_pfc->pt());
+                  JRAEvt->pfcand_eta->push_back(i_pfc->eta());
+                  JRAEvt->pfcand_phi->push_back(i_pfc->phi());
+                  JRAEvt->pfcand_e  ->push_back(i_pfc->energy());
+                  JRAEvt->pfcand_id ->push_back(pf_id);
               }
           }
       }
   }
 
   
-  tree_->Fill();
+  alg.tree->Fill();
   
   return;
-  }
+}
 
 //______________________________________________________________________________
 JRAEvent::Flavor JetResponseAnalyzer::getFlavor(reco::PFCandidate::ParticleType id) {
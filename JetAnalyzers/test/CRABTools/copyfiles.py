@@ -23,7 +23,7 @@ for ss in SAMPLE:
 
   command = "cd "+local+ss+"/"
   os.system(command)
-  command = "hadd -f "+local+ss+"/"+ss+".root "+local+ss+"/"+ss+"_*.root"
+  command = "jraMerge.py "+local+ss+"/"+ss+".root '"+local+ss+"/"+ss+"_*.root'"
   os.system(command)
   command = "rm "+local+ss+"/"+ss+"_*.root"
   os.system(command)
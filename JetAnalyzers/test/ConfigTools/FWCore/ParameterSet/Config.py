@@ -0,0 +1,749 @@
+"""
+Minimal offline stand-in for FWCore.ParameterSet.Config, used by checkConfig.py.
+
+Implements the subset of the CMSSW python configuration language used by the
+JetAnalyzers configuration layer: parameter types, modules, sequences, paths,
+tasks and the Process container. It is meant for building and inspecting
+configurations without a CMSSW installation, not for running them.
+"""
+import copy
+import sys
+
+
+################################################################################
+## parameter types
+################################################################################
+class _ParameterTypeBase(object):
+    def __init__(self):
+        self._isTracked = True
+    def isTracked(self):
+        return self._isTracked
+    def setIsTracked(self, trackness):
+        self._isTracked = trackness
+    def isModified(self):
+        return False
+    def configTypeName(self):
+        name = type(self).__name__
+        if not self._isTracked:
+            return 'untracked ' + name
+        return name
+    def dumpPython(self, options=None):
+        prefix = 'cms.' if self._isTracked else 'cms.untracked.'
+        return prefix + type(self).__name__ + '(' + self.pythonValue() + ')'
+
+
+class _SimpleParameterTypeBase(_ParameterTypeBase):
+    def __init__(self, value):
+        super(_SimpleParameterTypeBase, self).__init__()
+        self._value = self._convert(value)
+    def _convert(self, value):
+        return value
+    def value(self):
+        return self._value
+    def setValue(self, value):
+        self._value = self._convert(value)
+    def pythonValue(self, options=None):
+        return repr(self._value)
+    def __eq__(self, other):
+        if isinstance(other, _SimpleParameterTypeBase):
+            return self._value == other._value
+        return self._value == other
+    def __ne__(self, other):
+        return not self.__eq__(other)
+    def __hash__(self):
+        return hash(self._value)
+    def __nonzero__(self):
+        return bool(self._value)
+    __bool__ = __nonzero__
+    def __repr__(self):
+        return self.dumpPython()
+
+
+class int32(_SimpleParameterTypeBase):
+    def _convert(self, value):
+        return int(value)
+class uint32(int32):
+    pass
+class int64(int32):
+    pass
+class uint64(int32):
+    pass
+
+
+class double(_SimpleParameterTypeBase):
+    def _convert(self, value):
+        return float(value)
+    def __float__(self):
+        return self._value
+
+
+class bool(_SimpleParameterTypeBase):
+    def _convert(self, value):
+        return value is True or value == 1
+
+
+class string(_SimpleParameterTypeBase):
+    def _convert(self, value):
+        return str(value)
+    def __str__(self):
+        return self._value
+    def replace(self, old, new):
+        return self._value.replace(old, new)
+    def pythonValue(self, options=None):
+        return "'" + self._value + "'"
+
+
+class FileInPath(string):
+    pass
+
+
+class InputTag(_ParameterTypeBase):
+    def __init__(self, moduleLabel, productInstanceLabel='', processName=''):
+        super(InputTag, self).__init__()
+        self._setValues(moduleLabel, productInstanceLabel, processName)
+    def _setValues(self, moduleLabel, productInstanceLabel='', processName=''):
+        if isinstance(moduleLabel, InputTag):
+            moduleLabel, productInstanceLabel, processName = \
+                moduleLabel._moduleLabel, moduleLabel._productInstance, moduleLabel._processName
+        elif productInstanceLabel == '' and ':' in str(moduleLabel):
+            parts = str(moduleLabel).split(':') + ['', '']
+            moduleLabel, productInstanceLabel, processName = parts[0], parts[1], parts[2]
+        self._moduleLabel = str(moduleLabel)
+        self._productInstance = str(productInstanceLabel)
+        self._processName = str(processName)
+    def getModuleLabel(self):
+        return self._moduleLabel
+    def setModuleLabel(self, label):
+        self._moduleLabel = label
+    moduleLabel = property(getModuleLabel, setModuleLabel)
+    def getProductInstanceLabel(self):
+        return self._productInstance
+    productInstanceLabel = property(getProductInstanceLabel)
+    def getProcessName(self):
+        return self._processName
+    processName = property(getProcessName)
+    def value(self):
+        return self.configValue()
+    def setValue(self, value):
+        self._setValues(value)
+    def configValue(self, options=None):
+        result = self._moduleLabel
+        if self._productInstance != '' or self._processName != '':
+            result += ':' + self._productInstance
+        if self._processName != '':
+            result += ':' + self._processName
+        return result
+    def pythonValue(self, options=None):
+        result = repr(self._moduleLabel)
+        if self._productInstance != '' or self._processName != '':
+            result += ', ' + repr(self._productInstance)
+        if self._processName != '':
+            result += ', ' + repr(self._processName)
+        return result
+    def __eq__(self, other):
+        if isinstance(other, InputTag):
+            return self.configValue() == other.configValue()
+        return self.configValue() == str(other)
+    def __ne__(self, other):
+        return not self.__eq__(other)
+    def __hash__(self):
+        return hash(self.configValue())
+    def __str__(self):
+        return self.configValue()
+    def __repr__(self):
+        return self.dumpPython()
+
+
+class ESInputTag(InputTag):
+    pass
+
+
+class _ValidatingListBase(list):
+    _itemType = None
+    def __init__(self, *args):
+        list.__init__(self, [self._itemConvert(x) for x in self._flatten(args)])
+        self._isTracked = True
+    @staticmethod
+    def _flatten(args):
+        if len(args) == 1 and isinstance(args[0], (list, tuple)) and \
+           not isinstance(args[0], _ParameterTypeBase):
+            return list(args[0])
+        return list(args)
+    def _itemConvert(self, item):
+        if self._itemType is None:
+            return item
+        if isinstance(item, _SimpleParameterTypeBase):
+            item = item.value()
+        return self._itemType(item)
+    def isTracked(self):
+        return self._isTracked
+    def setIsTracked(self, trackness):
+        self._isTracked = trackness
+    def value(self):
+        return list(self)
+    def setValue(self, value):
+        del self[:]
+        self.extend([self._itemConvert(x) for x in value])
+    def pythonValue(self, options=None):
+        return ', '.join([repr(x) for x in self])
+    def dumpPython(self, options=None):
+        prefix = 'cms.' if self._isTracked else 'cms.untracked.'
+        return prefix + type(self).__name__ + '(' + self.pythonValue() + ')'
+    def __repr__(self):
+        return self.dumpPython()
+
+
+class vint32(_ValidatingListBase):
+    _itemType = int
+class vuint32(vint32):
+    pass
+class vdouble(_ValidatingListBase):
+    _itemType = float
+class vstring(_ValidatingListBase):
+    _itemType = str
+class vbool(_ValidatingListBase):
+    pass
+
+
+class VInputTag(_ValidatingListBase):
+    # like the real cms.VInputTag, plain strings are kept as strings
+    def _itemConvert(self, item):
+        if isinstance(item, InputTag):
+            return item
+        return str(item)
+    def pythonValue(self, options=None):
+        return ', '.join([isinstance(x, InputTag) and "cms.InputTag(%s)" % x.pythonValue()
+                          or repr(x) for x in self])
+
+
+class _UntrackedFactory(object):
+    """cms.untracked.int32(...) and cms.untracked(cms.int32(...))"""
+    def __call__(self, param):
+        param.setIsTracked(False)
+        return param
+    def __getattr__(self, name):
+        cls = getattr(sys.modules[__name__], name)
+        def make(*args, **kwargs):
+            param = cls(*args, **kwargs)
+            param.setIsTracked(False)
+            return param
+        return make
+untracked = _UntrackedFactory()
+
+
+################################################################################
+## parameter sets and modules
+################################################################################
+def _isParameter(value):
+    return isinstance(value, (_ParameterTypeBase, _ValidatingListBase))
+
+
+class _Parameterizable(object):
+    def __init__(self, *args, **kwargs):
+        self.__dict__['_Parameterizable__parameterNames'] = []
+        for block in args:
+            if not isinstance(block, PSet):
+                raise ValueError("positional arguments must be of type cms.PSet")
+            for name in block.parameterNames_():
+                self.__setattr__(name, copy.deepcopy(getattr(block, name)))
+        for name in sorted(kwargs):
+            self.__setattr__(name, kwargs[name])
+    def parameterNames_(self):
+        return list(self.__parameterNames)
+    def parameters_(self):
+        return dict([(name, getattr(self, name)) for name in self.__parameterNames])
+    def hasParameter(self, name):
+        return name in self.__parameterNames
+    def __setattr__(self, name, value):
+        if name.startswith('_'):
+            self.__dict__[name] = value
+            return
+        if _isParameter(value):
+            if name not in self.__parameterNames:
+                self.__parameterNames.append(name)
+            self.__dict__[name] = value
+            return
+        if name in self.__parameterNames:
+            self.__dict__[name].setValue(value)
+            return
+        raise TypeError("%s does not already have a parameter named '%s'; "
+                        "new parameters need an explicit cms type" % (type(self).__name__, name))
+    def __delattr__(self, name):
+        if name in self.__parameterNames:
+            self.__parameterNames.remove(name)
+        del self.__dict__[name]
+    def _cloneParameters(self, other, kwargs):
+        for name in self.__parameterNames:
+            other.__setattr__(name, copy.deepcopy(getattr(self, name)))
+        for name in sorted(kwargs):
+            value = kwargs[name]
+            if value is None:
+                if other.hasParameter(name):
+                    other.__delattr__(name)
+                continue
+            other.__setattr__(name, value)
+        return other
+    def dumpPythonParameters(self, indent='    '):
+        lines = []
+        for name in self.__parameterNames:
+            lines.append(indent + name + ' = ' + getattr(self, name).dumpPython())
+        return ',\n'.join(lines)
+
+
+class PSet(_Parameterizable, _ParameterTypeBase):
+    def __init__(self, *args, **kwargs):
+        _Parameterizable.__init__(self, *args, **kwargs)
+        self.__dict__['_isTracked'] = True
+        self.__dict__['_label'] = None
+    def value(self):
+        return self
+    def setValue(self, value):
+        raise TypeError("a PSet can only be replaced by another PSet")
+    def clone(self, **kwargs):
+        return self._cloneParameters(PSet(), kwargs)
+    def setLabel(self, label):
+        self.__dict__['_label'] = label
+    def label_(self):
+        return self._label
+    def dumpPython(self, options=None):
+        prefix = 'cms.' if self._isTracked else 'cms.untracked.'
+        body = self.dumpPythonParameters()
+        return prefix + 'PSet(\n' + body + ('\n' if body else '') + ')'
+
+
+class VPSet(_ValidatingListBase):
+    def _itemConvert(self, item):
+        if not isinstance(item, PSet):
+            raise TypeError("VPSet entries must be cms.PSet")
+        return item
+    def pythonValue(self, options=None):
+        return ', '.join([x.dumpPython() for x in self])
+
+
+class _Labelable(object):
+    def label_(self):
+        return self.__dict__.get('_label')
+    def label(self):
+        if self.label_() is None:
+            raise RuntimeError("module has not been given a label; attach it to a cms.Process first")
+        return self.label_()
+    def setLabel(self, label):
+        if self.__dict__.get('_label') is not None and label is not None and \
+           self.__dict__['_label'] != label:
+            # the same object may be referenced under several names (aliases)
+            return
+        self.__dict__['_label'] = label
+    def hasLabel_(self):
+        return self.label_() is not None
+
+
+class _SequenceLeaf(object):
+    def _flattenedItems(self):
+        return [self]
+    def __mul__(self, rhs):
+        return _SequenceCollection(self, rhs)
+    def __add__(self, rhs):
+        return _SequenceCollection(self, rhs)
+    def visit(self, visitor):
+        visitor.enter(self)
+        visitor.leave(self)
+
+
+class _Module(_Parameterizable, _Labelable, _SequenceLeaf):
+    _moduleKind = 'Module'
+    def __init__(self, type_, *args, **kwargs):
+        self.__dict__['_type'] = type_
+        self.__dict__['_label'] = None
+        _Parameterizable.__init__(self, *args, **kwargs)
+    def type_(self):
+        return self._type
+    def clone(self, *args, **kwargs):
+        other = type(self)(self._type, *args)
+        return self._cloneParameters(other, kwargs)
+    def dumpPython(self, options=None):
+        body = self.dumpPythonParameters()
+        return 'cms.%s(%r%s)\n' % (type(self).__name__, self._type,
+                                   (',\n' + body + '\n') if body else '')
+    def dumpConfig(self, options=None):
+        return self.dumpPython()
+    def __repr__(self):
+        return '<%s %s %s>' % (type(self).__name__, self._type, self.label_())
+
+
+class EDProducer(_Module):
+    pass
+class EDFilter(_Module):
+    pass
+class EDAnalyzer(_Module):
+    pass
+class OutputModule(_Module):
+    pass
+class ESProducer(_Module):
+    pass
+class ESSource(_Module):
+    pass
+class Service(_Module):
+    pass
+class Source(_Module):
+    pass
+class Looper(_Module):
+    pass
+
+
+class ESPrefer(_Module):
+    def __init__(self, type_, targetLabel=None, *args, **kwargs):
+        _Module.__init__(self, type_, *args, **kwargs)
+        self.__dict__['_targetLabel'] = targetLabel
+
+
+################################################################################
+## sequences, paths and tasks
+################################################################################
+class _SequenceCollection(object):
+    """the result of module * module or module + module"""
+    def __init__(self, *items):
+        self._items = []
+        for item in items:
+            self._append(item)
+    def _append(self, item):
+        if isinstance(item, _SequenceCollection):
+            self._items.extend(item._items)
+        elif isinstance(item, (_SequenceLeaf, _Sequenceable)):
+            self._items.append(item)
+        else:
+            raise TypeError("cannot add %s to a sequence" % type(item).__name__)
+    def __mul__(self, rhs):
+        self._append(rhs)
+        return self
+    __add__ = __mul__
+
+
+class _Sequenceable(_Labelable):
+    """common base of Sequence, Path, EndPath"""
+    def __init__(self, *items):
+        self.__dict__['_label'] = None
+        self._items = []
+        self._tasks = []
+        for item in items:
+            self._addItem(item)
+    def _addItem(self, item):
+        if isinstance(item, _SequenceCollection):
+            self._items.extend(item._items)
+        elif isinstance(item, Task):
+            self._tasks.append(item)
+        elif isinstance(item, (_SequenceLeaf, _Sequenceable)):
+            self._items.append(item)
+        else:
+            raise TypeError("cannot add %s to a %s" % (type(item).__name__, type(self).__name__))
+    def __mul__(self, rhs):
+        return _SequenceCollection(self, rhs)
+    __add__ = __mul__
+    def __imul__(self, rhs):
+        self._addItem(rhs)
+        return self
+    __iadd__ = __imul__
+    def visit(self, visitor):
+        for item in self._items:
+            if isinstance(item, _Sequenceable):
+                visitor.enter(item)
+                item.visit(visitor)
+                visitor.leave(item)
+            else:
+                item.visit(visitor)
+        for task in self._tasks:
+            visitor.enter(task)
+            task.visit(visitor)
+            visitor.leave(task)
+    def _leaves(self):
+        result = []
+        class _Collector(object):
+            def enter(self, visitee):
+                if isinstance(visitee, _Module):
+                    result.append(visitee)
+            def leave(self, visitee):
+                pass
+        self.visit(_Collector())
+        return result
+    def moduleNames(self):
+        return set([m.label_() for m in self._leaves() if m.label_() is not None])
+    def contains(self, module):
+        return module in self._leaves()
+    def remove(self, something):
+        """remove the first occurrence of something; returns True if found"""
+        for i, item in enumerate(self._items):
+            if item is something:
+                del self._items[i]
+                return True
+        for item in self._items:
+            if isinstance(item, _Sequenceable) and item.remove(something):
+                return True
+        for task in self._tasks:
+            if task.remove(something):
+                return True
+        return False
+    def replace(self, original, replacement):
+        """replace every occurrence of original; returns True if found"""
+        found = False
+        items = []
+        for item in self._items:
+            if item is original:
+                if isinstance(replacement, _SequenceCollection):
+                    items.extend(replacement._items)
+                else:
+                    items.append(replacement)
+                found = True
+                continue
+            if isinstance(item, _Sequenceable):
+                found = item.replace(original, replacement) or found
+            items.append(item)
+        self._items = items
+        for task in self._tasks:
+            found = task.replace(original, replacement) or found
+        return found
+    def associate(self, *tasks):
+        for task in tasks:
+            if not isinstance(task, Task):
+                raise TypeError("associate only works with a cms.Task")
+            self._tasks.append(task)
+    def copy(self):
+        other = type(self)()
+        other._items = list(self._items)
+        other._tasks = list(self._tasks)
+        return other
+    def expandAndClone(self):
+        return type(self)(*self._leaves())
+    def dumpPython(self, options=None):
+        names = []
+        for item in self._items:
+            names.append('process.' + str(item.label_()))
+        for task in self._tasks:
+            names.append('process.' + str(task.label_()))
+        return 'cms.%s(%s)\n' % (type(self).__name__, '+'.join(names))
+    def __repr__(self):
+        return '<%s %s>' % (type(self).__name__, self.label_())
+
+
+class Sequence(_Sequenceable):
+    pass
+class Path(_Sequenceable):
+    pass
+class EndPath(_Sequenceable):
+    pass
+
+
+class Task(_Labelable):
+    def __init__(self, *items):
+        self.__dict__['_label'] = None
+        self._items = []
+        self.add(*items)
+    def add(self, *items):
+        for item in items:
+            if isinstance(item, (_Sequenceable, _SequenceCollection)):
+                raise TypeError("a cms.Task can only hold modules and other tasks")
+            if not any(item is x for x in self._items):
+                self._items.append(item)
+    def visit(self, visitor):
+        for item in self._items:
+            visitor.enter(item)
+            if isinstance(item, Task):
+                item.visit(visitor)
+            visitor.leave(item)
+    def moduleNames(self):
+        names = set()
+        for item in self._items:
+            if isinstance(item, Task):
+                names |= item.moduleNames()
+            elif item.label_() is not None:
+                names.add(item.label_())
+        return names
+    def remove(self, something):
+        for i, item in enumerate(self._items):
+            if item is something:
+                del self._items[i]
+                return True
+        return False
+    def replace(self, original, replacement):
+        found = False
+        for i, item in enumerate(self._items):
+            if item is original:
+                self._items[i] = replacement
+                found = True
+            elif isinstance(item, Task):
+                found = item.replace(original, replacement) or found
+        return found
+    def dumpPython(self, options=None):
+        return 'cms.Task(%s)\n' % ', '.join(['process.' + str(x.label_()) for x in self._items])
+    def __repr__(self):
+        return '<Task %s>' % self.label_()
+
+
+class Schedule(list):
+    def __init__(self, *paths):
+        list.__init__(self, paths)
+
+
+################################################################################
+## process
+################################################################################
+class Process(object):
+    def __init__(self, name, *modifiers):
+        self.__dict__['_Process__name'] = name
+        self.__dict__['_Process__items'] = {}
+        for kind in ('producers', 'filters', 'analyzers', 'outputModules', 'es_producers',
+                     'es_sources', 'es_prefers', 'services', 'sequences', 'paths',
+                     'endpaths', 'tasks', 'psets', 'vpsets', 'loopers'):
+            self.__dict__['_Process__' + kind] = {}
+        self.__dict__['_Process__source'] = None
+        self.__dict__['_Process__schedule'] = None
+        self.__dict__['_Process__loadedModules'] = []
+        self.__dict__['maxEvents'] = PSet(input=untracked.int32(-1))
+        self.__dict__['options'] = PSet()
+
+    def name_(self):
+        return self.__name
+
+    def _container(self, value, name):
+        if isinstance(value, EDProducer):   return self.__producers
+        if isinstance(value, EDFilter):     return self.__filters
+        if isinstance(value, EDAnalyzer):   return self.__analyzers
+        if isinstance(value, OutputModule): return self.__outputModules
+        if isinstance(value, ESProducer):   return self.__es_producers
+        if isinstance(value, ESSource):     return self.__es_sources
+        if isinstance(value, ESPrefer):     return self.__es_prefers
+        if isinstance(value, Service):      return self.__services
+        if isinstance(value, Looper):       return self.__loopers
+        if isinstance(value, Path):         return self.__paths
+        if isinstance(value, EndPath):      return self.__endpaths
+        if isinstance(value, Sequence):     return self.__sequences
+        if isinstance(value, Task):         return self.__tasks
+        if isinstance(value, VPSet):        return self.__vpsets
+        if isinstance(value, PSet):         return self.__psets
+        return None
+
+    def __setattr__(self, name, value):
+        if name.startswith('_'):
+            self.__dict__[name] = value
+            return
+        if name == 'source':
+            self.__dict__['_Process__source'] = value
+            return
+        if name in ('maxEvents', 'options', 'maxLuminosityBlocks'):
+            self.__dict__[name] = value
+            return
+        if name == 'schedule':
+            self.__dict__['_Process__schedule'] = value
+            return
+        container = self._container(value, name)
+        if container is None:
+            raise TypeError("cannot attach object of type %s as '%s' to a cms.Process"
+                            % (type(value).__name__, name))
+        if isinstance(value, (_Sequenceable, Task)):
+            self._validateSequence(value, name)
+        if name in self.__items and self.__items[name] is not value:
+            old = self.__items[name]
+            self.__delattr__(name)
+            if isinstance(old, _Module) and isinstance(value, _Module):
+                # like CMSSW, a module redefined under the same label is
+                # also replaced in the sequences, paths and tasks using it
+                value.setLabel(None)
+                value.setLabel(name)
+                for kind in ('sequences', 'paths', 'endpaths', 'tasks'):
+                    for sequence in self.__dict__['_Process__' + kind].values():
+                        sequence.replace(old, value)
+        value.setLabel(name)
+        container[name] = value
+        self.__items[name] = value
+
+    def _validateSequence(self, sequence, label):
+        class _Validator(object):
+            def enter(self, visitee):
+                if isinstance(visitee, _Module) and visitee.label_() is None:
+                    raise RuntimeError("An entry in %s '%s' has no label (type %s)"
+                                       % (type(sequence).__name__, label, visitee.type_()))
+            def leave(self, visitee):
+                pass
+        sequence.visit(_Validator())
+
+    def __getattr__(self, name):
+        items = self.__dict__['_Process__items']
+        if name in items:
+            return items[name]
+        if name == 'source':
+            return self.__dict__['_Process__source']
+        if name == 'schedule':
+            return self.__dict__['_Process__schedule']
+        raise AttributeError("process '%s' has no attribute '%s'" % (self.__dict__['_Process__name'], name))
+
+    def __delattr__(self, name):
+        if name in self.__items:
+            value = self.__items.pop(name)
+            container = self._container(value, name)
+            if container is not None and name in container:
+                del container[name]
+            return
+        del self.__dict__[name]
+
+    def __contains__(self, name):
+        return name in self.__items
+
+    def add_(self, value):
+        if isinstance(value, Service):
+            self.__services[value.type_()] = value
+            self.__items[value.type_()] = value
+            return
+        raise TypeError("add_ only accepts cms.Service")
+
+    def producers_(self):     return dict(self.__producers)
+    def filters_(self):       return dict(self.__filters)
+    def analyzers_(self):     return dict(self.__analyzers)
+    def outputModules_(self): return dict(self.__outputModules)
+    def es_producers_(self):  return dict(self.__es_producers)
+    def es_sources_(self):    return dict(self.__es_sources)
+    def es_prefers_(self):    return dict(self.__es_prefers)
+    def services_(self):      return dict(self.__services)
+    def sequences_(self):     return dict(self.__sequences)
+    def paths_(self):         return dict(self.__paths)
+    def endpaths_(self):      return dict(self.__endpaths)
+    def tasks_(self):         return dict(self.__tasks)
+    def psets_(self):         return dict(self.__psets)
+    def vpsets_(self):        return dict(self.__vpsets)
+    def source_(self):        return self.__source
+    def schedule_(self):      return self.__schedule
+
+    def load(self, moduleName):
+        moduleName = moduleName.replace('/', '.')
+        module = __import__(moduleName)
+        for part in moduleName.split('.')[1:]:
+            module = getattr(module, part)
+        self.extend(module)
+
+    def extend(self, other, items=()):
+        if other.__name__ not in self.__loadedModules:
+            self.__loadedModules.append(other.__name__)
+        seqs = []
+        for name in dir(other):
+            if name.startswith('_'):
+                continue
+            item = getattr(other, name)
+            if name == 'source' and isinstance(item, Source):
+                self.source = item
+            elif isinstance(item, Service):
+                self.add_(item)
+            elif isinstance(item, (_Sequenceable, Task)):
+                seqs.append((name, item))
+            elif isinstance(item, (_Module, PSet, VPSet)):
+                self.__setattr__(name, item)
+        # sequences last so that their modules already carry a label
+        for name, item in seqs:
+            self.__setattr__(name, item)
+
+    def dumpPython(self, options=None):
+        lines = ["import FWCore.ParameterSet.Config as cms", "",
+                 "process = cms.Process(%r)" % self.__name, ""]
+        for kind in ('producers', 'filters', 'analyzers', 'outputModules', 'es_producers',
+                     'es_sources', 'es_prefers', 'services', 'psets', 'vpsets', 'tasks',
+                     'sequences', 'paths', 'endpaths'):
+            container = self.__dict__['_Process__' + kind]
+            for name in sorted(container):
+                lines.append('process.%s = %s' % (name, container[name].dumpPython()))
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+"""
+checkConfig.py builds the JetResponseAnalyzer configuration on any machine,
+without CMSSW, using the stand-in for FWCore.ParameterSet.Config and the
+CMSSW fragments found next to this script. It reports the build time, the
+module counts and the module dependency graph (DAG) of the process, which is
+enough to validate and benchmark changes to the configuration layer.
+
+Examples:
+  python checkConfig.py -a ak4pf ak4pfchs ak8puppi          # addAlgorithm per algorithm
+  python checkConfig.py -a ak4pf ak4pfchs --mode plan --dag  # planAlgorithms, print the DAG
+  python checkConfig.py -a ak4pf ak4pfchs --mode plan --merge # ... then mergeDuplicateModules
+  python checkConfig.py -c ../run_JRA_cfg.py --repeat 10     # any configuration file
+  python checkConfig.py -c ../run_JRA_cfg.py --dot jra.dot --dump jra_dump.py
+"""
+import os
+import sys
+import time
+import types
+import argparse
+
+configToolsDir  = os.path.dirname(os.path.abspath(__file__))
+jetAnalyzersDir = os.path.dirname(os.path.dirname(configToolsDir))
+
+
+################################################################################
+## environment
+################################################################################
+def setupStandIn():
+    """
+    put the stand-in FWCore in front of sys.path, register the stand-in
+    CMSSW fragments and map JetMETAnalysis.JetAnalyzers to this checkout
+    """
+    if configToolsDir not in sys.path:
+        sys.path.insert(0, configToolsDir)
+    import FWCore.ParameterSet.Config as cms
+    import standInExternals
+    standInExternals.installStandInExternals(cms)
+    if 'JetMETAnalysis.JetAnalyzers' not in sys.modules:
+        package = types.ModuleType('JetMETAnalysis')
+        package.__path__ = []
+        subPackage = types.ModuleType('JetMETAnalysis.JetAnalyzers')
+        subPackage.__path__ = [os.path.join(jetAnalyzersDir, 'python')]
+        package.JetAnalyzers = subPackage
+        sys.modules['JetMETAnalysis'] = package
+        sys.modules['JetMETAnalysis.JetAnalyzers'] = subPackage
+    return cms
+
+
+################################################################################
+## building the process
+################################################################################
+def buildFromAlgorithms(algorithms, mode, reco, merge = False):
+    """
+    build a minimal JRA process with addAlgorithm, planAlgorithms or
+    addAlgorithms, optionally followed by mergeDuplicateModules
+    """
+    import FWCore.ParameterSet.Config as cms
+    import JetMETAnalysis.JetAnalyzers.Defaults_cff as Defaults
+    from JetMETAnalysis.JetAnalyzers import addAlgorithm
+    process = cms.Process('JRA')
+    process.options = cms.untracked.PSet(wantSummary = cms.untracked.bool(True))
+    process.load('CommonTools.ParticleFlow.pfNoPileUpJME_cff')
+    if mode == 'plan':
+        addAlgorithm.planAlgorithms(process, algorithms, Defaults, reco, False)
+    elif mode == 'one':
+        addAlgorithm.addAlgorithms(process, algorithms, Defaults, reco, False)
+    else:
+        for algorithm in algorithms:
+            addAlgorithm.addAlgorithm(process, algorithm, Defaults, reco, False)
+    if merge:
+        addAlgorithm.mergeDuplicateModules(process)
+    return process
+
+
+def buildFromConfig(fileName):
+    """ execute a configuration file and return its process """
+    namespace = {'__name__' : '__main__', '__file__' : fileName}
+    exec(compile(open(fileName).read(), fileName, 'exec'), namespace)
+    if 'process' not in namespace:
+        raise RuntimeError(fileName + " does not define a process")
+    return namespace['process']
+
+
+class _Quiet(object):
+    """ swallows what the configuration prints while it is built """
+    def write(self, text):
+        pass
+    def flush(self):
+        pass
+
+
+def timedBuild(build, repeat, quiet):
+    """ run build() repeat times, return the last process and the build times """
+    times = []
+    process = None
+    for i in range(repeat):
+        stdout = sys.stdout
+        if quiet:
+            sys.stdout = _Quiet()
+        try:
+            start = time.time()
+            process = build()
+            times.append(time.time() - start)
+        finally:
+            sys.stdout = stdout
+    return process, times
+
+
+################################################################################
+## inspecting the process
+################################################################################
+moduleKinds = ['producers', 'filters', 'analyzers', 'outputModules',
+               'es_producers', 'es_sources', 'es_prefers', 'services']
+scheduleKinds = ['sequences', 'paths', 'endpaths', 'tasks']
+
+def countModules(process):
+    """ number of items of every kind in the process """
+    counts = {}
+    for kind in moduleKinds + scheduleKinds:
+        counts[kind] = len(getattr(process, kind + '_')())
+    return counts
+
+
+class _Leaves(object):
+    """ visitor collecting the labels of the modules in a path """
+    def __init__(self):
+        self.labels = set()
+    def enter(self, visitee):
+        if hasattr(visitee, 'type_') and visitee.label_() is not None:
+            self.labels.add(visitee.label_())
+    def leave(self, visitee):
+        pass
+
+
+def scheduledModules(process):
+    """ labels of the modules reachable from a path or endpath """
+    leaves = _Leaves()
+    for path in list(process.paths_().values()) + list(process.endpaths_().values()):
+        path.visit(leaves)
+    return leaves.labels
+
+
+def inputLabels(parameters):
+    """ module labels of all InputTags & VInputTags, also inside (V)PSets """
+    import FWCore.ParameterSet.Config as cms
+    labels = []
+    for value in parameters.parameters_().values():
+        if isinstance(value, cms.InputTag):
+            labels.append(value.getModuleLabel())
+        elif isinstance(value, cms.VInputTag):
+            for tag in value:
+                labels.append(str(tag).split(':')[0])
+        elif isinstance(value, cms.PSet):
+            labels.extend(inputLabels(value))
+        elif isinstance(value, cms.VPSet):
+            for pset in value:
+                labels.extend(inputLabels(pset))
+    return labels
+
+
+def moduleDAG(process):
+    """ map every EDM module label to the labels of the modules it reads from """
+    modules = {}
+    for kind in ('producers', 'filters', 'analyzers', 'outputModules'):
+        modules.update(getattr(process, kind + '_')())
+    dag = {}
+    for label, module in modules.items():
+        dag[label] = sorted(set([l for l in inputLabels(module) if l in modules and l != label]))
+    return dag
+
+
+def dagDepth(dag):
+    """ length of the longest dependency chain """
+    depth = {}
+    def visit(label, stack):
+        if label in depth:
+            return depth[label]
+        if label in stack:
+            raise RuntimeError("dependency cycle through " + label)
+        stack.add(label)
+        depth[label] = 1 + max([visit(dep, stack) for dep in dag[label]] + [0])
+        stack.discard(label)
+        return depth[label]
+    return max([visit(label, set()) for label in dag] + [0])
+
+
+def writeDot(process, dag, fileName):
+    """ write the module DAG in graphviz format, scheduled modules filled """
+    scheduled = scheduledModules(process)
+    dot = open(fileName, 'w')
+    dot.write('digraph "%s" {\n  rankdir=LR;\n' % process.name_())
+    for label in sorted(dag):
+        style = ' style=filled' if label in scheduled else ''
+        dot.write('  "%s" [label="%s\\n%s"%s];\n' % (label, label, getattr(process, label).type_(), style))
+    for label in sorted(dag):
+        for dep in dag[label]:
+            dot.write('  "%s" -> "%s";\n' % (dep, label))
+    dot.write('}\n')
+    dot.close()
+
+
+################################################################################
+## main
+################################################################################
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Build the JRA configuration without CMSSW "
+                                     "and report module counts, module DAG and build time.")
+    source = parser.add_mutually_exclusive_group(required = True)
+    source.add_argument('-a', '--algorithms', nargs = '+', help = "algorithms to configure, e.g. ak4pfchs")
+    source.add_argument('-c', '--config', help = "configuration file defining process, e.g. ../run_JRA_cfg.py")
+    parser.add_argument('--mode', choices = ['add', 'plan', 'one'], default = 'add',
+                        help = "with -a: addAlgorithm per algorithm, planAlgorithms or addAlgorithms")
+    parser.add_argument('--merge', action = 'store_true', help = "with -a: run mergeDuplicateModules after the build")
+    parser.add_argument('--noreco', action = 'store_true', help = "with -a: use the jets from the input file")
+    parser.add_argument('--repeat', type = int, default = 1, help = "build the process this many times")
+    parser.add_argument('--dag', action = 'store_true', help = "print the module DAG")
+    parser.add_argument('--dot', help = "write the module DAG to this graphviz file")
+    parser.add_argument('--dump', help = "write process.dumpPython() to this file")
+    parser.add_argument('-v', '--verbose', action = 'store_true', help = "show what the configuration prints")
+    args = parser.parse_args(argv)
+
+    setupStandIn()
+    if args.algorithms:
+        build = lambda: buildFromAlgorithms(args.algorithms, args.mode, not args.noreco, args.merge)
+    else:
+        configFile = os.path.abspath(args.config)
+        build = lambda: buildFromConfig(configFile)
+    process, times = timedBuild(build, max(1, args.repeat), not args.verbose)
+
+    counts = countModules(process)
+    dag = moduleDAG(process)
+    scheduled = scheduledModules(process)
+    print("checkConfig: built process '%s' in %.4f s" % (process.name_(), times[0]))
+    if len(times) > 1:
+        print("  %i builds: min %.4f s, mean %.4f s, max %.4f s"
+              % (len(times), min(times), sum(times) / len(times), max(times)))
+    print("  modules:  " + ", ".join(["%i %s" % (counts[kind], kind) for kind in moduleKinds]))
+    print("  schedule: " + ", ".join(["%i %s" % (counts[kind], kind) for kind in scheduleKinds]))
+    print("  scheduled modules: %i of %i EDM modules" % (len(scheduled), len(dag)))
+    print("  module DAG: %i nodes, %i edges, depth %i"
+          % (len(dag), sum([len(deps) for deps in dag.values()]), dagDepth(dag)))
+    if args.dag:
+        for label in sorted(dag):
+            print("    %-45s <- %s" % (label, ", ".join(dag[label])))
+    if args.dot:
+        writeDot(process, dag, args.dot)
+        print("  wrote " + args.dot)
+    if args.dump:
+        dump = open(args.dump, 'w')
+        dump.write(process.dumpPython())
+        dump.close()
+        print("  wrote " + args.dump)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,280 @@
+"""
+Stand-ins for the CMSSW configuration fragments imported by the JetAnalyzers
+python configuration, used by checkConfig.py. Only the module labels, types and
+the parameters that the JRA configuration reads or modifies are reproduced.
+"""
+import sys
+import types
+
+
+def _module(name, namespace):
+    parts = name.split('.')
+    for i in range(1, len(parts)):
+        parent = '.'.join(parts[:i])
+        if parent not in sys.modules:
+            package = types.ModuleType(parent)
+            package.__path__ = []
+            sys.modules[parent] = package
+            if i > 1:
+                setattr(sys.modules['.'.join(parts[:i-1])], parts[i-1], package)
+    module = types.ModuleType(name)
+    # a star import of a real cff also exports the cms namespace
+    module.cms = sys.modules['FWCore.ParameterSet.Config']
+    module.__dict__.update(namespace)
+    sys.modules[name] = module
+    if len(parts) > 1:
+        setattr(sys.modules['.'.join(parts[:-1])], parts[-1], module)
+    return module
+
+
+def _jetProducer(cms, jetType, src, rParam, **extra):
+    return cms.EDProducer('FastjetJetProducer',
+        jetAlgorithm   = cms.string('AntiKt'),
+        rParam         = cms.double(rParam),
+        src            = cms.InputTag(src),
+        jetType        = cms.string(jetType),
+        jetPtMin       = cms.double(5.0),
+        doAreaFastjet  = cms.bool(False),
+        doRhoFastjet   = cms.bool(False),
+        Ghost_EtaMax   = cms.double(5.0),
+        Rho_EtaMax     = cms.double(4.4),
+        **extra
+    )
+
+
+def _jetCorrections(cms):
+    """JetMETCorrections.Configuration: services, correctors and corrected jets"""
+    ns = {}
+    types_ = [('Calo', 'AK%dCalo', 'CorrectedCaloJetProducer'),
+              ('PF',   'AK%dPF',   'CorrectedPFJetProducer'),
+              ('PFCHS','AK%dPFchs','CorrectedPFJetProducer')]
+    for r in range(1, 11):
+        for (t, payload, corrType) in types_:
+            alg = 'ak%d%s' % (r, t)
+            ns[alg+'L1Offset']   = cms.ESProducer('L1OffsetCorrectionESProducer',
+                                                  level=cms.string('L1Offset'),
+                                                  algorithm=cms.string(payload % r),
+                                                  vertexCollection=cms.string('offlinePrimaryVertices'),
+                                                  minVtxNdof=cms.int32(4))
+            ns[alg+'L1Fastjet']  = cms.ESProducer('L1FastjetCorrectionESProducer',
+                                                  level=cms.string('L1FastJet'),
+                                                  algorithm=cms.string(payload % r),
+                                                  srcRho=cms.InputTag('fixedGridRhoFastjetAll'))
+            ns[alg+'L2Relative'] = cms.ESProducer('LXXXCorrectionESProducer',
+                                                  level=cms.string('L2Relative'),
+                                                  algorithm=cms.string(payload % r))
+            ns[alg+'L3Absolute'] = cms.ESProducer('LXXXCorrectionESProducer',
+                                                  level=cms.string('L3Absolute'),
+                                                  algorithm=cms.string(payload % r))
+            ns[alg+'L2L3']       = cms.ESProducer('JetCorrectionESChain',
+                                                  correctors=cms.vstring(alg+'L2Relative', alg+'L3Absolute'))
+            ns[alg+'L1FastL2L3'] = cms.ESProducer('JetCorrectionESChain',
+                                                  correctors=cms.vstring(alg+'L1Fastjet', alg+'L2Relative', alg+'L3Absolute'))
+
+            ns[alg+'L1FastjetCorrector']  = cms.EDProducer('L1FastjetCorrectorProducer',
+                                                           level=cms.string('L1FastJet'),
+                                                           algorithm=cms.string(payload % r),
+                                                           srcRho=cms.InputTag('fixedGridRhoFastjetAll'))
+            ns[alg+'L2RelativeCorrector'] = cms.EDProducer('LXXXCorrectorProducer',
+                                                           level=cms.string('L2Relative'),
+                                                           algorithm=cms.string(payload % r))
+            ns[alg+'L3AbsoluteCorrector'] = cms.EDProducer('LXXXCorrectorProducer',
+                                                           level=cms.string('L3Absolute'),
+                                                           algorithm=cms.string(payload % r))
+            ns[alg+'L2L3Corrector']       = cms.EDProducer('ChainedJetCorrectorProducer',
+                                                           correctors=cms.VInputTag(alg+'L2RelativeCorrector',
+                                                                                    alg+'L3AbsoluteCorrector'))
+            ns[alg+'L1FastL2L3Corrector'] = cms.EDProducer('ChainedJetCorrectorProducer',
+                                                           correctors=cms.VInputTag(alg+'L1FastjetCorrector',
+                                                                                    alg+'L2RelativeCorrector',
+                                                                                    alg+'L3AbsoluteCorrector'))
+            ns[alg+'L1FastjetCorrectorChain'] = cms.Sequence(ns[alg+'L1FastjetCorrector'])
+            ns[alg+'L2L3CorrectorChain'] = cms.Sequence(ns[alg+'L2RelativeCorrector'] *
+                                                        ns[alg+'L3AbsoluteCorrector'] *
+                                                        ns[alg+'L2L3Corrector'])
+            ns[alg+'L1FastL2L3CorrectorChain'] = cms.Sequence(ns[alg+'L1FastjetCorrector'] *
+                                                              ns[alg+'L2RelativeCorrector'] *
+                                                              ns[alg+'L3AbsoluteCorrector'] *
+                                                              ns[alg+'L1FastL2L3Corrector'])
+
+            jets = 'ak%d%sJets' % (r, t)
+            ns[jets+'L1']   = cms.EDProducer(corrType, src=cms.InputTag(jets),
+                                             correctors=cms.VInputTag(alg+'L1FastjetCorrector'))
+            ns[jets+'L2L3'] = cms.EDProducer(corrType, src=cms.InputTag(jets),
+                                             correctors=cms.VInputTag(alg+'L2L3Corrector'))
+            ns[jets+'L1FastL2L3'] = cms.EDProducer(corrType, src=cms.InputTag(jets),
+                                                   correctors=cms.VInputTag(alg+'L1FastL2L3Corrector'))
+    for level in ('L1', 'L2L3', 'L1FastL2L3'):
+        corrector = {'L1': 'ak4JPTL1FastjetCorrector'}.get(level, 'ak4JPT%sCorrector' % level)
+        ns['ak4JPTJets'+level] = cms.EDProducer('CorrectedJPTJetProducer',
+                                                src=cms.InputTag('ak4JPTJets'),
+                                                correctors=cms.VInputTag(corrector))
+    return ns
+
+
+def installStandInExternals(cms):
+    """register stand-ins for the CMSSW fragments in sys.modules"""
+    _module('Configuration.Geometry.GeometryIdeal_cff', {})
+    _module('Configuration.StandardSequences.MagneticField_cff', {})
+    for name in ('FrontierConditions_GlobalTag_cff', 'FrontierConditions_GlobalTag_condDBv2_cff'):
+        _module('Configuration.StandardSequences.' + name, {
+            'GlobalTag': cms.ESSource('PoolDBESSource', globaltag=cms.string(''))})
+    _module('CondCore.DBCommon.CondDBSetup_cfi', {
+        'CondDBSetup': cms.PSet(DBParameters=cms.PSet(messageLevel=cms.untracked.int32(0)))})
+    _module('CondCore.DBCommon.CondDBCommon_cfi', {
+        'CondDBCommon': cms.PSet(connect=cms.string(''),
+                                 DBParameters=cms.PSet(messageLevel=cms.untracked.int32(0)))})
+    _module('FWCore.MessageLogger.MessageLogger_cfi', {
+        'MessageLogger': cms.Service('MessageLogger',
+                                     cerr=cms.untracked.PSet(
+                                         FwkReport=cms.untracked.PSet(reportEvery=cms.untracked.int32(1))))})
+    _module('CommonTools.UtilAlgos.TFileService_cfi', {
+        'TFileService': cms.Service('TFileService', fileName=cms.string('histo.root'))})
+
+    ## particles and gen jets
+    genParticlesForJets = cms.EDProducer('InputGenJetsParticleSelector',
+                                         src=cms.InputTag('genParticles'),
+                                         ignoreParticleIDs=cms.vuint32(1000022, 1000012, 1000014, 1000016),
+                                         partonicFinalState=cms.bool(False),
+                                         excludeResonances=cms.bool(False),
+                                         excludeFromResonancePids=cms.vuint32(),
+                                         tausAsJets=cms.bool(False))
+    genParticlesForJetsNoNu = genParticlesForJets.clone(ignoreParticleIDs=[1000022, 12, 14, 16])
+    genParticlesForJetsNoMuNoNu = genParticlesForJets.clone(ignoreParticleIDs=[1000022, 12, 13, 14, 16])
+    _module('RecoJets.Configuration.GenJetParticles_cff', {
+        'genParticlesForJets': genParticlesForJets,
+        'genParticlesForJetsNoNu': genParticlesForJetsNoNu,
+        'genParticlesForJetsNoMuNoNu': genParticlesForJetsNoMuNoNu,
+        'genJetParticles': cms.Sequence(genParticlesForJets)})
+    ak4GenJets = _jetProducer(cms, 'GenJet', 'genParticlesForJets', 0.4)
+    ak8GenJets = ak4GenJets.clone(rParam=0.8)
+    _module('RecoJets.Configuration.RecoGenJets_cff', {
+        'ak4GenJets': ak4GenJets,
+        'ak8GenJets': ak8GenJets,
+        'ak4GenJetsNoNu': ak4GenJets.clone(src='genParticlesForJetsNoNu'),
+        'ak8GenJetsNoNu': ak8GenJets.clone(src='genParticlesForJetsNoNu'),
+        'ak4GenJetsNoMuNoNu': ak4GenJets.clone(src='genParticlesForJetsNoMuNoNu'),
+        'ak8GenJetsNoMuNoNu': ak8GenJets.clone(src='genParticlesForJetsNoMuNoNu')})
+
+    ## reco jets
+    ak4CaloJets = _jetProducer(cms, 'CaloJet', 'towerMaker', 0.4)
+    kt6CaloJets = ak4CaloJets.clone(jetAlgorithm='Kt', rParam=0.6)
+    _module('RecoJets.Configuration.RecoJets_cff', {
+        'ak4CaloJets': ak4CaloJets,
+        'kt6CaloJets': kt6CaloJets})
+    ak4PFJets = _jetProducer(cms, 'PFJet', 'particleFlow', 0.4)
+    _module('RecoJets.Configuration.RecoPFJets_cff', {
+        'ak4PFJets': ak4PFJets,
+        'ak8PFJets': ak4PFJets.clone(rParam=0.8),
+        'kt6PFJets': ak4PFJets.clone(jetAlgorithm='Kt', rParam=0.6),
+        'fixedGridRhoFastjetAll': cms.EDProducer('FixedGridRhoProducerFastjet',
+                                                 pfCandidatesTag=cms.InputTag('particleFlow'),
+                                                 maxRapidity=cms.double(5.0),
+                                                 gridSpacing=cms.double(0.55))})
+    trackWithVertexRefSelector = cms.EDFilter('TrackWithVertexRefSelector',
+                                              src=cms.InputTag('generalTracks'),
+                                              nVertices=cms.uint32(1),
+                                              ptErrorCut=cms.double(5.0))
+    trackRefsForJets = cms.EDProducer('ChargedRefCandidateProducer',
+                                      src=cms.InputTag('trackWithVertexRefSelector'))
+    _module('RecoJets.Configuration.RecoTrackJets_cff', {
+        'trackWithVertexRefSelector': trackWithVertexRefSelector,
+        'trackRefsForJets': trackRefsForJets,
+        'ak4TrackJets': _jetProducer(cms, 'TrackJet', 'trackRefsForJets', 0.4,
+                                     UseOnlyVertexTracks=cms.bool(True),
+                                     UseOnlyOnePV=cms.bool(True),
+                                     DxyTrVtxMax=cms.double(0.0),
+                                     DzTrVtxMax=cms.double(0.0))})
+    jpt = cms.EDProducer('JetPlusTrackProducer',
+                         src=cms.InputTag('ak4CaloJets'),
+                         ptCUT=cms.double(15.0))
+    _module('RecoJets.JetPlusTracks.JetPlusTrackCorrections_cff', {
+        'JetPlusTrackZSPCorJetAntiKt4': jpt,
+        'JetPlusTrackCorrectionsAntiKt4': cms.Sequence(jpt)})
+
+    ## corrections
+    corrections = _jetCorrections(cms)
+    _module('JetMETCorrections.Configuration.JetCorrectionServicesAllAlgos_cff',
+            dict([(k, v) for (k, v) in corrections.items() if isinstance(v, cms.ESProducer)]))
+    _module('JetMETCorrections.Configuration.JetCorrectorsAllAlgos_cff',
+            dict([(k, v) for (k, v) in corrections.items()
+                  if k.endswith('Corrector') or k.endswith('CorrectorChain')]))
+    _module('JetMETCorrections.Configuration.CorrectedJetProducersAllAlgos_cff',
+            dict([(k, v) for (k, v) in corrections.items() if 'Jets' in k]))
+    _module('JetMETCorrections.Configuration.CorrectedJetProducersDefault_cff', {})
+    _module('JetMETCorrections.Configuration.CorrectedJetProducers_cff', {})
+    _module('JetMETCorrections.Configuration.JetCorrectors_cff', {})
+
+    ## pileup
+    _module('CommonTools.PileupAlgos.Puppi_cff', {
+        'puppi': cms.EDProducer('PuppiProducer',
+                                candName=cms.InputTag('particleFlow'),
+                                vertexName=cms.InputTag('offlinePrimaryVertices'))})
+    particleFlowPtrs = cms.EDProducer('PFCandidateFwdPtrProducer', src=cms.InputTag('particleFlow'))
+    goodOfflinePrimaryVertices = cms.EDFilter('PrimaryVertexObjectFilter',
+                                              src=cms.InputTag('offlinePrimaryVertices'))
+    pfPileUpJME = cms.EDProducer('PFPileUp',
+                                 PFCandidates=cms.InputTag('particleFlowPtrs'),
+                                 Vertices=cms.InputTag('goodOfflinePrimaryVertices'),
+                                 checkClosestZVertex=cms.bool(True))
+    pfNoPileUpJME = cms.EDProducer('TPPFCandidatesOnPFCandidates',
+                                   topCollection=cms.InputTag('pfPileUpJME'),
+                                   bottomCollection=cms.InputTag('particleFlowPtrs'))
+    _module('CommonTools.ParticleFlow.pfNoPileUpJME_cff', {
+        'particleFlowPtrs': particleFlowPtrs,
+        'goodOfflinePrimaryVertices': goodOfflinePrimaryVertices,
+        'pfPileUpJME': pfPileUpJME,
+        'pfNoPileUpJME': pfNoPileUpJME,
+        'pfNoPileUpJMESequence': cms.Sequence(goodOfflinePrimaryVertices * particleFlowPtrs *
+                                              pfPileUpJME * pfNoPileUpJME)})
+
+    ## taus
+    _module('RecoTauTag.TauTagTools.tauDecayModes_cfi', {
+        'tauToOneProng0PiZero': 0,
+        'tauToOneProng1PiZero': 1,
+        'tauToOneProng2PiZero': 2,
+        'tauToThreeProng0PiZero': 10})
+    hpsPFTauProducer = cms.EDProducer('RecoTauPiZeroUnembedder', src=cms.InputTag('hpsPFTauProducerSansRefs'))
+    combinatoricRecoTaus = cms.EDProducer('RecoTauProducer', jetSrc=cms.InputTag('ak4PFJetsRecoTauChargedHadrons'))
+    recoTauAK4PFJets08Region = cms.EDProducer('RecoTauJetRegionProducer', src=cms.InputTag('ak4PFJets'))
+    tauNs = {
+        'recoTauAK4PFJets08Region': recoTauAK4PFJets08Region,
+        'combinatoricRecoTaus': combinatoricRecoTaus,
+        'hpsPFTauProducer': hpsPFTauProducer,
+    }
+    hpsSequence = [combinatoricRecoTaus, hpsPFTauProducer]
+    for name in ('hpsPFTauDiscriminationByDecayModeFinding',
+                 'hpsPFTauDiscriminationByLooseElectronRejection',
+                 'hpsPFTauDiscriminationByTightMuonRejection',
+                 'hpsPFTauDiscriminationByLooseCombinedIsolationDBSumPtCorr3Hits',
+                 'hpsPFTauDiscriminationByMediumCombinedIsolationDBSumPtCorr3Hits',
+                 'hpsPFTauDiscriminationByTightCombinedIsolationDBSumPtCorr3Hits'):
+        tauNs[name] = cms.EDProducer('PFRecoTauDiscriminationByHPSSelection',
+                                     PFTauProducer=cms.InputTag('hpsPFTauProducer'),
+                                     discriminator=cms.string(name))
+        hpsSequence.append(tauNs[name])
+    tauNs['recoTauCommonSequence'] = cms.Sequence(recoTauAK4PFJets08Region)
+    seq = cms.Sequence(hpsSequence[0])
+    for module in hpsSequence[1:]:
+        seq += module
+    tauNs['recoTauClassicHPSSequence'] = seq
+    tauNs['recoTauHPSTancSequence'] = cms.Sequence(combinatoricRecoTaus)
+    _module('RecoTauTag.Configuration.RecoPFTauTag_cff', tauNs)
+    _module('RecoTauTag.Configuration.HPSPFTaus_cff', {'hpsPFTauProducer': hpsPFTauProducer})
+    _module('RecoTauTag.TauTagTools.PFTauSelector_cfi', {
+        'pfTauSelector': cms.EDFilter('PFTauSelector',
+                                      src=cms.InputTag('fixedConePFTauProducer'),
+                                      discriminators=cms.VPSet(),
+                                      cut=cms.string(''))})
+    tauGenJets = cms.EDProducer('TauGenJetProducer',
+                                GenParticles=cms.InputTag('genParticles'),
+                                includeNeutrinos=cms.bool(False))
+    _module('PhysicsTools.JetMCAlgos.TauGenJets_cfi', {'tauGenJets': tauGenJets})
+    _module('PhysicsTools.JetMCAlgos.TauGenJetsDecayModeSelectorAllHadrons_cfi', {
+        'tauGenJetsSelectorAllHadrons': cms.EDFilter('TauGenJetDecayModeSelector',
+                                                     src=cms.InputTag('tauGenJets'),
+                                                     select=cms.vstring('oneProng0Pi0', 'oneProng1Pi0'),
+                                                     filter=cms.bool(False))})
+    def massSearchReplaceParam(sequence, paramName, paramOldValue, paramValue, verbose=False):
+        pass
+    _module('PhysicsTools.PatAlgos.tools.helpers', {'massSearchReplaceParam': massSearchReplaceParam})
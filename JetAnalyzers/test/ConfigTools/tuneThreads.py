@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+"""
+tuneThreads.py finds the numberOfThreads/numberOfStreams giving the highest
+throughput for a JRA configuration on the node it runs on. It runs cmsRun on
+the first --events events of the configuration's input at every setting,
+measures the events per second (event loop real time per event from the
+framework summary) and the peak RSS, and stores the best setting which stays
+below --max-rss in jraThreads.json next to the configuration (see
+python/threadTuning.py), from where the configuration picks it up with
+tuneThreads = True.
+
+Needs a CMSSW environment. Examples:
+  python tuneThreads.py ../run_JRA_cfg.py                          # 1,2,4,... threads up to the cores available
+  python tuneThreads.py ../run_JRA_cfg.py --threads 4 8 16 --max-rss 8000 --events 1000
+"""
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+## this directory holds the stand-in FWCore of checkConfig.py, which must not
+## shadow the one of CMSSW
+scriptDir = os.path.dirname(os.path.abspath(__file__))
+sys.path = [path for path in sys.path if os.path.abspath(path or os.curdir) != scriptDir]
+
+from JetMETAnalysis.JetAnalyzers.threadTuning import availableCores, tuningFileFor, tuningKey, writeTuning
+
+passTemplate = """
+import FWCore.ParameterSet.Config as cms
+namespace = {'__name__' : '__main__', '__file__' : %(config)r}
+exec(compile(open(%(config)r).read(), %(config)r, 'exec'), namespace)
+process = namespace['process']
+process.maxEvents.input = cms.untracked.int32(%(events)i)
+process.options.wantSummary = cms.untracked.bool(True)
+process.options.numberOfThreads = cms.untracked.uint32(%(threads)i)
+process.options.numberOfStreams = cms.untracked.uint32(%(streams)i)
+if hasattr(process, 'TFileService'):
+    process.TFileService.fileName = cms.string(%(output)r)
+for output in process.outputModules_().values():
+    output.fileName = cms.untracked.string(%(output)r)
+"""
+
+realPerEvent = re.compile(r'event loop Real/event\s*=\s*([0-9.eE+-]+)')
+
+
+################################################################################
+## calibration passes
+################################################################################
+algorithmsTemplate = """
+import json
+namespace = {'__name__' : '__main__', '__file__' : %(config)r}
+exec(compile(open(%(config)r).read(), %(config)r, 'exec'), namespace)
+print(json.dumps(list(namespace.get('algorithms', []))))
+"""
+
+def configAlgorithms(config):
+    """
+    the algorithms list of the configuration, which keys the tuned settings.
+    The configuration is built in a python of its own, next to it as cmsRun
+    would, not in this process.
+    """
+    config = os.path.abspath(config)
+    job = subprocess.Popen([sys.executable, '-c', algorithmsTemplate % {'config' : config}],
+                           cwd = os.path.dirname(config), stdout = subprocess.PIPE)
+    output = job.communicate()[0]
+    if job.returncode != 0:
+        raise RuntimeError("could not build %s to read its algorithms" % config)
+    ## the list is printed last, after whatever the configuration prints
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def settings(threads, streamsPerThread):
+    """ the (threads, streams) pairs to try """
+    pairs = []
+    for nThreads in threads:
+        for fraction in streamsPerThread:
+            nStreams = max(1, int(round(nThreads * fraction)))
+            if (nThreads, nStreams) not in pairs:
+                pairs.append((nThreads, nStreams))
+    return pairs
+
+
+class PassFailed(RuntimeError):
+    """ a calibration pass which failed, measurement holds its setting, peak RSS and the reason """
+    def __init__(self, message, measurement):
+        RuntimeError.__init__(self, message)
+        self.measurement = measurement
+
+
+def calibrationPass(config, events, threads, streams, workDir):
+    """
+    run cmsRun over events events with threads threads and streams streams,
+    return a dict with the events per second, the peak RSS in MB and the
+    wall clock time. Raises PassFailed if cmsRun fails or is killed.
+    """
+    name = 'pass_%it_%is' % (threads, streams)
+    passConfig = os.path.join(workDir, name + '_cfg.py')
+    passFile = open(passConfig, 'w')
+    passFile.write(passTemplate % {'config'  : config,
+                                   'events'  : events,
+                                   'threads' : threads,
+                                   'streams' : streams,
+                                   'output'  : os.path.join(workDir, name + '.root')})
+    passFile.close()
+    logName = os.path.join(workDir, name + '.log')
+    log = open(logName, 'w')
+    start = time.time()
+    job = subprocess.Popen(['cmsRun', passConfig], stdout = log, stderr = subprocess.STDOUT)
+    (pid, status, usage) = os.wait4(job.pid, 0)
+    wall = time.time() - start
+    log.close()
+    ## a pass killed by a signal (e.g. SIGKILL when out of memory) failed too
+    failure = None
+    if os.WIFSIGNALED(status):
+        failure = "killed by signal %i" % os.WTERMSIG(status)
+    elif os.WEXITSTATUS(status) != 0:
+        failure = "exit code %i" % os.WEXITSTATUS(status)
+    if failure is not None:
+        raise PassFailed("cmsRun failed (%s) with %i threads and %i streams, see %s"
+                         % (failure, threads, streams, logName),
+                         {'numberOfThreads' : threads,
+                          'numberOfStreams' : streams,
+                          'failed'          : failure,
+                          'peakRSS'         : usage.ru_maxrss / 1024.,
+                          'wallTime'        : wall})
+    match = realPerEvent.search(open(logName).read())
+    if match and float(match.group(1)) > 0:
+        eventsPerSecond = 1. / float(match.group(1))
+    else:
+        eventsPerSecond = events / wall
+    return {'numberOfThreads' : threads,
+            'numberOfStreams' : streams,
+            'eventsPerSecond' : eventsPerSecond,
+            'peakRSS'         : usage.ru_maxrss / 1024.,
+            'wallTime'        : wall}
+
+
+def bestSetting(measurements, maxRSS, tolerance):
+    """
+    the measurement with the highest events per second below maxRSS MB;
+    within tolerance of the best throughput fewer threads, then less memory
+    win. Failed passes are skipped.
+    """
+    allowed = [m for m in measurements if 'failed' not in m and (maxRSS is None or m['peakRSS'] <= maxRSS)]
+    if len(allowed) == 0:
+        return None
+    fastest = max([m['eventsPerSecond'] for m in allowed])
+    good = [m for m in allowed if m['eventsPerSecond'] >= (1. - tolerance) * fastest]
+    good.sort(key = lambda m: (m['numberOfThreads'], m['peakRSS']))
+    return good[0]
+
+
+################################################################################
+## main
+################################################################################
+def main(argv = None):
+    cores = availableCores()
+    defaultThreads = [n for n in (1, 2, 4, 8, 16, 32) if n < cores] + [cores]
+    parser = argparse.ArgumentParser(description = "Tune numberOfThreads/numberOfStreams of a "
+                                     "JRA configuration with short cmsRun calibration passes.")
+    parser.add_argument('config', help = "configuration file, e.g. ../run_JRA_cfg.py")
+    parser.add_argument('--events', type = int, default = 500, help = "events per calibration pass")
+    parser.add_argument('--threads', type = int, nargs = '+', default = defaultThreads,
+                        help = "numbers of threads to try (default: %s)" % defaultThreads)
+    parser.add_argument('--streams-per-thread', type = float, nargs = '+', default = [1., 0.5],
+                        dest = 'streamsPerThread', help = "numbers of streams to try, per thread")
+    parser.add_argument('--max-rss', type = float, dest = 'maxRSS',
+                        help = "peak RSS limit of the slot in MB")
+    parser.add_argument('--tolerance', type = float, default = 0.05,
+                        help = "throughput within this fraction of the best counts as equally good")
+    parser.add_argument('--warmup', type = int, default = 20,
+                        help = "events of a first, unmeasured pass which warms the file caches")
+    parser.add_argument('--tuning-file', dest = 'tuningFile', default = None,
+                        help = "where to store the best setting (default: jraThreads.json next to the configuration)")
+    parser.add_argument('--keep', action = 'store_true', help = "keep the pass configurations and logs")
+    args = parser.parse_args(argv)
+
+    config = os.path.abspath(args.config)
+    if args.tuningFile is None:
+        args.tuningFile = tuningFileFor(config)
+    key = tuningKey(configAlgorithms(config), cores)
+    workDir = tempfile.mkdtemp(prefix = 'tuneThreads_')
+    print("tuneThreads: %s, %i events per pass, work directory %s" % (key, args.events, workDir))
+
+    if args.warmup > 0:
+        try:
+            calibrationPass(config, args.warmup, 1, 1, workDir)
+        except PassFailed as error:
+            print("tuneThreads: warm-up pass failed, going on without: %s" % error)
+    ## a failed setting (e.g. killed when out of memory) is kept as failed,
+    ## the other settings are still tried
+    measurements = []
+    for (threads, streams) in settings(args.threads, args.streamsPerThread):
+        try:
+            measurement = calibrationPass(config, args.events, threads, streams, workDir)
+        except PassFailed as error:
+            measurement = error.measurement
+            measurements.append(measurement)
+            print("  %3i threads %3i streams: FAILED (%s), peak RSS %8.1f MB, %7.1f s"
+                  % (threads, streams, measurement['failed'], measurement['peakRSS'], measurement['wallTime']))
+            continue
+        measurements.append(measurement)
+        print("  %3i threads %3i streams: %8.2f events/s, peak RSS %8.1f MB, %7.1f s"
+              % (threads, streams, measurement['eventsPerSecond'], measurement['peakRSS'],
+                 measurement['wallTime']))
+    failed = len([m for m in measurements if 'failed' in m])
+    if not args.keep and failed == 0:
+        shutil.rmtree(workDir)
+
+    best = bestSetting(measurements, args.maxRSS, args.tolerance)
+    if best is None:
+        if failed == len(measurements):
+            print("tuneThreads: every setting failed, see the logs in %s" % workDir)
+        else:
+            print("tuneThreads: no setting stays below %.1f MB" % args.maxRSS)
+        return 1
+    if failed > 0:
+        print("tuneThreads: %i settings failed, see the logs in %s" % (failed, workDir))
+    result = dict(best)
+    result['measurements'] = measurements
+    writeTuning(key, result, args.tuningFile)
+    print("tuneThreads: best %i threads %i streams (%.2f events/s, %.1f MB), written to %s"
+          % (best['numberOfThreads'], best['numberOfStreams'], best['eventsPerSecond'],
+             best['peakRSS'], args.tuningFile))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""
+compareJECEras.py compares the JEC of two or more eras bin by bin on a dense
+(pT, eta, rho) grid, all payloads the eras have in common in one go, and
+prints the largest deviation of every era from the first one, see
+python/jecCompare.py. An era is given as <era>[=<source>], the source being
+a SQLite DB or the prefix of its text files (default: <era>.db).
+Examples:
+  compareJECEras.py Summer12_V7_MC Winter14_V4_MC
+  compareJECEras.py Summer12_V7_DATA=Summer12_V7_DATA/Summer12_V7_DATA Winter14_V4_DATA --payloads AK5PFchs
+  compareJECEras.py Summer12_V7_MC Winter14_V4_MC --levels L2Relative L3Absolute --tolerance 0.02 \\
+                    --summary Winter14_vs_Summer12.txt --arrays Winter14_vs_Summer12.npz
+"""
+import sys
+import argparse
+import numpy
+
+from JetMETAnalysis.JetAnalyzers.jecCompare import compareEras, summaryLines, writeSummary, saveComparisons
+from JetMETAnalysis.JetAnalyzers.jecCache import PayloadCache, defaultDirectory, defaultMaxSize
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Compare the JEC of eras bin by bin.")
+    parser.add_argument('eras', nargs = '+', help = "<era>[=<source>], the first is the reference")
+    parser.add_argument('--payloads', nargs = '+', default = None, help = "only these payloads, e.g. AK5PF")
+    parser.add_argument('--levels', nargs = '+', default = None,
+                        help = "the levels (default: those of L1FastJet L2Relative L3Absolute L2L3Residual in the payload)")
+    parser.add_argument('--pt', nargs = 3, type = float, default = [10., 5000., 100], metavar = ('MIN', 'MAX', 'N'),
+                        help = "N raw pT points between MIN and MAX, logarithmic (default: %(default)s)")
+    parser.add_argument('--eta', nargs = 3, type = float, default = [-5.15, 5.15, 104], metavar = ('MIN', 'MAX', 'N'),
+                        help = "N eta points between MIN and MAX (default: %(default)s)")
+    parser.add_argument('--rho', nargs = '+', type = float, default = [0., 10., 20., 30., 40.],
+                        help = "the rho values (default: %(default)s)")
+    parser.add_argument('--tolerance', type = float, default = 0.01, help = "flag bins where |ratio - 1| > tolerance")
+    parser.add_argument('--run', type = int, default = 1, help = "the run the payloads are valid for")
+    parser.add_argument('--jobs', '-j', type = int, default = None, help = "processes (default: number of cores)")
+    parser.add_argument('--summary', default = None, help = "write the summary to this text file")
+    parser.add_argument('--arrays', default = None, help = "save the corrections, ratios and differences to this .npz file")
+    parser.add_argument('--cache-dir', dest = 'cacheDir', default = defaultDirectory,
+                        help = "the cache of decoded payloads (default: %(default)s)")
+    parser.add_argument('--cache-size', dest = 'cacheSize', type = int, default = defaultMaxSize >> 20,
+                        help = "the size of the cache in MB (default: %(default)s)")
+    parser.add_argument('--no-cache', dest = 'noCache', action = 'store_true', help = "always read the DBs and text files")
+    args = parser.parse_args(argv)
+
+    sources = []
+    for era in args.eras:
+        if '=' in era:
+            sources.append(tuple(era.split('=', 1)))
+        else:
+            sources.append((era, era + '.db'))
+    cache = None
+    if not args.noCache:
+        cache = PayloadCache(args.cacheDir, args.cacheSize << 20)
+    comparisons = compareEras(sources, args.payloads, args.levels,
+                              pt  = numpy.logspace(numpy.log10(args.pt[0]), numpy.log10(args.pt[1]), int(args.pt[2])),
+                              eta = numpy.linspace(args.eta[0], args.eta[1], int(args.eta[2])),
+                              rho = args.rho, tolerance = args.tolerance, run = args.run, jobs = args.jobs, cache = cache)
+    if cache is not None:
+        cache.close()
+    for line in summaryLines(comparisons):
+        print(line)
+    if args.summary:
+        writeSummary(comparisons, args.summary)
+    if args.arrays:
+        saveComparisons(comparisons, args.arrays)
+    flagged = sum([row['flagged'] for comparison in comparisons.values() for row in comparison.summary()])
+    print("compareJECEras: %i payloads, %i bins beyond a tolerance of %g" % (len(comparisons), flagged, args.tolerance))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+writeTxtFromSQLite.py writes the JEC text files of all payloads of an era in
+a local SQLite DB, like writeTxtFromLocalDB.py but without cmsRun: the DB is
+read once and the payloads are decoded in parallel, see python/jecPayloads.py.
+Examples:
+  writeTxtFromSQLite.py Winter14_V4_MC
+  writeTxtFromSQLite.py Winter14_V4_MC --payloads AK5PF AK5PFchs --jobs 4
+  writeTxtFromSQLite.py Winter14_V4_MC --db sqlite:/data/Winter14_V4_MC.db --output-prefix txts/Winter14_V4_MC
+The decoded payloads are cached (python/jecCache.py), an unchanged DB is
+not read again: --cache-dir, --cache-size, --no-cache.
+"""
+import sys
+import argparse
+
+from JetMETAnalysis.JetAnalyzers.jecPayloads import PayloadDB, writeTxts
+from JetMETAnalysis.JetAnalyzers.jecCache import PayloadCache, defaultDirectory, defaultMaxSize
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Write the JEC text files of the payloads of an era in a SQLite DB.")
+    parser.add_argument('era', help = "the era, the tags are JetCorrectorParametersCollection_<era>_<payload>")
+    parser.add_argument('--db', default = None, help = "the DB (default: sqlite:<era>.db)")
+    parser.add_argument('--output-prefix', dest = 'outputPrefix', default = None,
+                        help = "prefix of the text files (default: <era>_txts_fromDB/<era>)")
+    parser.add_argument('--payloads', nargs = '+', default = None, help = "only these payloads, e.g. AK5PF")
+    parser.add_argument('--jobs', '-j', type = int, default = None, help = "decoding processes (default: number of cores)")
+    parser.add_argument('--run', type = int, default = 1, help = "the run the payloads are valid for")
+    parser.add_argument('--list', action = 'store_true', help = "only list the payloads of the era")
+    parser.add_argument('--cache-dir', dest = 'cacheDir', default = defaultDirectory,
+                        help = "the cache of decoded payloads (default: %(default)s)")
+    parser.add_argument('--cache-size', dest = 'cacheSize', type = int, default = defaultMaxSize >> 20,
+                        help = "the size of the cache in MB (default: %(default)s)")
+    parser.add_argument('--no-cache', dest = 'noCache', action = 'store_true', help = "always read the DB")
+    args = parser.parse_args(argv)
+
+    dbFileName = args.db or 'sqlite:' + args.era + '.db'
+    if args.list:
+        db = PayloadDB(dbFileName)
+        for (payloadName, tag) in sorted(db.tags(args.era).items()):
+            print("%-16s %s" % (payloadName, tag))
+        db.close()
+        return 0
+    cache = None
+    if not args.noCache:
+        cache = PayloadCache(args.cacheDir, args.cacheSize << 20)
+    fileNames = writeTxts(dbFileName, args.era, args.outputPrefix, args.payloads, args.jobs, args.run, cache)
+    if cache is not None:
+        print("writeTxtFromSQLite: cache %s: %i hits, %i misses" % (cache.directory, cache.hits, cache.misses))
+        cache.close()
+    for payloadName in sorted(fileNames):
+        print("%s: %s" % (payloadName, " ".join(fileNames[payloadName])))
+    print("writeTxtFromSQLite: %i payloads, %i text files" %
+          (len(fileNames), sum([len(names) for names in fileNames.values()])))
+    if len(fileNames) == 0:
+        print("writeTxtFromSQLite: no payloads of era %s in %s" % (args.era, dbFileName))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
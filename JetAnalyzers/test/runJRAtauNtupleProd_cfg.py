@@ -49,36 +49,27 @@ process.load('FWCore.MessageLogger.MessageLogger_cfi')
 process.MessageLogger.cerr.FwkReport.reportEvery = 1000
 process.load('CommonTools.UtilAlgos.TFileService_cfi')
 process.TFileService.fileName=cms.string('ntupleJRAtau_Ztautau.root')
+process.options = cms.untracked.PSet(wantSummary = cms.untracked.bool(True))
 
 
 #!
 #! CHOOSE ALGORITHMS
 #!
-from JetMETAnalysis.JetAnalyzers.addAlgorithm import addAlgorithm
-
-algorithms = []
-algorithms.append('ak5tauHPSlooseCombDBcorrAll')
-algorithms.append('ak5tauHPSlooseCombDBcorrOneProng0Pi0')
-algorithms.append('ak5tauHPSlooseCombDBcorrOneProng1Pi0')
-algorithms.append('ak5tauHPSlooseCombDBcorrOneProng2Pi0')
-algorithms.append('ak5tauHPSlooseCombDBcorrThreeProng0Pi0')
-algorithms.append('ak5tauHPSmediumCombDBcorrAll')
-algorithms.append('ak5tauHPSmediumCombDBcorrOneProng0Pi0')
-algorithms.append('ak5tauHPSmediumCombDBcorrOneProng1Pi0')
-algorithms.append('ak5tauHPSmediumCombDBcorrOneProng2Pi0')
-algorithms.append('ak5tauHPSmediumCombDBcorrThreeProng0Pi0')
-algorithms.append('ak5tauHPStightCombDBcorrAll')
-algorithms.append('ak5tauHPStightCombDBcorrOneProng0Pi0')
-algorithms.append('ak5tauHPStightCombDBcorrOneProng1Pi0')
-algorithms.append('ak5tauHPStightCombDBcorrOneProng2Pi0')
-algorithms.append('ak5tauHPStightCombDBcorrThreeProng0Pi0')
+from JetMETAnalysis.JetAnalyzers.addAlgorithm import planAlgorithms, tauAlgorithms
+
+# one algorithm per discriminator x decay mode, e.g. ak5tauHPSlooseCombDBcorrAll,
+# ak5tauHPSlooseCombDBcorrOneProng0Pi0, ..., ak5tauHPStightCombDBcorrThreeProng0Pi0
+algorithms = tauAlgorithms(discriminators = ['ak5tauHPSlooseCombDBcorr',
+                                             'ak5tauHPSmediumCombDBcorr',
+                                             'ak5tauHPStightCombDBcorr'])
 
 
 # set to False to use jets/taus from the input file (NOT RECOMMENDED)
 doJetReco = True
 
-for algorithm in algorithms:
-    addAlgorithm(process, algorithm, Defaults, doJetReco, False)
+# the HPS reconstruction and the tau genjets (tauRecoHPSSequence) are shared
+# by all algorithms and run once per event, see planAlgorithms
+planAlgorithms(process, algorithms, Defaults, doJetReco, False)
 
 
 #!
@@ -7,11 +7,19 @@ import FWCore.ParameterSet.Config as cms
 conditionsSource = "GT"
 era = "Spring16_25nsV1_MC"
 doProducer = False
+# debug adds the Tracer service, which logs every module transition
+debug = False
 process = cms.Process("JRA")
 multithread = False
 if doProducer:
 	process = cms.Process("JRAP")
 	multithread = True
+# threads & streams with doProducer. tuneThreads = True uses the setting found
+# for the algorithms below on this node by test/ConfigTools/tuneThreads.py
+# (stored in jraThreads.json next to this file), falling back to numberOfThreads/numberOfStreams
+tuneThreads = False
+numberOfThreads = 8
+numberOfStreams = 0
 
 
 #!
@@ -26,19 +34,14 @@ algsizetype = {'ak':[4,8]}
 jettype = ['pf','pfchs','puppi']
 corrs = ['']
 
+from JetMETAnalysis.JetAnalyzers.algSpec import algorithmName
 algorithms = []
-jcr = cms.VPSet()
 
 for k, v in algsizetype.iteritems():
     for s in v:
-	for j in jettype:
+        for j in jettype:
             for c in corrs:
-	        algorithms.append(str(k+str(s)+j+c))
-	        if conditionsSource != "GT":
-                    upperAlg = str(k.upper()+str(s)+j.upper().replace("CHS","chs")).replace("PUPPI","PFPuppi")
-		    jcr.append(cms.PSet(record = cms.string("JetCorrectionsRecord"),
-					tag = cms.string("JetCorrectorParametersCollection_"+era+"_"+upperAlg),
-					label= cms.untracked.string(upperAlg)))
+                algorithms.append(algorithmName(k,s,j,c))
 
 # If need be you can append additional jet collections using the style below
 #algorithms.append('ak5calo')
@@ -51,15 +54,21 @@ process.load("Configuration.StandardSequences.FrontierConditions_GlobalTag_condD
 process.GlobalTag.globaltag = cms.string('80X_mcRun2_asymptotic_v5_2016PixDynIneff')
 
 if conditionsSource != "GT":
+    # only the payloads of the algorithms which the DB has are loaded. For the DB,
+    # set conditionsTags to a listing of its tags (e.g. the output of 'conddb listTags')
+    # to look them up there, otherwise all payloads of the algorithms are loaded
+    conditionsTags = None
     if conditionsSource == "DB":
         conditionsConnect = cms.string("frontier://FrontierPrep/CMS_COND_PHYSICSTOOLS")
     elif conditionsSource == "SQLite":
-	conditionsConnect = cms.string('sqlite_file:'+era+'.db')    
+        conditionsConnect = cms.string('sqlite_file:'+era+'.db')
+        conditionsTags = era+'.db'
 
+    from JetMETAnalysis.JetAnalyzers.jecConditions import findPayloads, jecToGet
     from CondCore.DBCommon.CondDBSetup_cfi import *
     process.jec = cms.ESSource("PoolDBESSource",CondDBSetup,
-			       connect = conditionsConnect,
-			       toGet =  cms.VPSet(jcr))
+                               connect = conditionsConnect,
+                               toGet = jecToGet(era, findPayloads(era, conditionsTags, requested = algorithms)))
     process.es_prefer_jec = cms.ESPrefer("PoolDBESSource","jec")
 
 
@@ -87,10 +96,15 @@ except ImportError:
 process.load('FWCore.MessageLogger.MessageLogger_cfi')
 process.MessageLogger.cerr.FwkReport.reportEvery = 100
 process.options = cms.untracked.PSet( wantSummary = cms.untracked.bool(True))
-if doProducer:
+if debug:
     process.add_(cms.Service("Tracer"))
-    process.options.numberOfThreads = cms.untracked.uint32(8)
-    process.options.numberOfStreams = cms.untracked.uint32(0)
+if doProducer:
+    from JetMETAnalysis.JetAnalyzers.threadTuning import setThreads, tuningFileFor
+    if tuneThreads:
+        setThreads(process, numberOfThreads, numberOfStreams, algorithms,
+                   tuningFileFor(globals().get('__file__', 'run_JRA_cfg.py')))
+    else:
+        setThreads(process, numberOfThreads, numberOfStreams)
 else:
     process.load('CommonTools.UtilAlgos.TFileService_cfi')
     process.TFileService.fileName=cms.string('JRA.root')
@@ -107,6 +121,9 @@ process.pfPileUpJME.checkClosestZVertex = False
 #! JET & REFERENCE KINEMATIC CUTS
 #!
 import JetMETAnalysis.JetAnalyzers.Defaults_cff as Defaults
+# attach only the jet corrections of the requested algorithms, not all of
+# JetCorrection_cff
+Defaults.JetCorrectionScope = 'requested'
 
 
 #!
@@ -116,15 +133,28 @@ import JetMETAnalysis.JetAnalyzers.Defaults_cff as Defaults
 # set to False to use jets from the input file (NOT RECOMMENDED)
 doJetReco = True
 outCom = cms.untracked.vstring('drop *')
-from JetMETAnalysis.JetAnalyzers.addAlgorithm import addAlgorithm
+# set to True to fill all algorithms from a single JetResponseAnalyzer
+# which reads the event level products only once per event
+oneAnalyzer = False
+from JetMETAnalysis.JetAnalyzers.addAlgorithm import planAlgorithms, addAlgorithms, mergeDuplicateModules
+doReco = {}
 for algorithm in algorithms:
     if (algorithm.find('HLT') > 0) :
         process.load("Configuration.Geometry.GeometryIdeal_cff")
         process.load("Configuration.StandardSequences.MagneticField_cff")
-        addAlgorithm(process,algorithm,Defaults,False,doProducer)
+        doReco[algorithm] = False
     else:
-        addAlgorithm(process,algorithm,Defaults,doJetReco,doProducer)
+        doReco[algorithm] = doJetReco
     outCom.extend(['keep *_'+algorithm+'_*_*'])
+# producers needed by several algorithms (gen particles, rho, chs, ...) are
+# scheduled once in a shared task instead of once per algorithm path
+if oneAnalyzer:
+    addAlgorithms(process,algorithms,Defaults,doReco,doProducer)
+else:
+    planAlgorithms(process,algorithms,Defaults,doReco,doProducer)
+# merge the modules which are configured identically for several algorithms
+# (reference selections, parton matching, the uncorrected jet selections)
+mergeDuplicateModules(process)
 
 
 #!
@@ -154,5 +184,4 @@ if doProducer:
 #Not sure what this does
 #processDumpFile = open('runJRA.dump' , 'w')
 #print >> processDumpFile, process.dumpPython()
-process.options = cms.untracked.PSet( wantSummary = cms.untracked.bool(True) )
 process.options.allowUnscheduled = cms.untracked.bool(True)
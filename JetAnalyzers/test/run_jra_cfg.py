@@ -42,6 +42,8 @@ process.source = cms.Source("PoolSource",
                             fileNames = inputFiles )
 
 
+from JetMETAnalysis.JetAnalyzers.algSpec import algorithmName
+
 algsizetype = {'ak':[4]}
 #algsizetype = {'ak':[3,4,5,6,7,8,9,10]}
 jettype = ['pf','pfchs']
@@ -57,7 +59,7 @@ for k, v in algsizetype.iteritems():
 		for j in jettype:
 			for c in corrs:
 				size.append(s/20.0)
-				algorithms.append(str(k+str(s)+j+c))
+				algorithms.append(algorithmName(k,s,j,c))
 
 
 #!
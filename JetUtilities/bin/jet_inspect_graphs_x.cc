@@ -9,6 +9,7 @@
 
 #include "JetMETAnalysis/JetUtilities/interface/CommandLine.h"
 #include "JetMETAnalysis/JetUtilities/interface/ObjectLoader.h"
+#include "JetMETAnalysis/JetUtilities/interface/PlotList.h"
 #include "JetMETAnalysis/JetUtilities/interface/RootStyle.h"
 #include "JetMETAnalysis/JetUtilities/interface/Style.h"
 
@@ -45,6 +46,8 @@ using namespace std;
 ////////////////////////////////////////////////////////////////////////////////
 // declare local functions
 ////////////////////////////////////////////////////////////////////////////////
+int    inspect_graphs(int argc,char** argv);
+
 void   draw_range(const string& range,const int residual=-1);
 
 string get_range(const ObjectLoader<TGraphErrors>& gl,
@@ -95,6 +98,16 @@ void draw_labels(const vector<string>& labels,bool leginplot,bool tdrautobins);
 
 //______________________________________________________________________________
 int main(int argc,char** argv)
+{
+  // -plotlist <file>: make all plots listed in file, one command line per line
+  if (argc==3&&string(argv[1])=="-plotlist")
+    return run_plotlist(argv[0],argv[2],inspect_graphs);
+  return inspect_graphs(argc,argv);
+}
+
+
+//______________________________________________________________________________
+int inspect_graphs(int argc,char** argv)
 {
   CommandLine cl;
   if (!cl.parse(argc,argv)) return 0;
@@ -194,7 +207,8 @@ int main(int argc,char** argv)
   if (batch&&formats.size()==0) formats.push_back("pdf");
   
   argc = (batch) ? 2 : 1; if (batch) argv[1] = (char*)"-b";
-  TApplication* app=new TApplication("jet_inspect_graphs",&argc,argv);
+  TApplication* app=(0!=gApplication) ?
+    gApplication : new TApplication("jet_inspect_graphs",&argc,argv);
   
   if(tdr) {
     setTDRStyle();
@@ -273,7 +287,7 @@ int main(int argc,char** argv)
   for (unsigned int iinput=0;iinput<inputs.size();iinput++) {
     
     string input=inputs[iinput].substr(0,inputs[iinput].find(':'));
-    TFile* file=new TFile(input.c_str(),"READ");
+    TFile* file=open_input(input);
     if (!file->IsOpen()) {cout<<"Can't open "<<file->GetName()<<endl;return 0;}
     
     /// LOOP OVER ALGORITHMS
@@ -9,6 +9,7 @@
 
 #include "JetMETAnalysis/JetUtilities/interface/CommandLine.h"
 #include "JetMETAnalysis/JetUtilities/interface/ObjectLoader.h"
+#include "JetMETAnalysis/JetUtilities/interface/PlotList.h"
 #include "JetMETAnalysis/JetUtilities/interface/RootStyle.h"
 
 #include "TSystem.h"
@@ -38,6 +39,8 @@ using namespace std;
 ////////////////////////////////////////////////////////////////////////////////
 // declare local functions
 ////////////////////////////////////////////////////////////////////////////////
+int inspect_histos(int argc,char** argv);
+
 void set_xaxis_range(TH1* h1,TH1* h2=0,TH1* h3=0,TH1* h4=0,float xmin=-1.,float xmax=-2.);
 void get_xaxis_range(TH1* h,int& binmin,int& binmax);
 void set_yaxis_range(TH1* h1,float ymin=-1.,float ymax=-1.);
@@ -83,6 +86,16 @@ string get_animated_name(string prefix, const ObjectLoader<TH1F>& hl, vector<uns
 
 //______________________________________________________________________________
 int main(int argc,char** argv)
+{
+  // -plotlist <file>: make all plots listed in file, one command line per line
+  if (argc==3&&string(argv[1])=="-plotlist")
+    return run_plotlist(argv[0],argv[2],inspect_histos);
+  return inspect_histos(argc,argv);
+}
+
+
+//______________________________________________________________________________
+int inspect_histos(int argc,char** argv)
 {
   CommandLine cl;
   if (!cl.parse(argc,argv)) return 0;
@@ -176,7 +189,8 @@ int main(int argc,char** argv)
   bool isSingular = (inputs.size()==1&&variables.size()==1&&algs.size()==1);
 
   argc = (batch) ? 2 : 1; if (batch) argv[1] = (char*)"-b";
-  TApplication* app=new TApplication("jet_inspect_histos",&argc,argv);
+  TApplication* app=(0!=gApplication) ?
+    gApplication : new TApplication("jet_inspect_histos",&argc,argv);
   
   set_root_style();
     
@@ -196,7 +210,7 @@ int main(int argc,char** argv)
   for (unsigned int ifile=0;ifile<inputs.size();ifile++) {
 
     string input(inputs[ifile]);
-    TFile* file=new TFile(input.c_str(),"READ");
+    TFile* file=open_input(input);
     if (!file->IsOpen()) {cout<<"Can't open "<<file->GetName()<<endl;return 0;}
     
     /// LOOP OVER ALGORITHMS
@@ -39,6 +39,10 @@ public:
   template <class T> std::vector<T> getVector(const std::string& name);
   template <class T> std::vector<T> getVector(const std::string& name,
 					      const std::string& default_as_string);
+
+  // the files given to option name, manifests (*.txt) replaced by the files
+  // they list, one per line
+  std::vector<std::string> getFiles(const std::string& name);
   
 private:
   bool parse_file(const std::string& file_name);
@@ -0,0 +1,26 @@
+#ifndef JETUTILITIES_PLOTLIST_H
+#define JETUTILITIES_PLOTLIST_H 1
+
+
+#include <string>
+
+
+class TFile;
+
+
+//
+// make many plots in one process: every line of a plot list holds the options
+// of one plot (as they would be given on the command line), and inspect is
+// called for each of them. ROOT is started once and every input file is
+// opened once for all plots, see open_input.
+//
+typedef int (*InspectFunction)(int argc,char** argv);
+
+int    run_plotlist(const std::string& exe,const std::string& plotlist,
+		    InspectFunction inspect);
+
+// the input file name, opened for reading only the first time it is asked for
+TFile* open_input(const std::string& name);
+
+
+#endif
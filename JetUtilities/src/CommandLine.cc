@@ -190,6 +190,34 @@ void CommandLine::print()
 }
 
 
+//______________________________________________________________________________
+vector<string> CommandLine::getFiles(const string& name)
+{
+  vector<string> result;
+  vector<string> files = getVector<string>(name);
+  for (unsigned int i=0;i<files.size();i++) {
+    const string& file = files[i];
+    if (file.size()<4||file.substr(file.size()-4)!=".txt") {
+      result.push_back(file);
+      continue;
+    }
+    ifstream manifest(file.c_str());
+    if (!manifest.is_open()) {
+      cout<<"Can't open manifest "<<file<<endl;
+      continue;
+    }
+    string line;
+    while (getline(manifest,line)) {
+      line.erase(0,line.find_first_not_of(" \t"));
+      line.erase(line.find_last_not_of(" \t\r")+1);
+      if (line.empty()||line[0]=='#') continue;
+      result.push_back(line);
+    }
+  }
+  return result;
+}
+
+
 //______________________________________________________________________________
 bool CommandLine::parse_file(const string& file_name)
 {
@@ -0,0 +1,94 @@
+////////////////////////////////////////////////////////////////////////////////
+//
+// PlotList
+// --------
+//
+////////////////////////////////////////////////////////////////////////////////
+
+
+#include "JetMETAnalysis/JetUtilities/interface/PlotList.h"
+
+#include <TROOT.h>
+#include <TApplication.h>
+#include <TFile.h>
+#include <TH1.h>
+
+#include <iostream>
+#include <fstream>
+#include <vector>
+#include <map>
+
+
+using namespace std;
+
+
+////////////////////////////////////////////////////////////////////////////////
+// implementation of functions
+////////////////////////////////////////////////////////////////////////////////
+
+//______________________________________________________________________________
+int run_plotlist(const string& exe,const string& plotlist,InspectFunction inspect)
+{
+  ifstream fin(plotlist.c_str());
+  if (!fin.is_open()) {
+    cout<<"ERROR: can't open plot list "<<plotlist<<endl;
+    return 1;
+  }
+  
+  // all plots are made in batch mode, by the same application
+  int   appargc = 2;
+  char* appargv[] = { (char*)exe.c_str(), (char*)"-b" };
+  new TApplication(exe.c_str(),&appargc,appargv);
+  
+  // histograms read from the input files are not added to them, so that every
+  // plot reads its own copy, and the files stay unchanged for the next plot
+  TH1::AddDirectory(kFALSE);
+  
+  string line;
+  unsigned int nplots(0);
+  while (getline(fin,line)) {
+    // split the line into arguments, "..." quotes an argument with spaces
+    vector<string> args(1,exe);
+    string arg; bool quoted(false), inarg(false);
+    for (unsigned int i=0;i<line.size();i++) {
+      char ch = line[i];
+      if (ch=='"') { quoted = !quoted; inarg = true; }
+      else if (!quoted&&(ch==' '||ch=='\t'||ch=='\r')) {
+	if (inarg) args.push_back(arg);
+	arg.clear(); inarg = false;
+      }
+      else if (!quoted&&!inarg&&ch=='#') break;
+      else { arg += ch; inarg = true; }
+    }
+    if (inarg) args.push_back(arg);
+    if (args.size()==1) continue;
+    args.push_back("-batch");
+    args.push_back("true");
+    
+    vector<char*> argv;
+    for (unsigned int i=0;i<args.size();i++) argv.push_back((char*)args[i].c_str());
+    argv.push_back(0);
+    
+    cout<<"plot "<<nplots<<": "<<line<<endl;
+    inspect((int)args.size(),&argv[0]);
+    nplots++;
+    
+    // the canvases of this plot are printed, delete them
+    gROOT->GetListOfCanvases()->Delete();
+  }
+  cout<<"made "<<nplots<<" plots from "<<plotlist<<endl;
+  
+  return 0;
+}
+
+
+//______________________________________________________________________________
+TFile* open_input(const string& name)
+{
+  static map<string,TFile*> files;
+  map<string,TFile*>::iterator it = files.find(name);
+  if (it!=files.end()) return it->second;
+  TFile* file = new TFile(name.c_str(),"READ");
+  if (file->IsOpen()) files[name] = file;
+  return file;
+}